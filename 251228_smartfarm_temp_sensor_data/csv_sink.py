@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+일별 CSV 파일 싱크
+당일 파일(@YYYY-MM-DD.csv)을 열어둔 채로 버퍼 쓰기, 자정에 새 파일로 교체
+
+- 헤더 목록, DictWriter는 한 번만 생성 (새 파일에만 한글 헤더 작성)
+- 매 행은 OS 버퍼까지 flush, 디스크 동기화(fsync)는 FSYNC_INTERVAL마다
+- 파일이 Excel 등에서 잠겨 있으면 (PermissionError) 기다리지 않고 로컬 스풀 파일에
+  행을 쌓아두고, 다음 쓰기 때 (RETRY_INTERVAL 경과 후) 시각 순서대로 옮겨 씀
+- spool()은 다른 스레드에서도 호출 가능 (쓰기 큐가 가득 찼을 때 바로 스풀)
+"""
+
+import csv
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# 디스크 동기화 주기 (초)
+FSYNC_INTERVAL = 300
+
+# 스풀에 행이 남아 있을 때 파일 쓰기 재시도 간격 (초)
+RETRY_INTERVAL = 30
+
+
+class CsvSink:
+    """일별 CSV 파일 싱크 (파일 유지 + 버퍼 쓰기 + 자정 교체 + 잠김 시 스풀)"""
+
+    def __init__(self, folder, fieldnames, headers, name, spool_folder,
+                 fsync_interval=FSYNC_INTERVAL, retry_interval=RETRY_INTERVAL):
+        """
+        초기화 (파일은 첫 쓰기 때 열림)
+
+        Args:
+            folder: CSV 저장 폴더
+            fieldnames: 데이터 필드 이름 리스트 (첫 열 'Timestamp' 제외)
+            headers: 파일 첫 줄 헤더 리스트 (시간 열 포함, 새 파일에만 작성)
+            name: 저장 위치 이름 (로그, 스풀 파일 이름용, 예: "나스")
+            spool_folder: 잠김/오류 시 행을 쌓아둘 로컬 폴더
+            fsync_interval: 디스크 동기화 주기 (초)
+            retry_interval: 스풀 재시도 간격 (초)
+        """
+        self.folder = folder
+        self.fieldnames = ['Timestamp'] + list(fieldnames)
+        self.header_line = ','.join(headers) + '\n'
+        self.name = name
+        self.fsync_interval = fsync_interval
+        self.retry_interval = retry_interval
+
+        self._file = None
+        self._writer = None
+        self._date = None         # 열려 있는 파일의 날짜 (YYYY-MM-DD)
+        self._synced_at = 0.0     # 마지막 fsync 시각 (monotonic)
+        self._failed_at = None    # 마지막 쓰기 실패 시각 (monotonic)
+
+        # 스풀 (파일에 쓰지 못한 행, 재시작해도 유지, 다른 스레드에서도 추가하므로 잠금)
+        self._spool_lock = threading.Lock()
+        if not os.path.exists(spool_folder):
+            os.makedirs(spool_folder)
+        self.spool_path = os.path.join(spool_folder, f"{name}.jsonl")
+        self._spool = self._load_spool()
+        if self._spool:
+            print(f"[알림] {name} CSV 스풀에 저장 대기 행 {len(self._spool)}개")
+
+        # 통계
+        self.written = 0
+        self.spooled = 0
+
+    @property
+    def pending(self):
+        """스풀에 쌓인 (파일에 아직 쓰지 못한) 행 수"""
+        return len(self._spool)
+
+    def _load_spool(self):
+        """스풀 파일 읽기"""
+        if not os.path.isfile(self.spool_path):
+            return []
+        rows = []
+        with open(self.spool_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    rows.append(json.loads(line))
+        return rows
+
+    def _filename(self, date_str):
+        """날짜별 파일 경로 (@YYYY-MM-DD.csv)"""
+        return os.path.join(self.folder, f"@{date_str}.csv")
+
+    def _open(self, date_str):
+        """날짜 파일 열기 (다른 날짜 파일이 열려 있으면 닫고 교체)"""
+        if self._date == date_str and self._file is not None:
+            return
+
+        self._close_file()
+
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+            print(f"데이터 저장 폴더 생성: {self.folder}")
+
+        filename = self._filename(date_str)
+        new_file = not os.path.isfile(filename) or os.path.getsize(filename) == 0
+        f = open(filename, 'a', newline='', encoding='utf-8-sig')
+        try:
+            if new_file:
+                f.write(self.header_line)
+                f.flush()
+        except Exception:
+            f.close()
+            raise
+
+        self._file = f
+        self._writer = csv.DictWriter(f, fieldnames=self.fieldnames)
+        self._date = date_str
+        self._synced_at = time.monotonic()
+
+    def _close_file(self):
+        """열린 파일 동기화 후 닫기 (오류 무시)"""
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except Exception:
+            pass
+        try:
+            self._file.close()
+        except Exception:
+            pass
+        self._file = None
+        self._writer = None
+        self._date = None
+
+    def _write_row(self, date_str, row):
+        """열린 파일에 행 1개 쓰기 (OS 버퍼까지 flush, 주기적으로 fsync)"""
+        self._open(date_str)
+        self._writer.writerow(row)
+        self._file.flush()
+
+        now = time.monotonic()
+        if now - self._synced_at >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._synced_at = now
+
+    def _make_row(self, timestamp, values):
+        """(날짜 문자열, CSV 행) 생성 (시각은 분 단위, 값은 소수점 첫째자리까지)"""
+        moment = datetime.fromtimestamp(timestamp)
+        row = {'Timestamp': moment.strftime("%Y-%m-%d %H:%M:00")}
+        for field, value in values.items():
+            row[field] = round(value, 1) if value is not None else value
+        return moment.strftime("%Y-%m-%d"), row
+
+    def _spool_row(self, date_str, row):
+        """파일에 쓰지 못한 행을 스풀에 추가 (로컬 파일에도 기록)"""
+        entry = {"date": date_str, "row": row}
+        with self._spool_lock:
+            self._spool.append(entry)
+            self.spooled += 1
+            with open(self.spool_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def spool(self, timestamp, values):
+        """
+        행 1개를 파일에 쓰지 않고 바로 스풀에 추가 (로컬 디스크만 사용, 다른 스레드에서 호출 가능)
+
+        Args:
+            timestamp: 행 시각 (epoch 초)
+            values: {필드 이름: 값}
+        """
+        self._spool_row(*self._make_row(timestamp, values))
+
+    def _drain(self):
+        """
+        스풀에 쌓인 행을 시각 순서대로 파일에 씀 (실패하면 쓴 행만 스풀에서 뺌)
+
+        Raises:
+            OSError: 파일 쓰기 실패 (남은 행은 스풀에 유지)
+        """
+        # 파일 쓰기 중에는 잠금을 잡지 않음 (멈춘 공유 폴더가 spool() 호출을 막지 않도록)
+        with self._spool_lock:
+            entries = sorted(self._spool, key=lambda entry: entry["row"]["Timestamp"])
+        done = set()
+        try:
+            for entry in entries:
+                self._write_row(entry["date"], entry["row"])
+                done.add(id(entry))
+        finally:
+            if done:
+                with self._spool_lock:
+                    self.written += len(done)
+                    self._spool = [entry for entry in self._spool if id(entry) not in done]
+                    self._rewrite_spool()
+
+    def _rewrite_spool(self):
+        """스풀 파일을 메모리 스풀 내용으로 다시 씀 (비었으면 삭제, 잠금을 잡은 상태에서 호출)"""
+        if not self._spool:
+            if os.path.isfile(self.spool_path):
+                os.remove(self.spool_path)
+            return
+        tmp_path = self.spool_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self._spool:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.spool_path)
+
+    def write(self, timestamp, values):
+        """
+        행 1개 쓰기 (실패하면 기다리지 않고 스풀에 쌓음)
+
+        Args:
+            timestamp: 행 시각 (epoch 초, 분 단위로 기록, 이 시각의 날짜 파일에 씀)
+            values: {필드 이름: 값} (소수점 첫째자리까지 반올림)
+
+        Returns:
+            True: 파일에 씀, False: 스풀에 쌓음 (나중에 파일에 씀)
+        """
+        date_str, row = self._make_row(timestamp, values)
+
+        # 스풀에 남은 행이 있으면 이 행도 스풀에 넣고 함께 시각 순서대로 옮겨 씀
+        # (실패했거나 재시도 간격 전이면 스풀에 남김)
+        if self._spool:
+            self._spool_row(date_str, row)
+            return self.retry_spool()
+
+        try:
+            self._write_row(date_str, row)
+            self.written += 1
+            return True
+        except OSError as e:
+            self._write_failed(e)
+
+        self._spool_row(date_str, row)
+        return False
+
+    def retry_spool(self):
+        """
+        스풀에 쌓인 행을 파일로 옮겨 쓰기 (마지막 실패 후 retry_interval이 지났을 때만 시도)
+
+        Returns:
+            True: 스풀이 비었음, False: 아직 남음
+        """
+        if not self._spool:
+            return True
+        if self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_interval:
+            return False
+
+        try:
+            self._drain()
+        except OSError as e:
+            self._write_failed(e)
+            return False
+
+        self._failed_at = None
+        print(f"[알림] {self.name} CSV 스풀 행을 파일에 모두 저장했습니다")
+        return True
+
+    def _write_failed(self, error):
+        """쓰기 실패 처리 (파일을 닫고 재시도 간격 동안은 스풀에만 쌓음)"""
+        if isinstance(error, PermissionError):
+            print(f"[경고] {self.name} CSV 파일이 다른 프로그램에서 열려있습니다. 로컬 스풀에 저장 후 나중에 기록합니다. (대기 {len(self._spool) + 1}행)")
+        else:
+            print(f"[오류] {self.name} CSV 파일 저장 중 오류: {error} (로컬 스풀에 저장)")
+        self._failed_at = time.monotonic()
+        self._close_file()
+
+    def close(self):
+        """스풀을 한 번 더 옮겨 쓰고 파일 닫기"""
+        if self._spool:
+            try:
+                self._drain()
+            except OSError as e:
+                print(f"[경고] {self.name} CSV 스풀 {len(self._spool)}행 남음 (다음 실행 때 저장): {e}")
+        self._close_file()
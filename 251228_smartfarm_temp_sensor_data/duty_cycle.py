@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Duty Cycle
+================================================================================
+출력 비트(BIT_READ) 가동 시간 집계 (워드 XOR 비교, 증분 계산)
+
+워드 65번의 출력 표시 비트(난방, 관수, 제습, 차광/보온/천창 개폐 ...)는
+0/1 상태값이므로 평균을 내면 "언제, 몇 번, 얼마나 오래" 돌았는지 알 수 없음.
+이 집계기는 연속된 두 워드를 XOR로 비교해서 바뀐 비트만 처리하고
+구간별로 채널마다 가동 시간, 켜짐 횟수, 최장 연속 가동 시간을 누적함
+
+- 가동 시간: 이전 샘플의 상태가 다음 샘플까지 유지된 것으로 계산 (샘플 앤 홀드)
+- 샘플 간격이 max_gap을 넘으면 (통신 끊김) 그 사이는 계산하지 않고 연속 가동도 끊음
+- 연속 가동 시간은 구간 경계를 넘어 이어짐 (구간 최장값은 구간 안에서 관측된 최대값)
+  단, 날짜가 바뀐 구간에서는 자정 이후 시간만 이어받음 (일별 최장 연속 가동은 그날 시간만 계산)
+
+사용법:
+    duty = DutyCycleAccumulator(NAMES_BY_TYPE['BIT_READ'])
+
+    duty.update(time.time(), {65: word})           # 워드 값으로 갱신
+    duty.update_values(time.time(), values)        # 또는 디코딩된 비트 값으로 갱신
+
+    duty.summary()    # {채널: {on_seconds, switch_ons, longest_run, duty}}
+    duty.reset()      # 다음 구간 시작 (이전 워드, 연속 가동 상태는 유지)
+================================================================================
+"""
+
+from datetime import datetime
+
+from control_specs import CONTROL_SPECS
+
+# 기본 최대 샘플 간격 (초, 넘으면 그 사이 가동 시간은 계산하지 않음)
+DEFAULT_MAX_GAP = 30.0
+
+
+def _midnight(timestamp):
+    """시각이 속한 날의 로컬 자정 (epoch 초)"""
+    return datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+class DutyCycleAccumulator:
+    """출력 비트별 구간 가동 시간, 켜짐 횟수, 최장 연속 가동 시간 집계"""
+
+    def __init__(self, names, max_gap=DEFAULT_MAX_GAP, specs=CONTROL_SPECS):
+        """
+        초기화
+
+        Args:
+            names: 집계할 BIT_READ 항목 이름 리스트
+            max_gap: 최대 샘플 간격 (초)
+            specs: 제어 명세 (기본값: CONTROL_SPECS)
+        """
+        self.channels = list(names)
+        self.max_gap = max_gap
+
+        # 워드별 {비트 번호: 채널 인덱스}
+        self._bits = {}
+        for i, name in enumerate(self.channels):
+            spec = specs[name]
+            self._bits.setdefault(spec['address'], {})[spec['bit']] = i
+        self.addresses = sorted(self._bits)  # 집계에 필요한 워드 주소
+
+        size = len(self.channels)
+        self.on_seconds = [0.0] * size
+        self.switch_ons = [0] * size
+        self.longest_run = [0.0] * size
+        self._run = [0.0] * size  # 현재 연속 가동 시간 (초, 구간 경계를 넘어 이어짐)
+
+        self._words = {}          # 마지막 워드 {주소: 값}
+        self._timestamp = None    # 마지막 샘플 시각
+        self.window_start = None  # 구간 시작 시각 (구간 안 첫 샘플 시각)
+        self.elapsed = 0.0        # 구간 안에서 계산한 시간 (초)
+
+    def update(self, timestamp, words):
+        """
+        워드 샘플 1개 반영
+
+        Args:
+            timestamp: 샘플 시각 (epoch 초)
+            words: {주소: 워드 값} (없는 주소는 이번 샘플에서 제외)
+        """
+        previous = self._timestamp
+        if previous is not None and timestamp <= previous:
+            return  # 같은 스냅샷이거나 시각이 거꾸로 감
+        if self.window_start is None:
+            self.window_start = timestamp
+
+        dt = 0.0 if previous is None else timestamp - previous
+        gap = dt > self.max_gap
+        if not gap:
+            self.elapsed += dt
+        self._timestamp = timestamp
+
+        for address, bits in self._bits.items():
+            word = words.get(address)
+            if word is None:
+                continue
+            old = self._words.get(address)
+            self._words[address] = word
+
+            if old is None or gap:
+                # 첫 샘플 또는 끊김 후: 상태만 기록 (켜진 비트는 지금부터 연속 가동)
+                for bit, i in bits.items():
+                    self._run[i] = 0.0
+                continue
+
+            # 이전 상태가 켜짐이었던 비트: 가동 시간 누적
+            on = old
+            while on:
+                low = on & -on
+                i = bits.get(low.bit_length() - 1)
+                if i is not None:
+                    self.on_seconds[i] += dt
+                    self._run[i] += dt
+                    if self._run[i] > self.longest_run[i]:
+                        self.longest_run[i] = self._run[i]
+                on ^= low
+
+            # 바뀐 비트만 처리 (꺼짐 → 켜짐: 횟수 증가, 켜짐 → 꺼짐: 연속 가동 종료)
+            changed = old ^ word
+            while changed:
+                low = changed & -changed
+                i = bits.get(low.bit_length() - 1)
+                if i is not None:
+                    if word & low:
+                        self.switch_ons[i] += 1
+                    self._run[i] = 0.0
+                changed ^= low
+
+    def update_values(self, timestamp, values):
+        """
+        디코딩된 비트 값 {채널: 0/1}으로 샘플 1개 반영 (워드 원본이 없을 때)
+
+        워드의 채널 비트 중 하나라도 None(읽기 실패)이면 그 워드는 이번 샘플에서 제외
+
+        Args:
+            timestamp: 샘플 시각 (epoch 초)
+            values: {채널 이름: 0/1 또는 None}
+        """
+        words = {}
+        for address, bits in self._bits.items():
+            word = 0
+            for bit, i in bits.items():
+                value = values.get(self.channels[i])
+                if value is None:
+                    break
+                if value:
+                    word |= 1 << bit
+            else:
+                words[address] = word
+        self.update(timestamp, words)
+
+    def reset(self):
+        """구간 누적값 초기화 (다음 구간 시작, 마지막 워드와 연속 가동 상태는 유지)"""
+        size = len(self.channels)
+        previous_start = self.window_start
+        self.window_start = self._timestamp
+
+        # 새 구간의 날짜가 바뀌었으면 이어지는 연속 가동은 자정 이후 시간만 남김
+        if previous_start is not None and self.window_start is not None:
+            midnight = _midnight(self.window_start)
+            if _midnight(previous_start) != midnight:
+                since_midnight = self.window_start - midnight
+                self._run = [min(run, since_midnight) for run in self._run]
+
+        self.on_seconds = [0.0] * size
+        self.switch_ons = [0] * size
+        # 이어지는 연속 가동은 다음 구간의 최장값 후보
+        self.longest_run = list(self._run)
+        self.elapsed = 0.0
+
+    def summary(self):
+        """
+        구간 집계
+
+        Returns:
+            딕셔너리 {채널 이름: {on_seconds, switch_ons, longest_run, duty}}
+            (duty: 가동 시간 / 구간 계산 시간, 계산한 시간이 없으면 None)
+        """
+        return {
+            name: {
+                "on_seconds": round(self.on_seconds[i], 1),
+                "switch_ons": self.switch_ons[i],
+                "longest_run": round(self.longest_run[i], 1),
+                "duty": round(self.on_seconds[i] / self.elapsed, 3) if self.elapsed > 0 else None
+            }
+            for i, name in enumerate(self.channels)
+        }
+
+    def ratios(self):
+        """
+        구간 가동률
+
+        Returns:
+            딕셔너리 {채널 이름: 가동률 0~1 또는 None}
+        """
+        return {name: stats["duty"] for name, stats in self.summary().items()}
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+History Store
+================================================================================
+센서 이력 시계열 저장소 (SQLite, WAL 모드)
+
+(타임스탬프, 항목) 키로 값을 저장하고, 여러 샘플을 모아서 한 트랜잭션으로
+일괄 삽입함. 시간 범위 조회는 기본 키 인덱스를 사용하므로 CSV 파일 전체를
+읽지 않음
+
+- 저장: add() 로 메모리에 모은 뒤 flush() 로 일괄 삽입
+- 조회: query() 는 남은 버퍼를 먼저 저장한 뒤 시간 범위를 조회
+- 출력 가동 시간: add_runtime() 으로 구간 집계를 일별 합계에 더하고 query_runtime() 으로 일별 조회
+
+사용법:
+    store = HistoryStore("sensor_data/history.db")
+
+    if store.add(time.time(), {"indoor_current_temperature": 21.5}):
+        store.flush()                              # 배치 크기 도달 시 저장
+
+    rows = store.query(time.time() - parse_range("24h"))
+    # [{'timestamp': 1735350000, 'indoor_current_temperature': 21.5, ...}, ...]
+
+    store.add_runtime(window_start, duty.summary())   # 1분 구간 가동 집계 → 일별 합계
+    days = store.query_runtime(time.time() - parse_range("7d"))
+    # [{'day': '2025-12-28', 'timestamp': ..., 'heating_output_indicator': {'on_seconds': 5400.0, ...}}, ...]
+
+    store.close()
+================================================================================
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# 기본 DB 파일 경로
+DEFAULT_DB_PATH = os.path.join("sensor_data", "history.db")
+
+# 일괄 삽입 기준 (버퍼에 쌓인 샘플 수)
+DEFAULT_BATCH_SIZE = 10
+
+# 조회 범위 단위 (초)
+RANGE_UNITS = {
+    'm': 60,
+    'h': 60 * 60,
+    'd': 24 * 60 * 60,
+    'w': 7 * 24 * 60 * 60,
+}
+
+# 최대 조회 범위 (초)
+MAX_RANGE = 31 * 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    ts INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (ts, item)
+) WITHOUT ROWID
+"""
+
+# 출력 비트 일별 가동 시간 (day: 로컬 자정 시각, 구간 집계를 더해서 갱신)
+RUNTIME_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runtime (
+    day INTEGER NOT NULL,
+    item TEXT NOT NULL,
+    on_seconds REAL NOT NULL DEFAULT 0,
+    switch_ons INTEGER NOT NULL DEFAULT 0,
+    longest_run REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, item)
+) WITHOUT ROWID
+"""
+
+
+def parse_range(text):
+    """
+    조회 범위 문자열을 초 단위로 변환
+
+    Args:
+        text: 범위 문자열 (예: '30m', '24h', '7d', '1w')
+
+    Returns:
+        범위 (초)
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 최대 범위(31일)를 넘는 경우
+    """
+    match = re.fullmatch(r'(\d+)([mhdw])', text.strip().lower())
+    if not match:
+        raise ValueError(f"잘못된 조회 범위: {text} (예: 30m, 24h, 7d, 1w)")
+
+    seconds = int(match.group(1)) * RANGE_UNITS[match.group(2)]
+    if seconds <= 0 or seconds > MAX_RANGE:
+        raise ValueError(f"조회 범위는 1분 ~ 31일 사이여야 합니다: {text}")
+    return seconds
+
+
+class HistoryStore:
+    """센서 이력 저장소 (SQLite WAL + 일괄 삽입)"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        초기화 (DB 파일이 없으면 생성)
+
+        Args:
+            path: SQLite DB 파일 경로
+            batch_size: 일괄 삽입 기준 샘플 수
+        """
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []  # [(ts, item, value), ...]
+        self._samples = 0   # 버퍼에 쌓인 샘플 수
+        self._lock = threading.Lock()
+
+        # 서버에서는 스레드 풀에서 호출하므로 같은 스레드 검사 해제 (잠금으로 직렬화)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+        self._conn.execute(RUNTIME_SCHEMA)
+        self._conn.commit()
+
+    @property
+    def pending(self):
+        """버퍼에 쌓인 (저장 전) 샘플 수"""
+        return self._samples
+
+    def add(self, timestamp, values):
+        """
+        샘플 1개를 버퍼에 추가 (DB 접근 없음)
+
+        Args:
+            timestamp: 샘플 시각 (epoch 초, 초 단위로 저장)
+            values: {항목 이름: 값} (None 값은 저장하지 않음)
+
+        Returns:
+            True: 배치 크기에 도달함 (flush() 호출 필요)
+            False: 아직 배치 크기 미만
+        """
+        ts = int(timestamp)
+        rows = [(ts, name, float(value)) for name, value in values.items() if value is not None]
+
+        with self._lock:
+            self._pending.extend(rows)
+            self._samples += 1
+            return self._samples >= self.batch_size
+
+    def flush(self):
+        """
+        버퍼를 한 트랜잭션으로 일괄 삽입
+
+        Returns:
+            저장한 행 수
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self):
+        """버퍼 일괄 삽입 (잠금을 잡은 상태에서 호출)"""
+        if not self._pending:
+            self._samples = 0
+            return 0
+
+        rows, self._pending, self._samples = self._pending, [], 0
+        try:
+            with self._conn:
+                # 같은 (시각, 항목)은 마지막 값으로 덮어씀
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO samples (ts, item, value) VALUES (?, ?, ?)", rows
+                )
+        except sqlite3.Error as e:
+            logger.error(f"이력 저장 오류: {e}")
+            return 0
+
+        return len(rows)
+
+    def query(self, start, end=None, items=None):
+        """
+        시간 범위 조회 (남은 버퍼를 먼저 저장)
+
+        Args:
+            start: 시작 시각 (epoch 초, 포함)
+            end: 종료 시각 (epoch 초, 포함, 기본값: 현재)
+            items: 조회할 항목 이름 리스트 (기본값: 전체)
+
+        Returns:
+            시각 순 행 리스트 [{'timestamp': ts, 항목: 값, ...}, ...]
+        """
+        if end is None:
+            end = time.time()
+
+        sql = "SELECT ts, item, value FROM samples WHERE ts BETWEEN ? AND ?"
+        params = [int(start), int(end)]
+        if items:
+            sql += f" AND item IN ({','.join('?' * len(items))})"
+            params.extend(items)
+        sql += " ORDER BY ts"
+
+        with self._lock:
+            self._flush_locked()
+            cursor = self._conn.execute(sql, params)
+
+            rows = []
+            row = None
+            for ts, item, value in cursor:
+                if row is None or row['timestamp'] != ts:
+                    row = {'timestamp': ts}
+                    rows.append(row)
+                row[item] = value
+
+        return rows
+
+    def add_runtime(self, timestamp, stats):
+        """
+        출력 비트 구간 집계를 일별 합계에 더함 (바로 저장)
+
+        Args:
+            timestamp: 구간 시작 시각 (epoch 초, 이 시각의 날짜에 더함)
+            stats: {항목 이름: {on_seconds, switch_ons, longest_run}} (DutyCycleAccumulator.summary())
+
+        Returns:
+            갱신한 행 수
+        """
+        day = int(datetime.fromtimestamp(timestamp).replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+        rows = [
+            (day, name, float(item["on_seconds"]), int(item["switch_ons"]), float(item["longest_run"]))
+            for name, item in stats.items()
+        ]
+
+        with self._lock:
+            try:
+                with self._conn:
+                    # 가동 시간, 켜짐 횟수는 더하고 최장 연속 가동은 큰 값 유지
+                    self._conn.executemany(
+                        "INSERT INTO runtime (day, item, on_seconds, switch_ons, longest_run) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (day, item) DO UPDATE SET "
+                        "on_seconds = on_seconds + excluded.on_seconds, "
+                        "switch_ons = switch_ons + excluded.switch_ons, "
+                        "longest_run = MAX(longest_run, excluded.longest_run)",
+                        rows
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"가동 시간 저장 오류: {e}")
+                return 0
+
+        return len(rows)
+
+    def query_runtime(self, start, end=None, items=None):
+        """
+        출력 비트 일별 가동 시간 조회
+
+        Args:
+            start: 시작 시각 (epoch 초, 이 시각이 속한 날부터)
+            end: 종료 시각 (epoch 초, 기본값: 현재)
+            items: 조회할 항목 이름 리스트 (기본값: 전체)
+
+        Returns:
+            날짜 순 리스트 [{'day': 'YYYY-MM-DD', 'timestamp': 자정 시각, 항목: {on_seconds, switch_ons, longest_run}}, ...]
+        """
+        if end is None:
+            end = time.time()
+        first_day = datetime.fromtimestamp(start).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+        sql = "SELECT day, item, on_seconds, switch_ons, longest_run FROM runtime WHERE day BETWEEN ? AND ?"
+        params = [int(first_day), int(end)]
+        if items:
+            sql += f" AND item IN ({','.join('?' * len(items))})"
+            params.extend(items)
+        sql += " ORDER BY day"
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+
+            rows = []
+            row = None
+            for day, item, on_seconds, switch_ons, longest_run in cursor:
+                if row is None or row['timestamp'] != day:
+                    row = {'day': datetime.fromtimestamp(day).strftime('%Y-%m-%d'), 'timestamp': day}
+                    rows.append(row)
+                row[item] = {"on_seconds": round(on_seconds, 1), "switch_ons": switch_ons, "longest_run": round(longest_run, 1)}
+
+        return rows
+
+    def close(self):
+        """남은 버퍼 저장 후 DB 닫기"""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+복제 저장 싱크 (목적지별 쓰기 스레드)
+수집 루프는 1분 집계 행을 목적지별 큐에 넣고 바로 반환하고,
+나스/바탕화면 각각의 쓰기 스레드가 CSV 파일에 씀
+
+- 네트워크 공유 폴더가 멈춰도 그 목적지의 스레드만 기다리고 10초 수집은 계속됨
+- 목적지별 큐는 크기 제한 (가득 차면 기다리지 않고 그 목적지의 로컬 스풀에 바로 저장, 버리는 행 없음)
+- 재시도/스풀은 목적지별 CsvSink가 처리 (새 행이 없어도 주기적으로 스풀 재시도)
+- 스풀에 행이 있으면 큐에 남은 행까지 스풀에 넣은 뒤 시각 순서대로 한 번에 옮겨 씀
+- 목적지별 대기 행 수, 지연 시간(가장 오래 기다린 행)은 get_stats()로 확인
+"""
+
+import queue
+import threading
+import time
+
+# 목적지별 최대 대기 행 수 (1분 집계 기준 2시간)
+MAX_QUEUE = 120
+
+# 종료 시 남은 행을 쓰기까지 기다리는 최대 시간 (초)
+CLOSE_TIMEOUT = 30.0
+
+
+class SinkWriter(threading.Thread):
+    """목적지 1곳의 쓰기 스레드 (CsvSink는 이 스레드에서만 사용)"""
+
+    def __init__(self, sink, max_queue=MAX_QUEUE):
+        """
+        초기화
+
+        Args:
+            sink: CsvSink (write, retry_spool, close, pending, retry_interval)
+            max_queue: 최대 대기 행 수
+        """
+        super().__init__(name=f"sink-{sink.name}", daemon=True)
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=max_queue)
+        self._busy_since = None  # 쓰는 중인 행을 큐에 넣은 시각 (monotonic)
+
+        # 통계
+        self.submitted = 0
+        self.overflowed = 0  # 큐가 가득 차서 바로 스풀에 넣은 행
+        self.failed = 0
+        self.max_lag = 0.0  # 최대 지연 (초, 큐에 넣은 시각 → 쓰기 완료)
+
+    def submit(self, timestamp, values):
+        """
+        행 1개를 큐에 추가 (기다리지 않음, 큐가 가득 차면 로컬 스풀에 바로 저장)
+
+        Args:
+            timestamp: 행 시각 (epoch 초)
+            values: {필드 이름: 값}
+
+        Returns:
+            True: 큐에 추가함, False: 스풀에 저장함 (쓰기 스레드가 나중에 파일로 옮김)
+        """
+        self.submitted += 1
+        try:
+            self.queue.put_nowait((time.monotonic(), timestamp, values))
+            return True
+        except queue.Full:
+            pass
+
+        self.overflowed += 1
+        print(f"[경고] {self.sink.name} 저장 큐가 가득 찼습니다 ({self.queue.maxsize}행, 지연 {self.lag():.0f}초) - 로컬 스풀에 저장합니다")
+        self._spool(timestamp, values)
+        return False
+
+    def _spool(self, timestamp, values):
+        """행을 로컬 스풀에 저장 (스풀 자체가 실패하면 기록만 함)"""
+        try:
+            self.sink.spool(timestamp, values)
+        except Exception as e:
+            self.failed += 1
+            print(f"[오류] {self.sink.name} 스풀 저장 실패: {e}")
+
+    def run(self):
+        """쓰기 루프 (종료 표시(None)를 받으면 스풀 정리 후 종료)"""
+        while True:
+            try:
+                item = self.queue.get(timeout=self.sink.retry_interval)
+            except queue.Empty:
+                # 새 행이 없어도 스풀에 남은 행은 주기적으로 옮겨 씀
+                self.sink.retry_spool()
+                continue
+
+            if item is None:
+                self.queue.task_done()
+                break
+
+            enqueued, timestamp, values = item
+            self._busy_since = enqueued
+            try:
+                if self.sink.pending and not self.queue.empty():
+                    # 스풀에 행이 있으면 큐가 빌 때까지 스풀에 모은 뒤 한 번에 시각 순서대로 씀
+                    self.sink.spool(timestamp, values)
+                else:
+                    self.sink.write(timestamp, values)
+            except Exception as e:
+                # 로컬 스풀까지 실패 (디스크 오류 등)
+                self.failed += 1
+                print(f"[오류] {self.sink.name} 저장 실패 (스풀 포함): {e}")
+            finally:
+                self.max_lag = max(self.max_lag, time.monotonic() - enqueued)
+                self._busy_since = None
+                self.queue.task_done()
+
+        self.sink.close()
+
+    def lag(self):
+        """현재 지연 시간 (초, 쓰지 못하고 가장 오래 기다린 행 기준, 없으면 0)"""
+        oldest = self._busy_since
+        if oldest is None:
+            with self.queue.mutex:
+                if self.queue.queue and self.queue.queue[0] is not None:
+                    oldest = self.queue.queue[0][0]
+        return time.monotonic() - oldest if oldest is not None else 0.0
+
+    def get_stats(self):
+        """
+        목적지 통계
+
+        Returns:
+            딕셔너리 {queued, lag, max_lag, submitted, written, spooled, spool_pending, overflowed, failed}
+            (written: 파일에 쓴 행, 스풀을 거쳐 나중에 쓴 행 포함)
+        """
+        return {
+            "queued": self.queue.qsize(),
+            "lag": round(self.lag(), 1),
+            "max_lag": round(self.max_lag, 1),
+            "submitted": self.submitted,
+            "written": self.sink.written,
+            "spooled": self.sink.spooled,
+            "spool_pending": self.sink.pending,
+            "overflowed": self.overflowed,
+            "failed": self.failed
+        }
+
+
+class ReplicatedSink:
+    """여러 목적지에 같은 행을 비동기로 저장 (목적지별 큐 + 쓰기 스레드)"""
+
+    def __init__(self, sinks, max_queue=MAX_QUEUE):
+        """
+        초기화 (목적지별 쓰기 스레드 시작)
+
+        Args:
+            sinks: CsvSink 리스트
+            max_queue: 목적지별 최대 대기 행 수 (넘으면 로컬 스풀)
+        """
+        self.writers = [SinkWriter(sink, max_queue) for sink in sinks]
+        for writer in self.writers:
+            writer.start()
+
+    def submit(self, timestamp, values):
+        """
+        모든 목적지 큐에 행 추가 (기다리지 않음, 쓰기는 목적지별 스레드에서)
+
+        Args:
+            timestamp: 행 시각 (epoch 초)
+            values: {필드 이름: 값}
+
+        Returns:
+            딕셔너리 {목적지 이름: True 큐에 추가 / False 큐가 가득 차서 스풀에 저장}
+        """
+        return {writer.sink.name: writer.submit(timestamp, values) for writer in self.writers}
+
+    def get_stats(self):
+        """
+        목적지별 통계
+
+        Returns:
+            딕셔너리 {목적지 이름: SinkWriter.get_stats()}
+        """
+        return {writer.sink.name: writer.get_stats() for writer in self.writers}
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """
+        남은 행을 모두 쓰고 종료 (멈춘 목적지는 timeout 후 큐에 남은 행을 스풀에 저장)
+
+        목적지마다 따로 timeout을 줌 (멈춘 목적지가 다른 목적지의 대기 시간을 쓰지 않음)
+
+        Args:
+            timeout: 목적지별 최대 대기 시간 (초)
+        """
+        # 큐에 자리가 있는 목적지는 바로 종료 표시 (남은 행을 동시에 씀)
+        waiting = []
+        for writer in self.writers:
+            try:
+                writer.queue.put_nowait(None)
+            except queue.Full:
+                waiting.append(writer)
+
+        for writer in self.writers:
+            started = time.monotonic()
+            deadline = started + timeout
+            if writer in waiting:
+                try:
+                    writer.queue.put(None, timeout=timeout)
+                except queue.Full:
+                    pass
+            writer.join(max(0.0, deadline - time.monotonic()))
+            if not writer.is_alive():
+                continue
+
+            # 멈춘 목적지: 큐에 남은 행은 스풀에 저장 (다음 실행 때 파일로 옮김)
+            spooled = 0
+            while True:
+                try:
+                    item = writer.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    writer._spool(item[1], item[2])
+                    spooled += 1
+            # 멈춘 쓰기가 풀리면 스레드가 정리 후 종료하도록 종료 표시를 다시 넣음
+            writer.queue.put_nowait(None)
+            print(f"[경고] {writer.sink.name} 저장이 {time.monotonic() - started:.0f}초 안에 끝나지 않아 중단합니다 "
+                  f"(쓰는 중인 행 지연 {writer.lag():.0f}초, 큐에 남은 {spooled}행은 로컬 스풀에 저장)")
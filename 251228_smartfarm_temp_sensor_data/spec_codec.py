@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Spec Codec
+================================================================================
+제어명세서(CONTROL_SPECS) 디코딩 테이블
+
+CONTROL_SPECS를 import 시 한 번만 컴파일하여 배열 기반 디코딩 테이블
+(주소, 종류, 시프트, 마스크, 스케일, signed, 워드 수)로 보관함.
+읽기마다 명세 딕셔너리를 다시 해석하거나 '온도' 문자열을 검색하지 않음
+
+- 단일 항목 / 단일 이미지 디코딩: 순수 파이썬 (numpy 불필요)
+- 다수 레지스터 이미지 일괄 디코딩: numpy 벡터 연산 (백필, 재생용)
+
+사용법:
+    from spec_codec import SPEC_CODEC
+
+    value = SPEC_CODEC.decode("indoor_current_temperature", [235])
+    values = SPEC_CODEC.decode_words(words)           # {name: value}
+    table = SPEC_CODEC.decode_images(images)          # numpy (N, 223)
+================================================================================
+"""
+
+from array import array
+from collections import namedtuple
+
+# 제어 명세서 데이터베이스 import
+from control_specs import CONTROL_SPECS
+
+# 디코딩 종류
+KIND_WORD = 0   # 워드 1개 (스케일, signed 적용)
+KIND_DWORD = 1  # 워드 2개 (32비트 값)
+KIND_BITS = 2   # 비트 / 비트 범위 (시프트, 마스크 적용)
+
+# 컴파일된 항목 (순수 파이썬 디코딩용)
+CompiledSpec = namedtuple('CompiledSpec', ['address', 'count', 'kind', 'shift', 'mask', 'scale', 'signed'])
+
+
+def is_signed_spec(name, spec):
+    """
+    signed 16비트 변환 대상 여부 (온도 관련 항목)
+
+    Args:
+        name: 제어 이름
+        spec: 제어 명세 딕셔너리
+
+    Returns:
+        True / False
+    """
+    return '온도' in spec.get('korean_name', '') or 'temperature' in name.lower()
+
+
+def compile_spec(name, spec):
+    """
+    제어 명세를 디코딩 항목으로 컴파일
+
+    Args:
+        name: 제어 이름
+        spec: 제어 명세 딕셔너리
+
+    Returns:
+        성공: CompiledSpec
+        실패: None (지원하지 않는 타입)
+    """
+    spec_type = spec['type']
+    address = spec['address']
+
+    if spec_type in ('SENSOR_READ', 'REGISTER_READ', 'REGISTER_WRITE'):
+        count = spec.get('count', 1)
+        if count == 1:
+            return CompiledSpec(address, 1, KIND_WORD, 0, 0xFFFF, spec.get('scale', 1), is_signed_spec(name, spec))
+        return CompiledSpec(address, count, KIND_DWORD, 0, 0xFFFF, 1, False)
+
+    if spec_type in ('BIT_READ', 'BIT_WRITE'):
+        return CompiledSpec(address, 1, KIND_BITS, spec['bit'], 1, 1, False)
+
+    if spec_type in ('BIT_RANGE_READ', 'BIT_RANGE_WRITE'):
+        bit_count = spec['bit_end'] - spec['bit_start'] + 1
+        return CompiledSpec(address, 1, KIND_BITS, spec['bit_start'], (1 << bit_count) - 1, 1, False)
+
+    return None
+
+
+def decode_compiled(entry, registers):
+    """
+    컴파일된 항목을 레지스터 값으로부터 디코딩
+
+    Args:
+        entry: CompiledSpec
+        registers: 항목 주소부터 시작하는 레지스터 값 리스트
+
+    Returns:
+        디코딩된 값
+    """
+    if entry.kind == KIND_WORD:
+        raw = registers[0]
+        # 32768 이상이면 음수 (signed 16비트)
+        if entry.signed and raw >= 0x8000:
+            raw = raw - 0x10000
+        return raw / entry.scale
+
+    if entry.kind == KIND_DWORD:
+        return (registers[0] << 16) | registers[1]
+
+    return (registers[0] >> entry.shift) & entry.mask
+
+
+class SpecCodec:
+    """제어명세서 디코딩 테이블 (배열 기반)"""
+
+    def __init__(self, specs=CONTROL_SPECS):
+        """
+        초기화 (명세 컴파일)
+
+        Args:
+            specs: 제어 명세 딕셔너리 {name: spec}
+        """
+        self.entries = {}
+        for name, spec in specs.items():
+            entry = compile_spec(name, spec)
+            if entry is not None:
+                self.entries[name] = entry
+
+        # 항목 순서 (decode_images 결과의 열 순서)
+        self.names = tuple(self.entries)
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        # 배열 기반 디코딩 테이블
+        entries = [self.entries[name] for name in self.names]
+        self.address = array('H', [e.address for e in entries])
+        self.count = array('B', [e.count for e in entries])
+        self.kind = array('B', [e.kind for e in entries])
+        self.shift = array('B', [e.shift for e in entries])
+        self.mask = array('H', [e.mask for e in entries])
+        self.scale = array('d', [e.scale for e in entries])
+        self.signed = array('B', [e.signed for e in entries])
+
+        self._tables = None  # numpy 테이블 (decode_images 첫 호출 시 생성)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def decode(self, name, registers):
+        """
+        항목 1개 디코딩
+
+        Args:
+            name: 제어 이름
+            registers: 항목 주소부터 시작하는 레지스터 값 리스트
+
+        Returns:
+            성공: 디코딩된 값
+            실패: None (알 수 없는 이름)
+        """
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        return decode_compiled(entry, registers)
+
+    def decode_words(self, words, start=0, names=None):
+        """
+        레지스터 이미지 1개 디코딩 (순수 파이썬)
+
+        Args:
+            words: 워드 값 리스트 (start부터 연속)
+            start: 첫 워드 주소
+            names: 제어 이름 리스트 (기본값: 이미지 범위 내 전체 항목)
+
+        Returns:
+            딕셔너리 {name: value} (범위 밖 항목은 None)
+        """
+        end = start + len(words)
+        results = {}
+
+        for name in (self.names if names is None else names):
+            entry = self.entries.get(name)
+            if entry is None:
+                results[name] = None
+                continue
+
+            offset = entry.address - start
+            if entry.address < start or entry.address + entry.count > end:
+                if names is not None:
+                    results[name] = None
+                continue
+
+            results[name] = decode_compiled(entry, words[offset:offset + entry.count])
+
+        return results
+
+    def _numpy_tables(self):
+        """numpy 디코딩 테이블 (배열 테이블을 복사 없이 참조)"""
+        if self._tables is None:
+            import numpy as np
+
+            self._tables = {
+                'address': np.frombuffer(self.address, dtype=np.uint16).astype(np.intp),
+                'kind': np.frombuffer(self.kind, dtype=np.uint8),
+                'shift': np.frombuffer(self.shift, dtype=np.uint8).astype(np.int64),
+                'mask': np.frombuffer(self.mask, dtype=np.uint16).astype(np.int64),
+                'scale': np.frombuffer(self.scale, dtype=np.float64),
+                'signed': np.frombuffer(self.signed, dtype=np.uint8).astype(bool),
+            }
+        return self._tables
+
+    def decode_images(self, images, start=0):
+        """
+        레지스터 이미지 여러 개를 numpy로 일괄 디코딩 (백필, 재생용)
+
+        Args:
+            images: 워드 배열 (N x 워드 수) 또는 이미지 1개 (워드 수)
+            start: 첫 워드 주소
+
+        Returns:
+            numpy float64 배열 (N x len(names)), 열 순서는 self.names
+        """
+        import numpy as np
+
+        t = self._numpy_tables()
+        words = np.asarray(images, dtype=np.int64)
+        if words.ndim == 1:
+            words = words[np.newaxis, :]
+
+        address = t['address'] - start
+        raw = words[:, address]
+
+        # 비트 / 비트 범위 / 워드 공통: 시프트 후 마스크
+        values = (raw >> t['shift']) & t['mask']
+
+        # signed 16비트 변환 (온도 관련 항목)
+        values = np.where(t['signed'] & (values >= 0x8000), values - 0x10000, values)
+
+        # 2워드 항목 (32비트 값)
+        dword = t['kind'] == KIND_DWORD
+        if dword.any():
+            values[:, dword] = (raw[:, dword] << 16) | words[:, address[dword] + 1]
+
+        return values / t['scale']
+
+
+# import 시 한 번 컴파일
+SPEC_CODEC = SpecCodec()
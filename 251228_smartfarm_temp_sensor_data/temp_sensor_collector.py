@@ -9,7 +9,6 @@
 import os
 import sys
 from datetime import datetime
-import csv
 import time
 
 # 현재 디렉토리를 스크립트 위치로 설정 (독립 실행)
@@ -19,6 +18,12 @@ sys.path.insert(0, script_dir)
 
 from modbus_tcp_controller import ModbusController
 from control_specs import CONTROL_SPECS
+from history_store import HistoryStore
+from window_accumulator import WindowAccumulator
+from duty_cycle import DutyCycleAccumulator
+from csv_sink import CsvSink
+from replicated_sink import ReplicatedSink
+from tick_scheduler import TickScheduler
 
 # Modbus 서버 설정
 MODBUS_HOST = "aiseednaju.iptime.org"
@@ -33,6 +38,15 @@ SAVE_INTERVAL = 60     # 60초(1분)마다 평균값 저장
 DATA_FOLDER = "sensor_data"
 BACKUP_FOLDER = os.path.join(os.path.expanduser('~'), 'Desktop', 'sensor_backup')
 
+# CSV 파일이 잠겨 있을 때 (Excel 등) 행을 쌓아두는 로컬 폴더 (다음 저장 때 파일로 옮김)
+SPOOL_FOLDER = os.path.join(os.path.expanduser('~'), 'sensor_spool')
+
+# 저장 지연이 이 시간(초) 이상이면 상태 출력에 표시
+LAG_WARNING = 10
+
+# 시계열 이력 DB (1분 평균값, 시간 범위 조회용)
+HISTORY_DB = os.path.join(DATA_FOLDER, "history.db")
+
 # 수집할 센서 목록
 SENSOR_ITEMS = [
     "indoor_current_temperature",      # 내부 온도
@@ -63,6 +77,18 @@ SENSOR_ITEMS = [
     "circulation_fan_output_indicator",  # 비트 2
 ]
 
+# 명세에 센서값 주소가 없는 외부 풍향/풍속 {이름: (워드 주소, 스케일)}
+WIND_WORDS = {
+    "outdoor_wind_direction": (78, 1),
+    "outdoor_wind_speed": (79, 10),
+}
+
+# 워드 65번 출력 비트 (평균 대신 가동 시간/켜짐 횟수로 집계)
+OUTPUT_ITEMS = [name for name in SENSOR_ITEMS if CONTROL_SPECS.get(name, {}).get('type') == 'BIT_READ']
+
+# 평균값으로 집계하는 센서
+ANALOG_ITEMS = [name for name in SENSOR_ITEMS if name not in OUTPUT_ITEMS]
+
 # 센서 이름의 한글 매핑
 SENSOR_KOREAN_NAMES = {
     "indoor_current_temperature": "내부온도",
@@ -97,184 +123,67 @@ def read_sensors(controller):
     """모든 센서 값 읽기"""
     results = {}
 
-    # 워드 65번을 한 번만 읽어서 모든 비트 추출 (통신 부하 감소)
-    word_65_bits = {}
-    word_65_sensor_names = [
-        "circulation_fan_humidity_condition_output_active",
-        "circulation_fan_temperature_condition_output_active",
-        "shading_open_output_indicator",
-        "shading_close_output_indicator",
-        "upper_insulation_open_output_indicator",
-        "upper_insulation_close_output_indicator",
-        "roof_right_end_open_output_indicator",
-        "roof_right_open_output_indicator",
-        "roof_left_end_open_output_indicator",
-        "roof_left_open_output_indicator",
-        "dehumidifier_output_indicator",
-        "heating_output_indicator",
-        "irrigation_output_indicator",
-        "circulation_fan_output_indicator",
-    ]
-
+    # CONTROL_SPECS에 있는 센서는 read_multiple로 읽기
+    # 외부 풍향/풍속은 CONTROL_SPECS에 실제 센서값 주소가 없으므로 워드 원시 값으로 함께 읽음
+    # (워드 65번 비트 14개, 워드 66, 70~79가 읽기 계획에서 하나의 구간으로 합쳐짐)
+    spec_names = [name for name in SENSOR_ITEMS if name in CONTROL_SPECS]
     try:
-        # 워드 65번을 한 번만 읽기
-        word_65_value = controller.read_sensor(65, scale=1, signed=False)
+        values = controller.read_multiple(spec_names, words=[address for address, scale in WIND_WORDS.values()])
+    except Exception as e:
+        print(f"센서 읽기 오류: {e}")
+        values = {}
 
-        # 비트 15~2 추출 (14개)
-        bit_positions = [15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2]
-        for i, sensor_name in enumerate(word_65_sensor_names):
-            bit_pos = bit_positions[i]
-            bit_value = (int(word_65_value) >> bit_pos) & 1
-            word_65_bits[sensor_name] = bit_value
+    for sensor_name in spec_names:
+        results[sensor_name] = values.get(sensor_name)
 
-    except Exception as e:
-        print(f"워드 65번 읽기 오류: {e}")
-        # 실패 시 모든 비트를 None으로 설정
-        for sensor_name in word_65_sensor_names:
-            word_65_bits[sensor_name] = None
-
-    # 각 센서 읽기
-    for sensor_name in SENSOR_ITEMS:
-        try:
-            # 워드 65번 비트는 이미 읽었으므로 캐시에서 가져오기
-            if sensor_name in word_65_bits:
-                results[sensor_name] = word_65_bits[sensor_name]
-                continue
-
-            # 외부 풍향/풍속은 직접 읽기 (CONTROL_SPECS에 실제 센서값 주소 없음)
-            if sensor_name == "outdoor_wind_direction":
-                # 워드 주소 78 (외부 풍향, 스케일 1, 0~360도)
-                value = controller.read_sensor(78, scale=1, signed=False)
-                results[sensor_name] = value
-                continue
-
-            elif sensor_name == "outdoor_wind_speed":
-                # 워드 주소 79 (외부 풍속, 스케일 /10, m/s)
-                value = controller.read_sensor(79, scale=10, signed=False)
-                results[sensor_name] = value
-                continue
-
-            # CONTROL_SPECS에 있는 센서는 read_by_name 사용
-            value = controller.read_by_name(sensor_name)
-            results[sensor_name] = value
-
-        except Exception as e:
-            print(f"센서 읽기 오류 [{sensor_name}]: {e}")
-            results[sensor_name] = None
-
-    return results
-
-
-def calculate_average(data_buffer):
-    """버퍼에 있는 데이터의 평균값 계산"""
-    if not data_buffer:
-        return {}
-
-    averages = {}
-
-    for sensor_name in SENSOR_ITEMS:
-        values = []
-        for data in data_buffer:
-            value = data.get(sensor_name)
-            if value is not None:
-                values.append(value)
-
-        if values:
-            averages[sensor_name] = sum(values) / len(values)
-        else:
-            averages[sensor_name] = None
-
-    return averages
-
-
-def save_to_csv_single(data, folder, location_name):
-    """단일 폴더에 CSV 파일 저장"""
-    now = datetime.now()
-
-    # 데이터 폴더가 없으면 생성
-    if not os.path.exists(folder):
-        os.makedirs(folder)
-        print(f"데이터 저장 폴더 생성: {folder}")
-
-    # 파일명: @2025-12-26.csv
-    date_str = now.strftime("%Y-%m-%d")
-    filename = os.path.join(folder, f"@{date_str}.csv")
-
-    # 현재 시각 (절대시간 1분 단위로 반올림)
-    # 초를 0으로 설정
-    timestamp = now.strftime("%Y-%m-%d %H:%M:00")
-
-    # 파일 존재 여부 확인 (헤더 작성용)
-    file_exists = os.path.isfile(filename)
-
-    # CSV 파일에 저장 (파일 잠금 오류 시 재시도)
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            # CSV 파일에 추가
-            with open(filename, 'a', newline='', encoding='utf-8-sig') as f:
-                # 헤더 정의 (한글)
-                headers = ['시간'] + [SENSOR_KOREAN_NAMES[name] for name in SENSOR_ITEMS]
-
-                # 실제 데이터 필드명 (영문)
-                fieldnames = ['Timestamp'] + SENSOR_ITEMS
-
-                # writer 생성
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-                # 파일이 새로 생성되면 한글 헤더 작성
-                if not file_exists:
-                    # 한글 헤더 먼저 쓰기
-                    f.write(','.join(headers) + '\n')
-
-                # 데이터 행 작성 (소수점 첫째자리까지만)
-                row = {'Timestamp': timestamp}
-                for sensor_name, value in data.items():
-                    if value is not None:
-                        # 소수점 첫째자리까지 반올림
-                        row[sensor_name] = round(value, 1)
-                    else:
-                        row[sensor_name] = value
-                writer.writerow(row)
-
-            return True  # 성공
-
-        except PermissionError:
-            if attempt < max_retries - 1:
-                print(f"[경고] {location_name} CSV 파일이 다른 프로그램에서 열려있습니다. 2초 후 재시도... ({attempt + 1}/{max_retries})")
-                time.sleep(2)
-            else:
-                print(f"[오류] {location_name} CSV 파일 저장 실패: {filename}")
-                print(f"       파일이 Excel 등 다른 프로그램에서 열려있는지 확인하세요.")
-                return False
-        except Exception as e:
-            print(f"[오류] {location_name} CSV 파일 저장 중 오류: {e}")
-            return False
+    # 워드 78 (외부 풍향, 스케일 1, 0~360도), 워드 79 (외부 풍속, 스케일 /10, m/s)
+    for sensor_name, (address, scale) in WIND_WORDS.items():
+        raw = values.get(address)
+        results[sensor_name] = raw / scale if raw is not None else None
+
+    return {sensor_name: results.get(sensor_name) for sensor_name in SENSOR_ITEMS}
 
-    return False
 
+def save_to_csv(replicated, timestamp, data):
+    """CSV 파일로 2곳에 저장 요청 (나스 + 바탕화면 백업, 목적지별 쓰기 스레드가 기록)"""
+    label = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:00")
 
-def save_to_csv(data):
-    """CSV 파일로 2곳에 저장 (나스 + 바탕화면 백업)"""
-    now = datetime.now()
-    timestamp = now.strftime("%Y-%m-%d %H:%M:00")
+    # 큐에 넣고 바로 반환 (느린 나스가 수집 루프를 막지 않음)
+    replicated.submit(timestamp, data)
 
-    # 1. 나스(또는 프로그램 폴더)에 저장
-    nas_success = save_to_csv_single(data, DATA_FOLDER, "나스")
+    # 목적지별 대기 행 수 / 지연 시간 / 스풀 대기 행 수
+    status = []
+    for name, stats in replicated.get_stats().items():
+        text = f"{name} 대기 {stats['queued']}행"
+        if stats['lag'] >= LAG_WARNING:
+            text += f", 지연 {stats['lag']:.0f}초"
+        if stats['spool_pending']:
+            text += f", 스풀 {stats['spool_pending']}행"
+        status.append(text)
+    print(f"[{label}] 평균값 저장 요청 ({' / '.join(status)})")
 
-    # 2. 바탕화면 백업 폴더에 저장
-    backup_success = save_to_csv_single(data, BACKUP_FOLDER, "바탕화면")
 
-    # 결과 출력
-    if nas_success and backup_success:
-        print(f"[{timestamp}] 평균값 저장 완료 (나스 + 바탕화면)")
-    elif nas_success:
-        print(f"[{timestamp}] 평균값 저장 완료 (나스만 저장, 바탕화면 실패)")
-    elif backup_success:
-        print(f"[{timestamp}] 평균값 저장 완료 (바탕화면만 저장, 나스 실패)")
-    else:
-        print(f"[{timestamp}] 평균값 저장 실패 (나스, 바탕화면 모두 실패)")
-        raise Exception("CSV 파일 저장 실패 (모든 위치)")
+def save_to_history(history, timestamp, data):
+    """1분 평균값을 이력 DB에 추가 (배치 크기에 도달하면 일괄 저장)"""
+    # CSV와 같은 절대시간 1분 단위 시각 (구간 저장 시각 기준)
+    minute = datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0).timestamp()
+
+    try:
+        if history.add(minute, data):
+            history.flush()
+    except Exception as e:
+        print(f"[오류] 이력 DB 저장 중 오류: {e}")
+
+
+def save_runtime(history, duty):
+    """출력 비트 구간 가동 집계를 이력 DB 일별 합계에 추가"""
+    if duty.window_start is None:
+        return
+
+    try:
+        history.add_runtime(duty.window_start, duty.summary())
+    except Exception as e:
+        print(f"[오류] 가동 시간 저장 중 오류: {e}")
 
 
 def reconnect_controller(controller):
@@ -322,71 +231,98 @@ def main():
 
     print("연결 성공!\n")
 
-    # 데이터 버퍼 (1분간 수집된 데이터 저장)
-    data_buffer = []
-    last_save_minute = -1  # 마지막 저장한 분
+    # 이력 DB (나스 폴더)
+    history = HistoryStore(HISTORY_DB)
+
+    # CSV 저장 (나스 + 바탕화면 백업, 목적지별 쓰기 스레드가 당일 파일을 열어둔 채로 씀)
+    headers = ['시간'] + [SENSOR_KOREAN_NAMES[name] for name in SENSOR_ITEMS]
+    replicated = ReplicatedSink([
+        CsvSink(DATA_FOLDER, SENSOR_ITEMS, headers, "나스", SPOOL_FOLDER),
+        CsvSink(BACKUP_FOLDER, SENSOR_ITEMS, headers, "바탕화면", SPOOL_FOLDER),
+    ])
+
+    # 1분 구간 누적 통계 (샘플을 쌓지 않고 채널별 합/최소/최대 등만 갱신)
+    accumulator = WindowAccumulator(ANALOG_ITEMS)
+
+    # 출력 비트 가동 시간 집계 (워드 XOR 비교, 최대 간격 = 수집 간격 x 3)
+    duty = DutyCycleAccumulator(OUTPUT_ITEMS, max_gap=COLLECT_INTERVAL * 3)
     consecutive_failures = 0
 
-    try:
-        while True:
-            # 연결 상태 확인
-            if not controller.is_connected():
-                consecutive_failures += 1
-                if consecutive_failures >= 3:
-                    if not reconnect_controller(controller):
-                        print("\n재연결 실패. 프로그램을 종료합니다.")
-                        break
-                    consecutive_failures = 0
-                time.sleep(COLLECT_INTERVAL)
-                continue
-
-            # 센서 값 읽기
-            data = read_sensors(controller)
-
-            # 성공적으로 읽으면 실패 카운터 리셋
-            if any(v is not None for v in data.values()):
+    def collect(tick):
+        """10초 수집 작업"""
+        nonlocal consecutive_failures
+
+        # 연결 상태 확인
+        if not controller.is_connected():
+            consecutive_failures += 1
+            if consecutive_failures >= 3:
+                if not reconnect_controller(controller):
+                    print("\n재연결 실패. 프로그램을 종료합니다.")
+                    scheduler.stop()
+                    return
                 consecutive_failures = 0
-                data_buffer.append(data)
+            return
+
+        # 센서 값 읽기
+        data = read_sensors(controller)
+
+        # 성공적으로 읽으면 실패 카운터 리셋
+        if any(v is not None for v in data.values()):
+            consecutive_failures = 0
+            accumulator.add(data)
+            duty.update_values(tick.wall, data)
+
+            # 간단한 상태 출력 (수집 기준 시각 = 10초 경계)
+            valid_count = sum(1 for v in data.values() if v is not None)
+            skipped = f", {tick.missed}회 건너뜀" if tick.missed else ""
+            print(f"[{datetime.fromtimestamp(tick.wall).strftime('%H:%M:%S')}] 수집 완료 ({valid_count}/{len(SENSOR_ITEMS)} 센서{skipped})")
 
-                # 간단한 상태 출력
-                now = datetime.now()
-                valid_count = sum(1 for v in data.values() if v is not None)
-                print(f"[{now.strftime('%H:%M:%S')}] 수집 완료 ({valid_count}/{len(SENSOR_ITEMS)} 센서)")
+    def save_window(timestamp):
+        """구간 집계 저장 후 다음 구간 시작"""
+        # 센서는 구간 평균값, 출력 비트는 시간 기준 가동률 (0~1)
+        avg_data = accumulator.means()
+        avg_data.update(duty.ratios())
 
-            # 절대시간 1분 단위로 저장 (분이 바뀔 때마다)
-            now = datetime.now()
-            current_minute = now.minute
+        # 이력 DB 저장 (평균값 + 출력 비트 일별 가동 시간)
+        save_to_history(history, timestamp, avg_data)
+        save_runtime(history, duty)
 
-            if current_minute != last_save_minute:
-                if data_buffer:
-                    # 평균값 계산
-                    avg_data = calculate_average(data_buffer)
+        # CSV 저장 (목적지별 큐에 넣고 바로 반환)
+        save_to_csv(replicated, timestamp, avg_data)
 
-                    # CSV 저장
-                    save_to_csv(avg_data)
+        # 다음 구간 시작
+        accumulator.reset()
+        duty.reset()
 
-                    # 버퍼 초기화
-                    data_buffer = []
-                    last_save_minute = current_minute
-                    print(f"  -> 버퍼 초기화 완료\n")
-                else:
-                    # 데이터가 없어도 분이 바뀌었으면 마지막 저장 분 업데이트
-                    last_save_minute = current_minute
+    def save(tick):
+        """1분 집계 저장 작업 (매 분 정각, 같은 시각의 수집 다음에 실행)"""
+        if not accumulator.samples:
+            return
 
-            # 10초 대기
-            time.sleep(COLLECT_INTERVAL)
+        save_window(tick.wall)
+        print(f"  -> 구간 초기화 완료\n")
+
+    # 절대시간 경계에 맞춰 실행 (수집 :00, :10, ... / 저장 매 분 정각)
+    # 수집 시간이 다음 주기에 누적되지 않으므로 1분 평균에 항상 같은 수의 샘플이 들어감
+    scheduler = TickScheduler()
+    scheduler.add_job("collect", COLLECT_INTERVAL, collect)
+    scheduler.add_job("save", SAVE_INTERVAL, save)
+
+    try:
+        scheduler.run()
 
     except KeyboardInterrupt:
         print("\n\n" + "="*70)
         print("사용자 중단 요청")
 
         # 종료 전 남은 데이터 저장
-        if data_buffer:
+        if accumulator.samples:
             print("남은 데이터 저장 중...")
-            avg_data = calculate_average(data_buffer)
-            save_to_csv(avg_data)
+            save_window(time.time())
             print("저장 완료")
 
+        stats = scheduler.get_stats()["collect"]
+        print(f"수집 {stats['runs']}회, 건너뛴 주기 {stats['missed']}회")
         print("="*70)
 
     except Exception as e:
@@ -395,6 +331,9 @@ def main():
         traceback.print_exc()
 
     finally:
+        # 큐에 남은 행 저장 후 쓰기 스레드 종료
+        replicated.close()
+        history.close()
         controller.close()
         print("연결 종료\n")
 
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Tick Scheduler
+================================================================================
+벽시계 경계에 맞춘 주기 작업 스케줄러 (드리프트 없음)
+
+작업 후 time.sleep(주기)를 하면 매 주기마다 작업 시간만큼 밀려서
+10초 수집이 10.8초, 11.5초 ... 로 늘어나고 1분 평균에 들어가는 샘플 수가 바뀜.
+이 스케줄러는 틱 시각을 절대시간 경계(10초 주기면 :00, :10, :20 ...)에 고정하고
+monotonic 시계로 다음 틱까지 기다리므로 작업 시간이 다음 틱에 누적되지 않음
+
+- 작업별 주기 (예: 수집 10초, 저장 60초), 같은 시각의 작업은 등록 순서대로 실행
+- 작업이 길어져 틱을 놓치면 밀린 틱을 한꺼번에 실행하지 않고 건너뛰고 횟수를 기록
+- 시스템 시계가 바뀌면 (NTP 보정, 수동 변경) 벽시계 경계에 다시 맞춤
+
+사용법:
+    scheduler = TickScheduler()
+    scheduler.add_job("collect", 10, collect)   # 매 10초 (:00, :10, ...)
+    scheduler.add_job("save", 60, save)         # 매 분 정각 (collect 다음에 실행)
+
+    scheduler.run()                             # 블로킹 (stop() 또는 Ctrl+C로 종료)
+
+    def collect(tick):
+        tick.wall     # 이 틱의 기준 시각 (epoch 초, 경계에 맞춘 값)
+        tick.missed   # 직전 틱 이후 건너뛴 틱 수
+================================================================================
+"""
+
+import logging
+import math
+import time
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# 벽시계와 틱 기준 시각이 이 값(초) 이상 어긋나면 경계를 다시 맞춤
+RESYNC_THRESHOLD = 2.0
+
+# 작업 함수에 전달되는 틱 정보
+# - wall: 틱 기준 시각 (epoch 초), index: 작업 시작 후 틱 번호, missed: 직전 틱 이후 건너뛴 틱 수
+Tick = namedtuple('Tick', ['wall', 'index', 'missed'])
+
+
+class Job:
+    """주기 작업 (TickScheduler 내부용)"""
+
+    def __init__(self, name, period, func, offset=0.0):
+        """
+        초기화
+
+        Args:
+            name: 작업 이름 (로그, 통계용)
+            period: 주기 (초)
+            func: 작업 함수 func(tick)
+            offset: 경계 기준 지연 (초, 예: 주기 60 + offset 5 → 매 분 5초)
+        """
+        if period <= 0:
+            raise ValueError(f"주기는 0보다 커야 합니다: {period}")
+        self.name = name
+        self.period = period
+        self.func = func
+        self.offset = offset
+
+        self.next_wall = None  # 다음 틱 기준 시각 (epoch 초)
+        self.next_mono = None  # 다음 틱 실행 시각 (time.monotonic)
+        self.index = 0
+        self.pending_missed = 0
+
+        # 통계
+        self.runs = 0
+        self.missed = 0
+        self.max_lateness = 0.0  # 최대 지연 (초, 예정 시각 → 실제 시작)
+        self.max_duration = 0.0  # 최대 실행 시간 (초)
+
+    def align(self, now_wall, now_mono):
+        """다음 벽시계 경계에 맞춰 틱 시각 설정"""
+        self.next_wall = math.floor((now_wall - self.offset) / self.period + 1) * self.period + self.offset
+        self.next_mono = now_mono + (self.next_wall - now_wall)
+
+
+class TickScheduler:
+    """벽시계 경계 정렬 + monotonic 대기 주기 작업 스케줄러"""
+
+    def __init__(self):
+        """초기화"""
+        self.jobs = []
+        self._running = False
+
+    def add_job(self, name, period, func, offset=0.0):
+        """
+        주기 작업 등록
+
+        Args:
+            name: 작업 이름
+            period: 주기 (초)
+            func: 작업 함수 func(tick)
+            offset: 경계 기준 지연 (초)
+
+        Returns:
+            Job
+        """
+        job = Job(name, period, func, offset)
+        self.jobs.append(job)
+        return job
+
+    def stop(self):
+        """실행 중지 (현재 작업이 끝나면 run()이 반환됨)"""
+        self._running = False
+
+    def _resync(self):
+        """모든 작업을 현재 벽시계의 다음 경계에 다시 맞춤"""
+        now_wall = time.time()
+        now_mono = time.monotonic()
+        for job in self.jobs:
+            job.align(now_wall, now_mono)
+
+    def run(self):
+        """
+        작업 실행 루프 (블로킹)
+
+        작업에서 발생한 예외는 그대로 전달됨 (호출 측에서 처리)
+        """
+        if not self.jobs:
+            return
+
+        self._running = True
+        self._resync()
+
+        while self._running:
+            # 가장 가까운 틱까지 대기 (monotonic 기준)
+            next_mono = min(job.next_mono for job in self.jobs)
+            delay = next_mono - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            # 시스템 시계가 바뀌었으면 경계 다시 맞춤
+            due = min(self.jobs, key=lambda job: job.next_mono)
+            if abs(time.time() - due.next_wall) > RESYNC_THRESHOLD + max(0.0, -delay):
+                logger.warning("⏰ 시스템 시계 변경 감지 - 틱 경계를 다시 맞춥니다")
+                self._resync()
+                continue
+
+            # 같은 시각의 작업은 등록 순서대로 실행
+            for job in self.jobs:
+                if not self._running:
+                    break
+                if job.next_mono <= time.monotonic():
+                    self._run_job(job)
+
+    def _run_job(self, job):
+        """작업 1회 실행 후 다음 틱 계산 (놓친 틱은 건너뜀)"""
+        started = time.monotonic()
+        job.max_lateness = max(job.max_lateness, started - job.next_mono)
+
+        tick = Tick(job.next_wall, job.index, job.pending_missed)
+        job.pending_missed = 0
+        job.runs += 1
+        try:
+            job.func(tick)
+        finally:
+            finished = time.monotonic()
+            job.max_duration = max(job.max_duration, finished - started)
+
+            job.index += 1
+            job.next_wall += job.period
+            job.next_mono += job.period
+
+            # 작업이 다음 틱을 넘겼으면 밀린 틱은 건너뛰고 다음 경계로
+            if finished > job.next_mono:
+                skipped = int((finished - job.next_mono) // job.period) + 1
+                job.next_wall += skipped * job.period
+                job.next_mono += skipped * job.period
+                job.index += skipped
+                job.missed += skipped
+                job.pending_missed = skipped
+                logger.warning(f"⏱ [{job.name}] 틱 {skipped}회 건너뜀 (실행 시간 {finished - started:.1f}초 > 주기 {job.period}초)")
+
+    def get_stats(self):
+        """
+        작업별 통계
+
+        Returns:
+            딕셔너리 {작업 이름: {period, runs, missed, max_lateness_ms, max_duration_ms}}
+        """
+        return {
+            job.name: {
+                "period": job.period,
+                "runs": job.runs,
+                "missed": job.missed,
+                "max_lateness_ms": round(job.max_lateness * 1000, 1),
+                "max_duration_ms": round(job.max_duration * 1000, 1)
+            }
+            for job in self.jobs
+        }
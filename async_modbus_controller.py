@@ -0,0 +1,1128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Async Modbus TCP Controller
+================================================================================
+asyncio 기반 RS485 Modbus TCP/IP 통신 컨트롤러
+
+ModbusController와 같은 API를 pymodbus 비동기 TCP 클라이언트로 구현.
+FastAPI(uvicorn) 이벤트 루프에서 await로 호출하므로 게이트웨이 응답이 늦어도
+다른 요청(헬스 체크, 날씨 조회 등)이 멈추지 않음
+
+사용법:
+    controller = AsyncModbusController(host="aiseednaju.iptime.org", port=9139)
+    await controller.connect()
+
+    # 게이트웨이 장애 시: 회로 차단기가 열려 요청은 즉시 실패하고,
+    # 백그라운드 작업이 지수 백오프(+지터)로 재연결을 시도함
+    controller.breaker.get_stats()   # {state, failures, retry_in, transitions, ...}
+
+    # 센서 읽기
+    temp = await controller.read_by_name("indoor_current_temperature")
+
+    # 비트 제어
+    await controller.write_bit(20, 15, 1)
+
+    # 레지스터 맵 전체 읽기 (FC03 1회)
+    image = await controller.read_register_image()
+
+    controller.close()
+================================================================================
+"""
+
+from pymodbus.client import AsyncModbusTcpClient
+from contextlib import AsyncExitStack
+import asyncio
+import logging
+import time
+
+# 우선순위 트랜잭션 스케줄러
+from transaction_scheduler import PRIORITY_CONTROL, TransactionScheduler
+
+# 제어 명세서 데이터베이스 import
+from control_specs import CONTROL_SPECS, WRITABLE_TYPES, get_spec, resolve_name
+
+# 동기 컨트롤러와 공유하는 디코딩/인코딩 함수
+from modbus_tcp_controller import (
+    REGISTER_MAP_START,
+    REGISTER_MAP_END,
+    ILLEGAL_FUNCTION,
+    CircuitBreaker,
+    MAX_READ_COUNT,
+    PLAN_MAX_GAP,
+    PLAN_MAX_COUNT,
+    RegisterImage,
+    WriteBatch,
+    apply_masks,
+    bit_range_masks,
+    build_read_plan,
+    decode_spec_value,
+    encode_register_value,
+    is_link_error,
+    is_signed_spec,
+    modbus_int16_to_temp,
+    resolve_names,
+)
+
+logger = logging.getLogger(__name__)
+
+# 섀도 레지스터 대상 (쓰기 가능한 항목이 있는 워드 주소)
+SHADOW_ADDRESSES = frozenset(
+    spec['address'] for spec in CONTROL_SPECS.values() if spec['type'] in WRITABLE_TYPES
+)
+
+# 비트 쓰기에서 다시 읽지 않고 섀도 값을 쓰는 최대 경과 시간 (초)
+SHADOW_MAX_AGE = 2.0
+
+# 같은 값 쓰기 생략 기준: 섀도 값이 이 시간(초) 이내면 현재 값으로 간주
+# (폴링 주기보다 약간 길게 - 폴러가 계속 갱신, None이면 항상 씀)
+UNCHANGED_MAX_AGE = 6.0
+
+
+class AsyncModbusController:
+    """Modbus TCP 비동기 통신 컨트롤러"""
+
+    def __init__(self, host="aiseednaju.iptime.org", port=9139, unit_id=1, timeout=5, retries=3, mask_write=False,
+                 unchanged_max_age=UNCHANGED_MAX_AGE):
+        """
+        초기화
+
+        Args:
+            host: Modbus TCP 서버 IP 또는 도메인
+            port: 포트 번호
+            unit_id: Modbus Unit ID (Slave ID)
+            timeout: 타임아웃 (초)
+            retries: 재시도 횟수
+            mask_write: True면 비트/비트 범위 쓰기에 FC22(Mask Write Register) 사용
+            unchanged_max_age: 같은 값 쓰기 생략 기준 섀도 경과 시간 (초, None이면 항상 씀)
+        """
+        self.host = host
+        self.port = port
+        self.unit_id = unit_id
+        self.timeout = timeout
+        self.retries = retries
+        self.client = None
+
+        # FC22 마스크 쓰기 사용 여부 (게이트웨이가 미지원 응답을 주면 자동으로 꺼짐)
+        self.mask_write = mask_write
+
+        # RS485 게이트웨이는 동시에 한 트랜잭션만 처리하므로 소켓 사용을 직렬화
+        # (대기 중인 요청은 우선순위 순서로 처리: 수동 제어 > 설정 쓰기 > 조회 > 폴링)
+        self.scheduler = TransactionScheduler()
+
+        # 진행 중인 읽기 요청 {(unit_id, address, count): Future}
+        # 같은 레지스터를 동시에 읽으면 하나의 트랜잭션 결과를 공유 (single-flight)
+        self._inflight_reads = {}
+        self.read_requests = 0    # read_holding_register 호출 수
+        self.coalesced_reads = 0  # 진행 중인 트랜잭션을 공유한 호출 수
+
+        # 쓰기 가능 워드의 섀도 값 {address: (value, timestamp)}
+        # 모든 읽기(폴러 포함)와 쓰기 결과로 갱신되며, 비트 쓰기의 현재 값으로 사용
+        self.shadow = {}
+
+        # 워드별 잠금 {address: asyncio.Lock}, 워드별 대기 중인 비트 변경 {address: [(and_mask, or_mask, Future)]}
+        # 같은 워드의 비트 쓰기는 잠금 안에서 1회 읽기-수정-쓰기로 합치고, 다른 워드는 서로 기다리지 않음
+        self._word_locks = {}
+        self._pending_edits = {}
+        self.bit_writes = 0     # 읽기-수정-쓰기 비트 변경 요청 수
+        self.merged_edits = 0   # 다른 요청의 쓰기에 합쳐진 비트 변경 수
+
+        # 같은 값 쓰기 생략 (최근 섀도 값과 같으면 쓰기/확인 읽기 없이 성공 처리)
+        self.unchanged_max_age = unchanged_max_age
+        self.skipped_writes = 0  # 생략한 쓰기 수
+
+        # 회로 차단기 (열리면 즉시 실패, 재연결은 백그라운드 작업이 담당)
+        self.breaker = CircuitBreaker()
+        self._reconnect_task = None
+
+    async def connect(self, max_retries=3, retry_delay=2):
+        """
+        서버 연결 (재시도 로직 포함)
+
+        Args:
+            max_retries: 최대 재시도 횟수
+            retry_delay: 재시도 간 대기 시간 (초)
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        # 기존 연결이 있으면 먼저 종료
+        if self.client:
+            try:
+                self.client.close()
+            except Exception:
+                pass
+            self.client = None
+
+        for attempt in range(1, max_retries + 1):
+            try:
+                logger.info(f"연결 시도 {attempt}/{max_retries}: {self.host}:{self.port}")
+
+                self.client = AsyncModbusTcpClient(
+                    host=self.host,
+                    port=self.port,
+                    timeout=self.timeout,
+                    retries=1  # pymodbus 내부 재시도는 1회로 제한
+                )
+
+                await asyncio.wait_for(self.client.connect(), timeout=self.timeout)
+
+                if self.client.connected:
+                    logger.info(f"✅ 연결 성공: {self.host}:{self.port}")
+                    return True
+                else:
+                    logger.warning(f"⚠️  연결 실패 (시도 {attempt}/{max_retries})")
+
+            except Exception as e:
+                logger.warning(f"⚠️  연결 오류 (시도 {attempt}/{max_retries}): {e}")
+
+            if attempt < max_retries:
+                logger.info(f"   {retry_delay}초 후 재시도...")
+                await asyncio.sleep(retry_delay)
+
+        logger.error(f"❌ 연결 실패: {self.host}:{self.port} (최대 재시도 횟수 초과)")
+        return False
+
+    def close(self):
+        """연결 종료"""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self.client:
+            self.client.close()
+            logger.info("연결 종료")
+
+    def is_connected(self):
+        """연결 상태 확인"""
+        return self.client is not None and self.client.connected
+
+    # ========================================================================
+    # 회로 차단기 / 백그라운드 재연결
+    # ========================================================================
+
+    def start_reconnect(self):
+        """
+        백그라운드 재연결 시작 (이미 진행 중이면 무시)
+
+        Returns:
+            재연결 작업 (asyncio.Task)
+        """
+        if self._reconnect_task is None or self._reconnect_task.done():
+            if self.breaker.state == CircuitBreaker.CLOSED:
+                self.breaker.trip()
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect_loop())
+        return self._reconnect_task
+
+    async def _reconnect_loop(self):
+        """재시도 시각마다 재연결 + 프로브 읽기 (성공하면 회로 닫힘)"""
+        while True:
+            await asyncio.sleep(self.breaker.retry_delay())
+            if not self.breaker.allow():
+                continue
+
+            if await self.connect(max_retries=1) and await self._probe():
+                self.breaker.record_success()
+                logger.info(f"✅ 게이트웨이 복구: {self.host}:{self.port}")
+                return
+
+            self.breaker.record_failure()
+            logger.warning(f"⚠️  재연결 실패 - {self.breaker.retry_delay():.1f}초 후 재시도")
+
+    async def _probe(self):
+        """프로브 읽기 (워드 1개, 게이트웨이가 응답하면 True)"""
+        try:
+            # 복구 확인은 속도 제한 없이 가장 먼저 처리
+            async with self.scheduler.slot(PRIORITY_CONTROL):
+                resp = await asyncio.wait_for(
+                    self.client.read_holding_registers(
+                        address=REGISTER_MAP_START,
+                        count=1,
+                        slave=self.unit_id
+                    ),
+                    timeout=self.timeout
+                )
+            return not is_link_error(resp)
+        except Exception as e:
+            logger.warning(f"⚠️  프로브 읽기 실패: {e}")
+            return False
+
+    def _circuit_allows(self):
+        """
+        트랜잭션 전 회로 차단기 확인 (스케줄러 슬롯 안에서 호출)
+
+        닫힘 + 연결됨이 아니면 타임아웃을 기다리지 않고 즉시 실패하고
+        백그라운드 재연결을 시작함
+
+        Returns:
+            True: 트랜잭션 진행 / False: 즉시 실패
+        """
+        if self.breaker.state == CircuitBreaker.CLOSED and self.is_connected():
+            return True
+
+        self.start_reconnect()
+        logger.warning(f"회로 {self.breaker.state} - 즉시 실패 (재시도까지 {self.breaker.retry_delay():.1f}초)")
+        return False
+
+    def _record_result(self, resp):
+        """트랜잭션 결과를 회로 차단기에 반영 (통신 실패가 쌓이면 재연결 시작)"""
+        if is_link_error(resp):
+            self._record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _record_failure(self):
+        """트랜잭션 실패 기록 (회로가 열리면 백그라운드 재연결 시작)"""
+        self.breaker.record_failure()
+        if self.breaker.state != CircuitBreaker.CLOSED:
+            self.start_reconnect()
+
+    # ========================================================================
+    # 센서 읽기 (SENSOR_READ / BIT_READ)
+    # ========================================================================
+
+    def get_read_stats(self):
+        """
+        읽기 요청 통계 (single-flight 절감 효과 확인용)
+
+        Returns:
+            딕셔너리 {read_requests, bus_reads, coalesced_reads}
+        """
+        return {
+            "read_requests": self.read_requests,
+            "bus_reads": self.read_requests - self.coalesced_reads,
+            "coalesced_reads": self.coalesced_reads,
+        }
+
+    def _update_shadow(self, address, values):
+        """읽기/쓰기 결과로 쓰기 가능 워드의 섀도 값 갱신"""
+        now = time.time()
+        for offset, value in enumerate(values):
+            if address + offset in SHADOW_ADDRESSES:
+                self.shadow[address + offset] = (value, now)
+
+    def get_shadow(self, address, max_age=None):
+        """
+        섀도 값 조회 (통신 없음)
+
+        Args:
+            address: 워드 주소
+            max_age: 허용 최대 경과 시간 (초, None이면 경과 시간 무관)
+
+        Returns:
+            워드 값, 없거나 오래됐으면 None
+        """
+        entry = self.shadow.get(address)
+        if entry is None:
+            return None
+        value, timestamp = entry
+        if max_age is not None and time.time() - timestamp > max_age:
+            return None
+        return value
+
+    def get_write_stats(self):
+        """
+        쓰기 통계 (워드별 비트 변경 병합 효과 확인용)
+
+        Returns:
+            딕셔너리 {bit_writes, merged_edits, skipped_writes, shadow_words}
+        """
+        return {
+            "bit_writes": self.bit_writes,
+            "merged_edits": self.merged_edits,
+            "skipped_writes": self.skipped_writes,
+            "shadow_words": len(self.shadow),
+        }
+
+    def check_unchanged(self, name, value):
+        """
+        요청 값이 이미 게이트웨이에 있는지 확인 (섀도 값 기준, 통신 없음)
+
+        인코딩한 요청 값을 unchanged_max_age 이내의 섀도 워드와 비교함
+        (REGISTER_WRITE는 레지스터 값 전체, 비트/비트 범위는 해당 비트만).
+        쓰기 경로에서는 워드 잠금 안에서만 호출 (잠금 밖에서 비교하면 진행 중인 앞선 쓰기가
+        끝난 뒤 그 값이 남아 마지막 요청이 무시될 수 있음, 비트 쓰기는 edit_word()가 비교)
+
+        Args:
+            name: 제어 이름 (영문 키 또는 한글 이름)
+            value: 쓸 값
+
+        Returns:
+            같으면: 현재 값 (디코딩)
+            다르거나 알 수 없으면: None (섀도 없음 / 오래됨 / 잘못된 값)
+        """
+        spec = get_spec(name)
+        if not spec or not self.unchanged_max_age:
+            return None
+        name = resolve_name(name)
+
+        words = [self.get_shadow(spec['address'] + i, self.unchanged_max_age) for i in range(spec.get('count', 1))]
+        if None in words:
+            return None
+
+        current = decode_spec_value(name, spec, words)
+        try:
+            if spec['type'] == 'REGISTER_WRITE':
+                if len(words) != 1 or encode_register_value(name, spec, value) != words[0]:
+                    return None
+            elif spec['type'] in ('BIT_WRITE', 'BIT_RANGE_WRITE'):
+                if value != int(value) or current != int(value):
+                    return None
+            else:
+                return None
+        except (TypeError, ValueError):
+            return None
+
+        return current
+
+    async def read_holding_register(self, address, count=1):
+        """
+        Holding Register 읽기 (Raw 값)
+
+        같은 (unit_id, address, count) 읽기가 이미 진행 중이면 새 트랜잭션을 보내지 않고
+        진행 중인 트랜잭션의 결과를 함께 받음
+
+        Args:
+            address: 레지스터 주소
+            count: 읽을 레지스터 개수
+
+        Returns:
+            성공: [register_values]
+            실패: None
+        """
+        key = (self.unit_id, address, count)
+        self.read_requests += 1
+
+        pending = self._inflight_reads.get(key)
+        if pending is not None:
+            self.coalesced_reads += 1
+            registers = await asyncio.shield(pending)
+            return list(registers) if registers is not None else None
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_reads[key] = future
+        registers = None
+        try:
+            registers = await self._read_holding_register(address, count)
+        finally:
+            del self._inflight_reads[key]
+            future.set_result(list(registers) if registers is not None else None)
+        return registers
+
+    async def _read_holding_register(self, address, count):
+        """Holding Register 읽기 트랜잭션 (read_holding_register 내부용)"""
+        try:
+            async with self.scheduler.slot():
+                if not self._circuit_allows():
+                    return None
+                resp = await asyncio.wait_for(
+                    self.client.read_holding_registers(
+                        address=address,
+                        count=count,
+                        slave=self.unit_id
+                    ),
+                    timeout=self.timeout
+                )
+                # 섀도 갱신은 슬롯 안에서 (다음 쓰기보다 먼저 반영)
+                if not resp.isError() and getattr(resp, 'registers', None):
+                    self._update_shadow(address, resp.registers)
+            self._record_result(resp)
+
+            if resp.isError():
+                logger.error(f"읽기 실패: 주소 {address}")
+                return None
+
+            if hasattr(resp, 'registers') and resp.registers:
+                return resp.registers
+            else:
+                logger.error(f"데이터 없음: 주소 {address}")
+                return None
+
+        except asyncio.TimeoutError:
+            logger.error(f"읽기 타임아웃: 주소 {address}")
+            self._record_failure()
+            return None
+        except Exception as e:
+            logger.error(f"읽기 오류: {e}")
+            self._record_failure()
+            return None
+
+    async def read_register_image(self, start=REGISTER_MAP_START, end=REGISTER_MAP_END, max_count=MAX_READ_COUNT):
+        """
+        레지스터 맵 전체를 블록 읽기 (FC03 최소 횟수)
+
+        Args:
+            start: 시작 워드 주소
+            end: 종료 워드 주소 (포함)
+            max_count: FC03 1회당 최대 레지스터 개수
+
+        Returns:
+            성공: RegisterImage
+            실패: None
+        """
+        words = []
+        address = start
+
+        while address <= end:
+            count = min(max_count, end - address + 1)
+            registers = await self.read_holding_register(address, count)
+            if registers is None or len(registers) < count:
+                logger.error(f"레지스터 이미지 읽기 실패: 주소 {address}~{address + count - 1}")
+                return None
+            words.extend(registers[:count])
+            address += count
+
+        image = RegisterImage(start, words)
+        logger.info(f"레지스터 이미지 읽기: 주소 {start}~{end} ({len(words)}워드)")
+        return image
+
+    async def read_sensor(self, address, scale=1, signed=False):
+        """
+        센서값 읽기 (스케일 적용)
+
+        Args:
+            address: 레지스터 주소
+            scale: 스케일 값 (예: 10이면 value/10)
+            signed: True면 signed 16비트로 변환 (영하 온도 등)
+
+        Returns:
+            성공: 실제 센서값 (float)
+            실패: None
+        """
+        registers = await self.read_holding_register(address, count=1)
+        if registers is None:
+            return None
+
+        raw_value = registers[0]
+        if signed:
+            actual_value = modbus_int16_to_temp(raw_value, scale)
+        else:
+            actual_value = raw_value / scale
+
+        logger.info(f"센서 읽기: 주소 {address}, Raw={raw_value}, 실제값={actual_value} (signed={signed})")
+        return actual_value
+
+    async def read_bit(self, address, bit_num):
+        """
+        특정 비트 읽기
+
+        Args:
+            address: 워드 주소
+            bit_num: 비트 번호 (0~15)
+
+        Returns:
+            성공: 0 또는 1
+            실패: None
+        """
+        registers = await self.read_holding_register(address, count=1)
+        if registers is None:
+            return None
+
+        bit_value = (registers[0] >> bit_num) & 1
+        logger.info(f"비트 읽기: 주소 {address}, 비트 {bit_num}, 값={bit_value}")
+        return bit_value
+
+    async def read_bit_range(self, address, bit_start, bit_end):
+        """
+        비트 범위 읽기 (여러 비트를 하나의 값으로)
+
+        Args:
+            address: 워드 주소
+            bit_start: 시작 비트 번호
+            bit_end: 종료 비트 번호
+
+        Returns:
+            성공: 비트 범위의 값
+            실패: None
+        """
+        registers = await self.read_holding_register(address, count=1)
+        if registers is None:
+            return None
+
+        mask = (1 << (bit_end - bit_start + 1)) - 1
+        bit_range_value = (registers[0] >> bit_start) & mask
+        logger.info(f"비트 범위 읽기: 주소 {address}, 비트 {bit_start}~{bit_end}, 값={bit_range_value}")
+        return bit_range_value
+
+    # ========================================================================
+    # 레지스터 쓰기 (BIT_WRITE / REGISTER_WRITE)
+    # ========================================================================
+
+    async def write_register(self, address, value):
+        """
+        레지스터 쓰기 (워드 전체)
+
+        Args:
+            address: 레지스터 주소
+            value: 쓸 값 (0~65535)
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        try:
+            async with self.scheduler.slot():
+                if not self._circuit_allows():
+                    return False
+                resp = await asyncio.wait_for(
+                    self.client.write_register(
+                        address=address,
+                        value=value,
+                        slave=self.unit_id
+                    ),
+                    timeout=self.timeout
+                )
+                if not resp.isError():
+                    self._update_shadow(address, [value])
+            self._record_result(resp)
+
+            if resp.isError():
+                logger.error(f"쓰기 실패: 주소 {address}, 값={value}")
+                return False
+
+            logger.info(f"쓰기 성공: 주소 {address}, 값={value}")
+            return True
+
+        except asyncio.TimeoutError:
+            logger.error(f"쓰기 타임아웃: 주소 {address}, 값={value}")
+            self._record_failure()
+            return False
+        except Exception as e:
+            logger.error(f"쓰기 오류: {e}")
+            self._record_failure()
+            return False
+
+    async def write_registers(self, address, values):
+        """
+        연속 레지스터 쓰기 (FC16, 1개면 FC06)
+
+        Args:
+            address: 시작 레지스터 주소
+            values: 쓸 값 리스트 (각 0~65535)
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        if len(values) == 1:
+            return await self.write_register(address, values[0])
+
+        try:
+            async with self.scheduler.slot():
+                if not self._circuit_allows():
+                    return False
+                resp = await asyncio.wait_for(
+                    self.client.write_registers(
+                        address=address,
+                        values=values,
+                        slave=self.unit_id
+                    ),
+                    timeout=self.timeout
+                )
+                if not resp.isError():
+                    self._update_shadow(address, values)
+            self._record_result(resp)
+
+            if resp.isError():
+                logger.error(f"연속 쓰기 실패: 주소 {address}~{address + len(values) - 1}")
+                return False
+
+            logger.info(f"연속 쓰기 성공: 주소 {address}~{address + len(values) - 1}, 값={values}")
+            return True
+
+        except asyncio.TimeoutError:
+            logger.error(f"연속 쓰기 타임아웃: 주소 {address}~{address + len(values) - 1}")
+            self._record_failure()
+            return False
+        except Exception as e:
+            logger.error(f"연속 쓰기 오류: {e}")
+            self._record_failure()
+            return False
+
+    async def mask_write_register(self, address, and_mask, or_mask):
+        """
+        마스크 레지스터 쓰기 (FC22, 1회 트랜잭션)
+
+        게이트웨이가 지원하지 않는 함수(illegal function)로 응답하면
+        mask_write를 끄고 이후에는 읽기-수정-쓰기를 사용함
+
+        Args:
+            address: 레지스터 주소
+            and_mask: AND 마스크
+            or_mask: OR 마스크
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        try:
+            async with self.scheduler.slot():
+                if not self._circuit_allows():
+                    return False
+                resp = await asyncio.wait_for(
+                    self.client.mask_write_register(
+                        address=address,
+                        and_mask=and_mask,
+                        or_mask=or_mask,
+                        slave=self.unit_id
+                    ),
+                    timeout=self.timeout
+                )
+                # 바꾼 비트만 반영 (나머지 비트는 기존 섀도 시각 그대로)
+                if not resp.isError() and address in self.shadow:
+                    value, timestamp = self.shadow[address]
+                    self.shadow[address] = (apply_masks(value, and_mask, or_mask), timestamp)
+            self._record_result(resp)
+
+            if resp.isError():
+                if getattr(resp, 'exception_code', None) == ILLEGAL_FUNCTION:
+                    logger.warning("⚠️  게이트웨이가 FC22(Mask Write)를 지원하지 않음 - 읽기-수정-쓰기로 전환")
+                    self.mask_write = False
+                else:
+                    logger.error(f"마스크 쓰기 실패: 주소 {address}")
+                return False
+
+            logger.info(f"마스크 쓰기 성공: 주소 {address}, AND=0x{and_mask:04X}, OR=0x{or_mask:04X}")
+            return True
+
+        except asyncio.TimeoutError:
+            logger.error(f"마스크 쓰기 타임아웃: 주소 {address}")
+            self._record_failure()
+            return False
+        except Exception as e:
+            logger.error(f"마스크 쓰기 오류: {e}")
+            self._record_failure()
+            return False
+
+    async def write_bit(self, address, bit_num, bit_value):
+        """
+        특정 비트 쓰기 (ON/OFF 제어)
+
+        mask_write가 켜져 있으면 FC22 1회로 쓰고, 아니면 읽기-수정-쓰기
+
+        Args:
+            address: 워드 주소
+            bit_num: 비트 번호 (0~15)
+            bit_value: 비트 값 (0 또는 1)
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        and_mask, or_mask = bit_range_masks(bit_num, bit_num, 1 if bit_value else 0)
+        logger.info(f"비트 쓰기: 주소 {address}, 비트 {bit_num}, {bit_value}")
+        return await self.edit_word(address, and_mask, or_mask)
+
+    async def write_bit_range(self, address, bit_start, bit_end, value):
+        """
+        비트 범위 쓰기 (여러 비트를 하나의 값으로)
+
+        Args:
+            address: 워드 주소
+            bit_start: 시작 비트 번호
+            bit_end: 종료 비트 번호
+            value: 쓸 값
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        # 범위 초과 시 실패
+        masks = bit_range_masks(bit_start, bit_end, value)
+        if masks is None:
+            return False
+
+        logger.info(f"비트 범위 쓰기: 주소 {address}, 비트 {bit_start}~{bit_end}, {value}")
+        return await self.edit_word(address, *masks)
+
+    def _word_lock(self, address):
+        """워드별 잠금 (처음 사용할 때 생성)"""
+        lock = self._word_locks.get(address)
+        if lock is None:
+            lock = self._word_locks[address] = asyncio.Lock()
+        return lock
+
+    def _masks_unchanged(self, address, masks):
+        """
+        마스크 변경을 모두 적용해도 워드 값이 그대로인지 (unchanged_max_age 이내 섀도 기준)
+
+        워드 잠금을 잡은 상태에서 호출 (앞선 쓰기 결과가 섀도에 반영된 뒤 비교)
+
+        Args:
+            address: 워드 주소
+            masks: [(and_mask, or_mask), ...] 요청 순서대로 적용
+
+        Returns:
+            True: 같음 (쓰기 생략) / False: 다르거나 알 수 없음
+        """
+        if not self.unchanged_max_age:
+            return False
+        current_value = self.get_shadow(address, self.unchanged_max_age)
+        if current_value is None:
+            return False
+        new_value = current_value
+        for and_mask, or_mask in masks:
+            new_value = apply_masks(new_value, and_mask, or_mask)
+        return new_value == current_value
+
+    async def edit_word(self, address, and_mask, or_mask):
+        """
+        워드 일부 비트 변경 (마스크 적용)
+
+        워드별 잠금 안에서 mask_write가 켜져 있으면 FC22 1회로 쓰고, 아니면 읽기-수정-쓰기.
+        (FC22도 잠금 안에서 보내므로 배치 쓰기의 읽기-수정-쓰기가 이 변경을 덮어쓰지 않음)
+        잠금을 기다리는 동안 같은 워드에 들어온 읽기-수정-쓰기 변경은 모두 합쳐서 1회만 씀.
+        현재 값은 SHADOW_MAX_AGE 이내의 섀도 값이 있으면 다시 읽지 않음.
+        합친 변경을 적용해도 최근 섀도 값과 같으면 쓰지 않음 (잠금 안에서 비교)
+
+        Args:
+            address: 워드 주소
+            and_mask: AND 마스크 (유지할 비트)
+            or_mask: OR 마스크 (새 비트 값)
+
+        Returns:
+            성공: True (같은 값이라 쓰기를 생략한 경우 포함)
+            실패: False
+        """
+        success, unchanged = await self._edit_word(address, and_mask, or_mask)
+        return success
+
+    async def _edit_word(self, address, and_mask, or_mask):
+        """
+        edit_word() 본체
+
+        Returns:
+            (성공 여부, 같은 값이라 쓰기를 생략했는지)
+        """
+        # FC22 마스크 쓰기 (미지원 감지 시 아래 읽기-수정-쓰기로 대체)
+        if self.mask_write:
+            async with self._word_lock(address):
+                if self._masks_unchanged(address, [(and_mask, or_mask)]):
+                    self.skipped_writes += 1
+                    return True, True
+                result = await self.mask_write_register(address, and_mask, or_mask)
+            if result or self.mask_write:
+                return result, False
+
+        self.bit_writes += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending_edits.setdefault(address, []).append((and_mask, or_mask, future))
+
+        async with self._word_lock(address):
+            # 앞선 요청이 이 변경까지 합쳐서 썼으면 그 결과 사용
+            if future.done():
+                return future.result()
+
+            edits = self._pending_edits.pop(address, [])
+            self.merged_edits += len(edits) - 1
+            try:
+                await self._read_modify_write(address, edits)
+            finally:
+                # 중간에 취소/오류가 나도 합쳐진 요청이 멈추지 않도록 결과 전달
+                for _, _, pending in edits:
+                    if not pending.done():
+                        pending.set_result((False, False))
+            return future.result()
+
+    async def _read_modify_write(self, address, edits):
+        """
+        읽기-수정-쓰기 1회 (edit_word 내부용, 워드 잠금을 잡은 상태에서 호출)
+
+        Args:
+            address: 워드 주소
+            edits: [(and_mask, or_mask, Future), ...] 요청 순서대로 적용
+                   (Future 결과: (성공 여부, 같은 값이라 쓰기를 생략했는지))
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        # 0단계: 대기 중인 변경을 모두 합친 결과가 최근 섀도 값과 같으면 쓰기 생략
+        # (잠금 안에서 비교하므로 앞서 진행 중이던 쓰기 결과가 반영된 값과 비교함)
+        if self._masks_unchanged(address, [(and_mask, or_mask) for and_mask, or_mask, _ in edits]):
+            self.skipped_writes += len(edits)
+            for _, _, future in edits:
+                future.set_result((True, True))
+            return True
+
+        # 1단계: 현재 워드 값 (최근 섀도 값이 없으면 읽기)
+        current_value = self.get_shadow(address, SHADOW_MAX_AGE)
+        if current_value is None:
+            registers = await self.read_holding_register(address, count=1)
+            if registers is None:
+                for _, _, future in edits:
+                    future.set_result((False, False))
+                return False
+            current_value = registers[0]
+
+        # 2단계: 모든 변경 적용
+        new_value = current_value
+        for and_mask, or_mask, _ in edits:
+            new_value = apply_masks(new_value, and_mask, or_mask)
+
+        # 3단계: 워드 쓰기
+        logger.info(f"읽기-수정-쓰기: 주소 {address}, 변경 {len(edits)}건 (현재={current_value}, 새값={new_value})")
+        result = await self.write_register(address, new_value)
+        for _, _, future in edits:
+            future.set_result((result, False))
+        return result
+
+    async def write_sensor_value(self, address, value, scale=1, signed=False):
+        """
+        센서 설정값 쓰기 (스케일 적용)
+
+        Args:
+            address: 레지스터 주소
+            value: 실제 값 (예: 25.0도, -5.0도)
+            scale: 스케일 값 (예: 10이면 value*10)
+            signed: True면 signed 16비트로 변환 (영하 온도 등)
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        register_value = int(value * scale)
+        if signed and register_value < 0:
+            register_value = register_value + 0x10000  # 음수를 unsigned로 변환
+        register_value = register_value & 0xFFFF
+
+        logger.info(f"센서 설정값 쓰기: 주소 {address}, 실제값={value}, 레지스터값={register_value} (signed={signed})")
+        return await self.write_register(address, register_value)
+
+    # ========================================================================
+    # 제어명세서 기반 범용 함수들
+    # ========================================================================
+
+    async def read_by_name(self, name):
+        """
+        제어명세서 이름으로 데이터 읽기
+
+        Args:
+            name: CONTROL_SPECS에 정의된 제어 이름 (영문 키 또는 한글 이름)
+
+        Returns:
+            성공: 읽은 값
+            실패: None
+        """
+        spec = get_spec(name)
+        if not spec:
+            logger.error(f"알 수 없는 제어 이름: {name}")
+            return None
+        name = resolve_name(name)  # 한글 이름 → 영문 키
+
+        try:
+            registers = await self.read_holding_register(spec['address'], spec.get('count', 1))
+            if registers is None:
+                return None
+
+            value = decode_spec_value(name, spec, registers)
+            if value is None:
+                logger.error(f"지원하지 않는 타입: {spec['type']}")
+                return None
+
+            logger.info(f"[{name}] 읽기 성공: {value} {spec.get('unit', '')}")
+            return value
+
+        except Exception as e:
+            logger.error(f"[{name}] 읽기 오류: {e}")
+            return None
+
+    async def write_by_name(self, name, value):
+        """
+        제어명세서 이름으로 데이터 쓰기
+
+        Args:
+            name: CONTROL_SPECS에 정의된 제어 이름 (영문 키 또는 한글 이름)
+            value: 쓸 값
+
+        Returns:
+            성공: True
+            실패: False
+        """
+        spec = get_spec(name)
+        if not spec:
+            logger.error(f"알 수 없는 제어 이름: {name}")
+            return False
+        name = resolve_name(name)  # 한글 이름 → 영문 키
+
+        spec_type = spec['type']
+        address = spec['address']
+
+        try:
+            if spec_type == 'REGISTER_WRITE':
+                # 레지스터 전체 쓰기 (온도 관련 항목은 signed 변환 적용)
+                register_value = encode_register_value(name, spec, value)
+
+                # 같은 값 비교와 쓰기는 워드 잠금 안에서 (진행 중인 앞선 쓰기가 끝난 값과 비교)
+                async with self._word_lock(address):
+                    if self.check_unchanged(name, value) is not None:
+                        self.skipped_writes += 1
+                        logger.info(f"[{name}] 같은 값 - 쓰기 생략: {value}")
+                        return True
+                    result = await self.write_register(address, register_value)
+                logger.info(f"[{name}] 쓰기: {value} → {register_value} (signed={is_signed_spec(name, spec)})")
+                return result
+
+            elif spec_type == 'BIT_WRITE':
+                # 비트 쓰기 (같은 값이면 edit_word()가 잠금 안에서 쓰기 생략)
+                result = await self.write_bit(address, spec['bit'], value)
+                logger.info(f"[{name}] 비트 쓰기: {value}")
+                return result
+
+            elif spec_type == 'BIT_RANGE_WRITE':
+                # 비트 범위 쓰기
+                result = await self.write_bit_range(address, spec['bit_start'], spec['bit_end'], int(value))
+                logger.info(f"[{name}] 비트 범위 쓰기: {value}")
+                return result
+
+            else:
+                logger.error(f"[{name}] 쓰기를 지원하지 않는 타입: {spec_type}")
+                return False
+
+        except Exception as e:
+            logger.error(f"[{name}] 쓰기 오류: {e}")
+            return False
+
+    async def read_multiple(self, names, max_gap=PLAN_MAX_GAP, max_count=PLAN_MAX_COUNT, words=()):
+        """
+        여러 항목을 한번에 읽기 (주소 병합 읽기 계획 사용)
+
+        Args:
+            names: 제어 이름 리스트
+            max_gap: 한 구간으로 합칠 수 있는 최대 빈 워드 개수
+            max_count: FC03 1회당 최대 워드 개수
+            words: 명세 항목 없이 원시 값을 함께 읽을 워드 주소 리스트 (같은 읽기 계획에 합침)
+
+        Returns:
+            딕셔너리 {name: value} (요청한 이름 그대로, words 주소는 {address: 원시 워드 값}으로 함께 반환)
+        """
+        results = {name: None for name in names}
+        results.update({address: None for address in words})
+
+        keys = resolve_names(names)
+
+        for start, count, range_names in build_read_plan(keys, max_gap, max_count, words):
+            registers = await self.read_holding_register(start, count)
+            if registers is None or len(registers) < count:
+                continue
+
+            for key in range_names:
+                spec = CONTROL_SPECS[key]
+                offset = spec['address'] - start
+                value = decode_spec_value(key, spec, registers[offset:offset + spec.get('count', 1)])
+                for name in keys[key]:
+                    results[name] = value
+            for address in words:
+                if start <= address < start + count:
+                    results[address] = registers[address - start]
+
+        return results
+
+    async def write_multiple(self, items, verify=True):
+        """
+        여러 항목을 한번에 쓰기 (최소 트랜잭션)
+
+        같은 워드의 비트 변경은 마스크 1쌍으로 합쳐 edit_word()로 씀 (워드 잠금 안에서 FC22 또는
+        읽기-수정-쓰기, 동시에 들어온 단일 비트 쓰기와 요청 순서대로 병합).
+        레지스터 값은 워드 잠금 안에서 연속된 워드끼리 FC16으로 씀.
+        쓰기 후 전체 항목을 블록 읽기 1회로 확인.
+        이미 같은 값인 항목은 쓰지 않고 'unchanged': True로 표시
+        (같은 값 비교는 워드 잠금 안에서, 비트 변경은 대기 중인 변경과 합친 뒤 비교)
+
+        Args:
+            items: [(name, value), ...] (영문 키 또는 한글 이름)
+            verify: True면 쓰기 후 확인 읽기
+
+        Returns:
+            딕셔너리 {name: {'success': bool, 'verified_value': 값, 'error': 오류 메시지[, 'unchanged': True]}}
+            (name은 영문 키, 알 수 없는 이름은 요청한 이름 그대로)
+        """
+        # 같은 항목은 마지막 값만 사용 (한글 이름은 영문 키로 합침)
+        batch = WriteBatch(dict((resolve_name(name) or name, value) for name, value in items).items())
+        results = {name: {'success': False, 'verified_value': None, 'error': error}
+                   for name, error in batch.errors.items()}
+
+        written = []
+        unchanged = []
+
+        def mark_unchanged(address):
+            """워드의 항목을 같은 값으로 표시 (확인 값은 섀도에서 디코딩)"""
+            for name in batch.names_at(address):
+                current = decode_spec_value(name, CONTROL_SPECS[name], [self.get_shadow(address)])
+                results[name] = {'success': True, 'verified_value': current, 'error': None, 'unchanged': True}
+                unchanged.append(name)
+
+        # 1단계: 레지스터 값 쓰기 (워드 잠금 안에서 같은 값 비교 후, 교착 방지를 위해 항상 주소 순서로 잠금)
+        async with AsyncExitStack() as locks:
+            for address in sorted(batch.register_values):
+                await locks.enter_async_context(self._word_lock(address))
+
+            new_words = {}
+            for address, value in batch.register_values.items():
+                if self.unchanged_max_age and self.get_shadow(address, self.unchanged_max_age) == value:
+                    mark_unchanged(address)
+                else:
+                    new_words[address] = value
+            self.skipped_writes += len(batch.register_values) - len(new_words)
+
+            for start, values in WriteBatch.write_runs(new_words):
+                ok = await self.write_registers(start, values)
+                for address in range(start, start + len(values)):
+                    for name in batch.names_at(address):
+                        results[name] = {'success': ok, 'verified_value': None, 'error': None if ok else "Write failed"}
+                        if ok:
+                            written.append(name)
+
+        # 2단계: 비트 변경 대상 워드 중 최근 섀도 값이 없는 워드는 읽기 계획으로 묶어서 미리 읽기
+        # (섀도가 갱신되므로 아래 읽기-수정-쓰기는 워드마다 다시 읽지 않음, 같은 값으로 보이는 워드는 제외)
+        stale = []
+        for name in batch.read_names():
+            address = CONTROL_SPECS[name]['address']
+            if self.get_shadow(address, SHADOW_MAX_AGE) is None and not self._masks_unchanged(address, [batch.masks_at(address)]):
+                stale.append(name)
+        for start, count, range_names in build_read_plan(stale):
+            await self.read_holding_register(start, count)
+
+        # 3단계: 워드별 비트 변경을 마스크 1쌍으로 합쳐 단일 비트 쓰기와 같은 경로로 씀
+        # (워드 잠금 + FC22 또는 병합 읽기-수정-쓰기, 같은 값 비교도 그 안에서, 다른 워드는 동시에 진행)
+        addresses = list(batch.bit_edits)
+        edits = await asyncio.gather(*(self._edit_word(address, *batch.masks_at(address)) for address in addresses))
+        for address, (ok, same) in zip(addresses, edits):
+            if same:
+                mark_unchanged(address)
+                continue
+            for name in batch.names_at(address):
+                results[name] = {'success': ok, 'verified_value': None, 'error': None if ok else "Write failed"}
+                if ok:
+                    written.append(name)
+
+        # 4단계: 확인 읽기 (전체 범위를 블록 1회로)
+        if verify and written:
+            verified = await self.read_multiple(written, max_gap=MAX_READ_COUNT)
+            for name in written:
+                results[name]['verified_value'] = verified.get(name)
+
+        logger.info(f"배치 쓰기: {len(written)}/{len(results)}개 성공 (같은 값 생략 {len(unchanged)}개)")
+        return results
+
+    def get_spec_info(self, name):
+        """
+        제어 명세 정보 조회
+
+        Args:
+            name: 제어 이름 (영문 키 또는 한글 이름)
+
+        Returns:
+            명세 정보 딕셔너리
+        """
+        return get_spec(name)
+
+    def list_all_controls(self):
+        """
+        모든 제어 항목 이름 반환
+
+        Returns:
+            제어 이름 리스트
+        """
+        return list(CONTROL_SPECS.keys())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Bounded Executor
+================================================================================
+블로킹 I/O 전용 제한 작업 풀 (asyncio 이벤트 루프 보호)
+
+이벤트 루프에서 직접 호출하면 안 되는 블로킹 작업(기상청 HTTP 요청, SQLite,
+디스크 I/O)을 전용 스레드 풀에서 실행함.
+실행 중 + 대기 중 작업 수가 한도를 넘으면 작업을 쌓지 않고 즉시 거절하므로,
+외부 서비스가 멈춰도 헬스 체크나 캐시 응답은 계속 빠르게 처리됨
+
+- 대기열 길이, 대기 시간(평균/최대), 거절 수를 get_stats()로 확인 가능
+
+사용법:
+    executor = BoundedExecutor(max_workers=4, max_queue=16)
+
+    try:
+        result = await executor.run(requests.get, url, timeout=10)
+    except ExecutorFullError:
+        ...  # 503 응답
+
+    executor.shutdown()
+================================================================================
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# 기본 작업 스레드 수
+DEFAULT_MAX_WORKERS = 4
+
+# 기본 최대 대기 작업 수 (실행 중인 작업 제외)
+DEFAULT_MAX_QUEUE = 16
+
+
+class ExecutorFullError(Exception):
+    """작업 풀 포화 (대기열 한도 초과)"""
+    pass
+
+
+class BoundedExecutor:
+    """대기열 한도가 있는 블로킹 작업 풀"""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_queue=DEFAULT_MAX_QUEUE, name="blocking-io"):
+        """
+        초기화
+
+        Args:
+            max_workers: 작업 스레드 수
+            max_queue: 최대 대기 작업 수 (초과 시 ExecutorFullError)
+            name: 스레드 이름 접두어
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()  # 작업 스레드에서 갱신하는 값 보호
+
+        # 현재 상태
+        self.pending = 0   # 제출된 작업 (실행 중 + 대기 중)
+        self.running = 0   # 실행 중인 작업
+
+        # 통계
+        self.submitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0  # 누적 대기 시간 (초)
+        self.max_wait = 0.0    # 최대 대기 시간 (초)
+
+    @property
+    def queued(self):
+        """대기 중인 작업 수 (스레드를 기다리는 작업)"""
+        return self.pending - self.running
+
+    def _call(self, submitted_at, func):
+        """작업 스레드에서 실행 (대기 시간 기록)"""
+        wait = time.monotonic() - submitted_at
+        with self._lock:
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.running += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    async def run(self, func, *args, **kwargs):
+        """
+        블로킹 함수를 작업 풀에서 실행
+
+        Args:
+            func: 블로킹 함수
+            *args, **kwargs: 함수 인자
+
+        Returns:
+            함수 반환값
+
+        Raises:
+            ExecutorFullError: 대기열 한도 초과 (작업은 실행되지 않음)
+        """
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                message = f"작업 풀 포화 (실행 {self.running}, 대기 {self.queued}, 한도 {self.max_queue})"
+                logger.warning(f"⚠️ {message}")
+                raise ExecutorFullError(message)
+            self.pending += 1
+            self.submitted += 1
+
+        call = functools.partial(self._call, time.monotonic(), functools.partial(func, *args, **kwargs))
+        future = self._pool.submit(call)
+        # 작업이 끝나거나 시작 전에 취소될 때 한도 반환 (요청이 중간에 끊겨도 누수 없음)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        """작업 완료/취소 시 대기열 한도 반환"""
+        with self._lock:
+            self.pending -= 1
+
+    def get_stats(self):
+        """
+        작업 풀 통계
+
+        Returns:
+            딕셔너리 {workers, max_queue, running, queued, submitted, rejected, avg_wait_ms, max_wait_ms}
+        """
+        started = self.submitted - self.queued
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": self.queued,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / started * 1000, 1) if started > 0 else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1)
+        }
+
+    def shutdown(self, wait=True):
+        """
+        작업 풀 종료
+
+        Args:
+            wait: 실행 중인 작업 완료까지 대기 여부
+        """
+        self._pool.shutdown(wait=wait)
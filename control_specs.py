@@ -12,6 +12,11 @@ Usage:
     spec = CONTROL_SPECS["indoor_current_temperature"]
     print(spec['address'])      # 70
     print(spec['korean_name'])  # 내부현재온도
+    
+    from control_specs import get_spec, get_by_type
+    
+    spec = get_spec("내부현재온도")          # Korean name also accepted
+    sensors = get_by_type('SENSOR_READ')     # Precomputed at import
 ================================================================================
 """
 
@@ -2118,21 +2123,99 @@ CONTROL_SPECS = {
 
 }
 
+# ============================================================================
+# Lookup Indexes (built once at import)
+# ============================================================================
+
+# Writable control types
+WRITABLE_TYPES = ('REGISTER_WRITE', 'BIT_WRITE', 'BIT_RANGE_WRITE')
+
+# API categories
+CATEGORIES = ('settings', 'sensors', 'status')
+
+
+def get_category(spec_type):
+    """
+    Get API category of control type
+    
+    Args:
+        spec_type (str): Control type (e.g., 'SENSOR_READ', 'BIT_WRITE')
+        
+    Returns:
+        str: 'sensors', 'settings' or 'status'
+    """
+    if spec_type == 'SENSOR_READ':
+        return 'sensors'
+    elif spec_type in WRITABLE_TYPES:
+        return 'settings'
+    else:
+        return 'status'
+
+
+def _build_indexes(specs):
+    """
+    Build lookup indexes over control specifications
+    
+    Args:
+        specs (dict): Control specifications {name: spec}
+        
+    Returns:
+        tuple: (names by korean name, specs by address, names by type, names by category)
+    """
+    by_korean_name = {}
+    by_address = {}
+    by_type = {}
+    by_category = {category: [] for category in CATEGORIES}
+    
+    for name, spec in specs.items():
+        spec_type = spec.get('type')
+        by_korean_name.setdefault(spec.get('korean_name'), name)
+        by_address.setdefault(spec.get('address'), {})[name] = spec
+        by_type.setdefault(spec_type, []).append(name)
+        by_category[get_category(spec_type)].append(name)
+    
+    return (
+        by_korean_name,
+        by_address,
+        {spec_type: tuple(names) for spec_type, names in by_type.items()},
+        {category: tuple(names) for category, names in by_category.items()},
+    )
+
+
+# Korean name → English key, address → {name: spec}, type → names, category → names
+NAMES_BY_KOREAN_NAME, SPECS_BY_ADDRESS, NAMES_BY_TYPE, NAMES_BY_CATEGORY = _build_indexes(CONTROL_SPECS)
+
 # ============================================================================
 # Utility Functions
 # ============================================================================
 
+def resolve_name(name):
+    """
+    Resolve control item name to its English key
+    
+    Args:
+        name (str): Control item name (English key or Korean name)
+        
+    Returns:
+        str: English key (None if not found)
+    """
+    if name in CONTROL_SPECS:
+        return name
+    return NAMES_BY_KOREAN_NAME.get(name)
+
+
 def get_spec(name):
     """
     Get control item specification by name
     
     Args:
-        name (str): Control item name (English)
+        name (str): Control item name (English key or Korean name)
         
     Returns:
         dict: Control item specification (None if not found)
     """
-    return CONTROL_SPECS.get(name)
+    key = resolve_name(name)
+    return CONTROL_SPECS[key] if key is not None else None
 
 
 def list_all():
@@ -2155,11 +2238,7 @@ def get_by_address(address):
     Returns:
         dict: All control items at that address {name: spec}
     """
-    result = {}
-    for name, spec in CONTROL_SPECS.items():
-        if spec.get('address') == address:
-            result[name] = spec
-    return result
+    return dict(SPECS_BY_ADDRESS.get(address, {}))
 
 
 def get_by_type(spec_type):
@@ -2172,11 +2251,20 @@ def get_by_type(spec_type):
     Returns:
         list: List of control item names of that type
     """
-    result = []
-    for name, spec in CONTROL_SPECS.items():
-        if spec.get('type') == spec_type:
-            result.append(name)
-    return result
+    return list(NAMES_BY_TYPE.get(spec_type, ()))
+
+
+def get_by_category(category):
+    """
+    Get all control item names of specific API category
+    
+    Args:
+        category (str): API category ('settings', 'sensors', 'status')
+        
+    Returns:
+        list: List of control item names of that category
+    """
+    return list(NAMES_BY_CATEGORY.get(category, ()))
 
 
 if __name__ == "__main__":
@@ -11,6 +11,8 @@ RS485 Modbus TCP/IP 통신 컨트롤러
 - 비트 제어 (ON/OFF)
 - 레지스터 쓰기
 - 제어명세서 기반 자동 함수 생성
+- 레지스터 맵 블록 읽기 (RegisterImage)
+- FC22 마스크 쓰기 (비트 제어 1회 트랜잭션, 미지원 시 자동 대체)
 
 사용법:
     controller = ModbusController(host="168.131.153.52", port=9139)
@@ -22,16 +24,26 @@ RS485 Modbus TCP/IP 통신 컨트롤러
     # 비트 제어
     controller.write_bit(20, 15, 1)
     
+    # 레지스터 맵 전체 읽기 (FC03 1회)
+    image = controller.read_register_image()
+    temp = image.decode("indoor_current_temperature")
+    
     controller.close()
 ================================================================================
 """
 
 from pymodbus.client import ModbusTcpClient
+from pymodbus.exceptions import ModbusIOException
+import functools
 import logging
+import random
 import time
 
 # 제어 명세서 데이터베이스 import
-from control_specs import CONTROL_SPECS
+from control_specs import CONTROL_SPECS, WRITABLE_TYPES, get_spec, resolve_name
+
+# 컴파일된 디코딩 테이블 (명세를 매번 해석하지 않음)
+from spec_codec import SPEC_CODEC, compile_spec, decode_compiled, is_signed_spec
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -62,10 +74,656 @@ def modbus_int16_to_temp(raw_u16, scale=0.1):
     return raw_s16 / scale
 
 
+# 레지스터 맵 범위 (워드 주소 0~84)
+REGISTER_MAP_START = 0
+REGISTER_MAP_END = 84
+
+# FC03 한 번에 읽을 수 있는 최대 레지스터 개수 (Modbus 규격)
+MAX_READ_COUNT = 125
+
+# FC16 한 번에 쓸 수 있는 최대 레지스터 개수 (Modbus 규격)
+MAX_WRITE_COUNT = 123
+
+# Modbus 예외 코드: 지원하지 않는 함수 (FC22 미지원 게이트웨이 감지용)
+ILLEGAL_FUNCTION = 0x01
+
+# 읽기 계획 기본값 (read_multiple)
+PLAN_MAX_GAP = 4                 # 이 개수 이하의 빈 워드는 같은 구간으로 묶어서 읽음
+PLAN_MAX_COUNT = MAX_READ_COUNT  # 구간 1개당 최대 워드 개수
+
+# 회로 차단기 기본값 (게이트웨이 장애 시 즉시 실패)
+BREAKER_FAILURE_THRESHOLD = 3  # 연속 실패 횟수가 이 값에 도달하면 열림
+BREAKER_BASE_DELAY = 1.0       # 첫 재연결 대기 시간 (초, 열릴 때마다 2배)
+BREAKER_MAX_DELAY = 60.0       # 최대 재연결 대기 시간 (초)
+
+
+def decode_spec_value(name, spec, registers):
+    """
+    제어명세서 항목을 레지스터 값으로부터 디코딩 (통신 없음)
+    
+    Args:
+        name: 제어 이름
+        spec: 제어 명세 딕셔너리
+        registers: 항목 주소부터 시작하는 레지스터 값 리스트
+        
+    Returns:
+        성공: 디코딩된 값
+        실패: None (지원하지 않는 타입)
+    """
+    entry = SPEC_CODEC.entries.get(name) or compile_spec(name, spec)
+    if entry is None:
+        return None
+    
+    return decode_compiled(entry, registers)
+
+
+def encode_register_value(name, spec, value):
+    """
+    REGISTER_WRITE 항목의 실제 값을 레지스터 값으로 변환
+    
+    Args:
+        name: 제어 이름
+        spec: 제어 명세 딕셔너리
+        value: 실제 값 (예: 25.0도, -5.0도)
+        
+    Returns:
+        레지스터 값 (0~65535)
+    """
+    register_value = int(value * spec.get('scale', 1))
+    
+    # 온도 관련 항목은 signed 변환 적용 (음수를 unsigned로 변환)
+    entry = SPEC_CODEC.entries.get(name)
+    signed = entry.signed if entry is not None else is_signed_spec(name, spec)
+    if signed and register_value < 0:
+        register_value = register_value + 0x10000
+    
+    # unsigned 16비트 범위로 제한
+    return register_value & 0xFFFF
+
+
+def set_bit_value(word_value, bit_num, bit_value):
+    """
+    워드 값의 특정 비트 변경
+    
+    Args:
+        word_value: 현재 워드 값
+        bit_num: 비트 번호 (0~15)
+        bit_value: 비트 값 (0 또는 1)
+        
+    Returns:
+        새 워드 값
+    """
+    if bit_value == 1:
+        return word_value | (1 << bit_num)  # 비트를 1로 설정
+    return word_value & ~(1 << bit_num) & 0xFFFF  # 비트를 0으로 설정
+
+
+def set_bit_range_value(word_value, bit_start, bit_end, value):
+    """
+    워드 값의 비트 범위 변경
+    
+    Args:
+        word_value: 현재 워드 값
+        bit_start: 시작 비트 번호
+        bit_end: 종료 비트 번호
+        value: 비트 범위에 쓸 값
+        
+    Returns:
+        성공: 새 워드 값
+        실패: None (값 범위 초과)
+    """
+    bit_count = bit_end - bit_start + 1
+    mask = (1 << bit_count) - 1
+    
+    # 값이 범위를 벗어나는지 체크
+    if value > mask or value < 0:
+        logger.error(f"값 범위 초과: {value} (최대: {mask})")
+        return None
+    
+    # 해당 비트 범위를 클리어하고 새 값을 설정
+    clear_mask = ~(mask << bit_start) & 0xFFFF
+    return (word_value & clear_mask) | (value << bit_start)
+
+
+def bit_range_masks(bit_start, bit_end, value):
+    """
+    FC22(Mask Write Register)용 마스크 계산
+    
+    게이트웨이 처리: 결과 = (현재값 AND and_mask) OR (or_mask AND NOT and_mask)
+    
+    Args:
+        bit_start: 시작 비트 번호
+        bit_end: 종료 비트 번호 (단일 비트면 bit_start와 같음)
+        value: 비트 범위에 쓸 값
+        
+    Returns:
+        성공: (and_mask, or_mask)
+        실패: None (값 범위 초과)
+    """
+    bit_count = bit_end - bit_start + 1
+    mask = (1 << bit_count) - 1
+    
+    if value > mask or value < 0:
+        logger.error(f"값 범위 초과: {value} (최대: {mask})")
+        return None
+    
+    and_mask = ~(mask << bit_start) & 0xFFFF
+    or_mask = (value << bit_start) & 0xFFFF
+    return and_mask, or_mask
+
+
+def apply_masks(value, and_mask, or_mask):
+    """
+    FC22 마스크를 워드 값에 적용 (게이트웨이와 같은 계산)
+    
+    Args:
+        value: 현재 워드 값
+        and_mask: AND 마스크
+        or_mask: OR 마스크
+        
+    Returns:
+        새 워드 값
+    """
+    return ((value & and_mask) | (or_mask & ~and_mask)) & 0xFFFF
+
+
+@functools.lru_cache(maxsize=128)
+def _build_read_plan(names, words, max_gap, max_count):
+    """build_read_plan()의 캐시 대상 (names, words는 정렬된 튜플)"""
+    # 워드 주소별로 항목 묶기 (명세에 없는 워드는 항목 없이 주소만)
+    by_address = {address: [] for address in words}
+    for name in names:
+        spec = CONTROL_SPECS.get(name)
+        if not spec:
+            continue
+        by_address.setdefault(spec['address'], []).append(name)
+    
+    plan = []
+    range_start = range_end = None
+    range_names = []
+    
+    for address in sorted(by_address):
+        item_names = by_address[address]
+        item_end = address + max([CONTROL_SPECS[name].get('count', 1) for name in item_names] or [1]) - 1
+        
+        # 빈 워드가 max_gap 이하이고 구간 길이가 max_count 이내면 현재 구간에 합치기
+        if (range_start is not None
+                and address - range_end - 1 <= max_gap
+                and max(range_end, item_end) - range_start + 1 <= max_count):
+            range_end = max(range_end, item_end)
+            range_names.extend(item_names)
+            continue
+        
+        if range_start is not None:
+            plan.append((range_start, range_end - range_start + 1, tuple(range_names)))
+        range_start, range_end = address, item_end
+        range_names = list(item_names)
+    
+    if range_start is not None:
+        plan.append((range_start, range_end - range_start + 1, tuple(range_names)))
+    
+    return tuple(plan)
+
+
+def build_read_plan(names, max_gap=PLAN_MAX_GAP, max_count=PLAN_MAX_COUNT, words=()):
+    """
+    여러 제어 항목을 최소 FC03 횟수로 읽기 위한 읽기 계획 생성
+    
+    같은 주소의 항목은 한 번만 읽고, 인접하거나 가까운 주소(빈 워드 max_gap 이하)는
+    하나의 구간으로 합침. 같은 항목 집합의 계획은 캐시되어 재사용됨
+    
+    Args:
+        names: 제어 이름 리스트
+        max_gap: 한 구간으로 합칠 수 있는 최대 빈 워드 개수
+        max_count: 구간 1개당 최대 워드 개수
+        words: 명세 항목 없이 원시 값을 함께 읽을 워드 주소 리스트 (예: 풍향/풍속 78, 79)
+        
+    Returns:
+        읽기 구간 튜플 ((start, count, (name, ...)), ...)
+        (CONTROL_SPECS에 없는 이름은 제외됨, words 주소는 구간 범위에만 포함)
+    """
+    return _build_read_plan(tuple(sorted(set(names))), tuple(sorted(set(words))), max_gap, max_count)
+
+
+def resolve_names(names):
+    """
+    요청 이름 리스트를 영문 키별로 묶기 (한글 이름 → 영문 키, 모르는 이름은 로그만)
+    
+    Args:
+        names: 제어 이름 리스트 (영문 키 또는 한글 이름)
+        
+    Returns:
+        딕셔너리 {영문 키: [요청 이름, ...]}
+    """
+    keys = {}
+    for name in names:
+        key = resolve_name(name)
+        if key is None:
+            logger.error(f"알 수 없는 제어 이름: {name}")
+            continue
+        keys.setdefault(key, []).append(name)
+    return keys
+
+
+class WriteBatch:
+    """
+    여러 설정 변경을 최소 Modbus 트랜잭션으로 묶는 쓰기 배치
+    
+    - 같은 워드의 비트/비트 범위 변경은 읽기-수정-쓰기 1회로 합침
+    - 연속된 워드는 FC16(write multiple registers) 1회로 씀
+    
+    사용법:
+        batch = WriteBatch([("heating_auto_mode", 1), ("heating_on_temperature_setting", 18.5)])
+        current = {...}                          # batch.read_names() 항목의 현재 워드 값
+        new_words = batch.apply(current)         # {address: 새 워드 값}
+        runs = batch.write_runs(new_words)       # [(start, [values]), ...]
+    """
+    
+    def __init__(self, items):
+        """
+        초기화 (항목 검증 및 워드 주소별 분류)
+        
+        Args:
+            items: [(name, value), ...] (영문 키 또는 한글 이름, 요청 순서대로 적용, 같은 항목은 마지막 값 적용)
+        """
+        self.errors = {}           # {name: 오류 메시지}
+        self.register_values = {}  # {address: 레지스터 값} REGISTER_WRITE
+        self.register_names = {}   # {address: [name, ...]} (영문 키)
+        self.bit_edits = {}        # {address: [(name, spec, value), ...]} BIT_WRITE / BIT_RANGE_WRITE
+        
+        for name, value in items:
+            key = resolve_name(name)  # 한글 이름 → 영문 키
+            if key is None:
+                self.errors[name] = f"알 수 없는 제어 이름: {name}"
+                continue
+            name = key
+            spec = CONTROL_SPECS[name]
+            
+            spec_type = spec['type']
+            address = spec['address']
+            
+            if spec_type == 'REGISTER_WRITE':
+                self.register_values[address] = encode_register_value(name, spec, value)
+                self.register_names.setdefault(address, [])
+                if name not in self.register_names[address]:
+                    self.register_names[address].append(name)
+            elif spec_type == 'BIT_WRITE':
+                if value not in (0, 1):
+                    self.errors[name] = f"비트 값은 0 또는 1이어야 합니다: {value}"
+                    continue
+                self.bit_edits.setdefault(address, []).append((name, spec, int(value)))
+            elif spec_type == 'BIT_RANGE_WRITE':
+                max_value = (1 << (spec['bit_end'] - spec['bit_start'] + 1)) - 1
+                if value != int(value) or not 0 <= value <= max_value:
+                    self.errors[name] = f"값 범위 초과: {value} (최대: {max_value})"
+                    continue
+                self.bit_edits.setdefault(address, []).append((name, spec, int(value)))
+            else:
+                self.errors[name] = f"쓰기를 지원하지 않는 타입: {spec_type}"
+    
+    def masks_at(self, address):
+        """
+        워드의 비트/비트 범위 변경을 마스크 1쌍으로 합치기 (요청 순서대로, 뒤의 변경이 우선)
+        
+        Args:
+            address: 워드 주소
+            
+        Returns:
+            (and_mask, or_mask) (apply_masks() / FC22 형식)
+        """
+        and_mask, or_mask = 0xFFFF, 0
+        for name, spec, value in self.bit_edits.get(address, []):
+            if spec['type'] == 'BIT_WRITE':
+                edit_and, edit_or = bit_range_masks(spec['bit'], spec['bit'], value)
+            else:
+                edit_and, edit_or = bit_range_masks(spec['bit_start'], spec['bit_end'], value)
+            # 앞 변경의 OR 비트 중 이번 변경이 덮어쓰는 비트는 버림
+            and_mask, or_mask = and_mask & edit_and, (or_mask & edit_and) | edit_or
+        return and_mask, or_mask
+    
+    def names_at(self, address):
+        """워드 주소에 쓰는 항목 이름 리스트"""
+        names = list(self.register_names.get(address, []))
+        for name, spec, value in self.bit_edits.get(address, []):
+            if name not in names:
+                names.append(name)
+        return names
+    
+    def names(self):
+        """쓰기 대상 전체 항목 이름 리스트 (검증 실패 항목 제외)"""
+        names = []
+        for address in sorted(set(self.register_values) | set(self.bit_edits)):
+            names.extend(self.names_at(address))
+        return names
+    
+    def read_names(self):
+        """
+        읽기-수정-쓰기를 위해 현재 워드 값이 필요한 항목 이름 리스트
+        
+        Returns:
+            비트/비트 범위 항목 이름 리스트 (build_read_plan()으로 읽기 계획 생성)
+        """
+        return [edits[0][0] for edits in self.bit_edits.values()]
+    
+    def apply(self, current_words):
+        """
+        현재 워드 값에 모든 변경을 적용
+        
+        Args:
+            current_words: {address: 현재 워드 값} (비트 변경 대상 워드)
+            
+        Returns:
+            {address: 새 워드 값} (현재 값을 읽지 못한 워드는 제외)
+        """
+        new_words = dict(self.register_values)
+        
+        for address, edits in self.bit_edits.items():
+            word_value = current_words.get(address)
+            if word_value is None:
+                continue
+            
+            for name, spec, value in edits:
+                if spec['type'] == 'BIT_WRITE':
+                    word_value = set_bit_value(word_value, spec['bit'], value)
+                else:
+                    word_value = set_bit_range_value(word_value, spec['bit_start'], spec['bit_end'], value)
+            new_words[address] = word_value
+        
+        return new_words
+    
+    @staticmethod
+    def write_runs(new_words, max_count=MAX_WRITE_COUNT):
+        """
+        연속된 워드 주소를 FC16 쓰기 구간으로 묶기
+        
+        Args:
+            new_words: {address: 새 워드 값}
+            max_count: 구간 1개당 최대 워드 개수
+            
+        Returns:
+            [(start, [values]), ...]
+        """
+        runs = []
+        for address in sorted(new_words):
+            if runs:
+                start, values = runs[-1]
+                if address == start + len(values) and len(values) < max_count:
+                    values.append(new_words[address])
+                    continue
+            runs.append((address, [new_words[address]]))
+        return runs
+
+
+class RegisterImage:
+    """
+    레지스터 이미지 (읽기 전용 스냅샷)
+    
+    read_register_image()로 읽은 연속 워드 블록.
+    생성 후에는 변경할 수 없으며, 모든 제어 항목을 통신 없이 디코딩할 수 있음
+    
+    사용법:
+        image = controller.read_register_image()
+        temp = image.decode("indoor_current_temperature")
+        word = image.get_word(65)
+    """
+    
+    __slots__ = ('_start', '_words', '_timestamp')
+    
+    def __init__(self, start, words, timestamp=None):
+        """
+        초기화
+        
+        Args:
+            start: 첫 워드 주소
+            words: 워드 값 리스트 (start부터 연속)
+            timestamp: 읽은 시각 (time.time(), 기본값: 현재 시각)
+        """
+        object.__setattr__(self, '_start', start)
+        object.__setattr__(self, '_words', tuple(words))
+        object.__setattr__(self, '_timestamp', time.time() if timestamp is None else timestamp)
+    
+    def __setattr__(self, key, value):
+        raise AttributeError("RegisterImage는 변경할 수 없습니다")
+    
+    def __len__(self):
+        return len(self._words)
+    
+    def __contains__(self, address):
+        return self._start <= address <= self.end
+    
+    def __repr__(self):
+        return f"RegisterImage(start={self._start}, end={self.end}, timestamp={self._timestamp})"
+    
+    @property
+    def start(self):
+        """첫 워드 주소"""
+        return self._start
+    
+    @property
+    def end(self):
+        """마지막 워드 주소"""
+        return self._start + len(self._words) - 1
+    
+    @property
+    def words(self):
+        """워드 값 튜플"""
+        return self._words
+    
+    @property
+    def timestamp(self):
+        """읽은 시각 (time.time())"""
+        return self._timestamp
+    
+    def get_word(self, address):
+        """
+        워드 값 조회
+        
+        Args:
+            address: 워드 주소
+            
+        Returns:
+            성공: 워드 값 (0~65535)
+            실패: None (범위 밖)
+        """
+        if address not in self:
+            return None
+        return self._words[address - self._start]
+    
+    def get_words(self, address, count=1):
+        """
+        연속 워드 값 조회
+        
+        Args:
+            address: 시작 워드 주소
+            count: 워드 개수
+            
+        Returns:
+            성공: 워드 값 튜플
+            실패: None (범위 밖)
+        """
+        if address not in self or address + count - 1 not in self:
+            return None
+        offset = address - self._start
+        return self._words[offset:offset + count]
+    
+    def decode(self, name):
+        """
+        제어명세서 이름으로 값 디코딩 (통신 없음)
+        
+        Args:
+            name: CONTROL_SPECS에 정의된 제어 이름
+            
+        Returns:
+            성공: 디코딩된 값
+            실패: None
+        """
+        entry = SPEC_CODEC.entries.get(name)
+        if entry is None:
+            return None
+        
+        registers = self.get_words(entry.address, entry.count)
+        if registers is None:
+            return None
+        
+        return decode_compiled(entry, registers)
+    
+    def decode_all(self, names=None):
+        """
+        여러 항목 디코딩 (통신 없음)
+        
+        Args:
+            names: 제어 이름 리스트 (기본값: 이미지 범위 내 전체 항목)
+            
+        Returns:
+            딕셔너리 {name: value}
+        """
+        return SPEC_CODEC.decode_words(self._words, self._start, names)
+    
+    def to_dict(self):
+        """
+        저장용 딕셔너리로 변환 (JSON 직렬화 가능)
+        
+        Returns:
+            딕셔너리 {start, words, timestamp}
+        """
+        return {"start": self._start, "words": list(self._words), "timestamp": self._timestamp}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        to_dict() 결과로부터 이미지 복원
+        
+        Args:
+            data: 딕셔너리 {start, words, timestamp}
+            
+        Returns:
+            RegisterImage
+        """
+        return cls(int(data["start"]), [int(word) & 0xFFFF for word in data["words"]], float(data["timestamp"]))
+
+
+class CircuitBreaker:
+    """
+    게이트웨이 회로 차단기 (닫힘 / 열림 / 반열림)
+    
+    - 닫힘: 정상 통신
+    - 열림: 연속 실패 후 재시도 시각까지 모든 요청을 즉시 실패 처리
+    - 반열림: 재시도 시각이 지나면 1회만 시도(프로브), 성공하면 닫힘 / 실패하면 다시 열림
+    
+    재시도 대기 시간은 열릴 때마다 2배로 늘어나며 (최대 max_delay),
+    여러 클라이언트가 동시에 재접속하지 않도록 지터(대기 시간의 50~100%)를 적용함
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, base_delay=BREAKER_BASE_DELAY, max_delay=BREAKER_MAX_DELAY):
+        """
+        초기화
+        
+        Args:
+            failure_threshold: 열림 전환 연속 실패 횟수
+            base_delay: 첫 재시도 대기 시간 (초)
+            max_delay: 최대 재시도 대기 시간 (초)
+        """
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        
+        self.state = self.CLOSED
+        self.failures = 0       # 연속 실패 횟수
+        self.open_count = 0     # 연속 열림 횟수 (백오프 단계)
+        self.retry_at = 0.0     # 다음 재시도 시각 (time.monotonic)
+        self.opened_at = None   # 마지막 장애 시작 시각 (time.time)
+        self.transitions = {}   # 상태 전환 횟수 {"closed->open": n, ...}
+    
+    def _transition(self, state):
+        """상태 전환 (전환 횟수 기록)"""
+        if state == self.state:
+            return
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        logger.warning(f"⚡ 회로 차단기: {self.state} → {state}")
+        self.state = state
+    
+    def allow(self):
+        """
+        요청 허용 여부
+        
+        Returns:
+            True: 닫힘, 또는 재시도 시각이 지나 반열림으로 전환됨 (이번 요청이 프로브)
+            False: 열림 또는 프로브 진행 중 (즉시 실패)
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() >= self.retry_at:
+            self._transition(self.HALF_OPEN)
+            return True
+        return False
+    
+    def record_success(self):
+        """성공 기록 (닫힘으로 전환, 백오프 초기화)"""
+        self.failures = 0
+        self.open_count = 0
+        self._transition(self.CLOSED)
+    
+    def record_failure(self):
+        """실패 기록 (반열림 실패 또는 연속 실패 한도 도달 시 열림)"""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.trip()
+    
+    def trip(self):
+        """즉시 열림 (지수 백오프 + 지터로 다음 재시도 시각 설정)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** self.open_count))
+        delay = random.uniform(delay / 2, delay)
+        self.open_count += 1
+        self.retry_at = time.monotonic() + delay
+        if self.state == self.CLOSED:
+            self.opened_at = time.time()  # 장애 시작 시각 (반열림 실패 시에는 유지)
+        self._transition(self.OPEN)
+    
+    def retry_delay(self):
+        """다음 재시도까지 남은 시간 (초)"""
+        return max(0.0, self.retry_at - time.monotonic())
+    
+    def get_stats(self):
+        """
+        회로 차단기 상태
+        
+        Returns:
+            딕셔너리 {state, failures, open_count, retry_in, opened_at, transitions}
+        """
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "open_count": self.open_count,
+            "retry_in": round(self.retry_delay(), 1) if self.state != self.CLOSED else 0.0,
+            "opened_at": self.opened_at,
+            "transitions": dict(self.transitions)
+        }
+
+
+def is_link_error(resp):
+    """
+    응답이 통신 실패인지 확인 (응답 없음 / 타임아웃)
+    
+    게이트웨이가 보낸 Modbus 예외 응답(잘못된 주소 등)은 통신 자체는 정상이므로 False
+    
+    Args:
+        resp: pymodbus 응답
+        
+    Returns:
+        True / False
+    """
+    return isinstance(resp, ModbusIOException)
+
+
 class ModbusController:
     """Modbus TCP 통신 컨트롤러"""
     
-    def __init__(self, host="aiseednaju.iptime.org", port=9139, unit_id=1, timeout=5, retries=3):
+    def __init__(self, host="aiseednaju.iptime.org", port=9139, unit_id=1, timeout=5, retries=3, mask_write=False):
         """
         초기화
         
@@ -75,6 +733,7 @@ class ModbusController:
             unit_id: Modbus Unit ID (Slave ID)
             timeout: 타임아웃 (초)
             retries: 재시도 횟수
+            mask_write: True면 비트/비트 범위 쓰기에 FC22(Mask Write Register) 사용
         """
         self.host = host
         self.port = port
@@ -83,6 +742,12 @@ class ModbusController:
         self.retries = retries
         self.client = None
         
+        # FC22 마스크 쓰기 사용 여부 (게이트웨이가 미지원 응답을 주면 자동으로 꺼짐)
+        self.mask_write = mask_write
+        
+        # 회로 차단기 (게이트웨이 장애 시 타임아웃을 기다리지 않고 즉시 실패)
+        self.breaker = CircuitBreaker()
+        
     def connect(self, max_retries=3, retry_delay=2):
         """
         서버 연결 (재시도 로직 포함)
@@ -118,6 +783,8 @@ class ModbusController:
                 
                 if result:
                     logger.info(f"✅ 연결 성공: {self.host}:{self.port}")
+                    # 재연결 경로에서 연결되면 회로를 바로 닫음 (재시도 시각까지 기다리지 않음)
+                    self.breaker.record_success()
                     return True
                 else:
                     logger.warning(f"⚠️  연결 실패 (시도 {attempt}/{max_retries})")
@@ -144,6 +811,35 @@ class ModbusController:
         """연결 상태 확인"""
         return self.client is not None and self.client.connected
     
+    def _circuit_allows(self):
+        """
+        트랜잭션 전 회로 차단기 확인
+        
+        열림 상태면 즉시 실패하고, 재시도 시각이 지나면(반열림) 이번 트랜잭션을 프로브로 사용함.
+        연결이 끊겼으면 호출 측 요청 안에서 재연결하지 않고 즉시 실패함
+        (재연결은 connect()를 호출하는 재연결 경로에서, 성공하면 회로가 닫힘)
+        
+        Returns:
+            True: 트랜잭션 진행 / False: 즉시 실패
+        """
+        if not self.breaker.allow():
+            logger.warning(f"회로 열림 - 즉시 실패 (재시도까지 {self.breaker.retry_delay():.1f}초)")
+            return False
+        
+        if self.is_connected():
+            return True
+        
+        logger.error("연결되지 않음 - 재연결 필요")
+        self.breaker.trip()
+        return False
+    
+    def _record_result(self, resp):
+        """트랜잭션 결과를 회로 차단기에 반영"""
+        if is_link_error(resp):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+    
     # ========================================================================
     # 센서 읽기 (SENSOR_READ / BIT_READ)
     # ========================================================================
@@ -160,8 +856,7 @@ class ModbusController:
             성공: [register_values]
             실패: None
         """
-        if not self.is_connected():
-            logger.error("연결되지 않음")
+        if not self._circuit_allows():
             return None
         
         try:
@@ -170,6 +865,7 @@ class ModbusController:
                 count=count,
                 slave=self.unit_id
             )
+            self._record_result(resp)
             
             if resp.isError():
                 logger.error(f"읽기 실패: 주소 {address}")
@@ -183,8 +879,41 @@ class ModbusController:
                 
         except Exception as e:
             logger.error(f"읽기 오류: {e}")
+            self.breaker.record_failure()
             return None
     
+    def read_register_image(self, start=REGISTER_MAP_START, end=REGISTER_MAP_END, max_count=MAX_READ_COUNT):
+        """
+        레지스터 맵 전체를 블록 읽기 (FC03 최소 횟수)
+        
+        워드 0~84(85개)는 FC03 1회로 읽음. 게이트웨이가 긴 응답을 지원하지 않으면
+        max_count를 줄여서 여러 블록으로 나누어 읽음
+        
+        Args:
+            start: 시작 워드 주소
+            end: 종료 워드 주소 (포함)
+            max_count: FC03 1회당 최대 레지스터 개수
+            
+        Returns:
+            성공: RegisterImage
+            실패: None
+        """
+        words = []
+        address = start
+        
+        while address <= end:
+            count = min(max_count, end - address + 1)
+            registers = self.read_holding_register(address, count)
+            if registers is None or len(registers) < count:
+                logger.error(f"레지스터 이미지 읽기 실패: 주소 {address}~{address + count - 1}")
+                return None
+            words.extend(registers[:count])
+            address += count
+        
+        image = RegisterImage(start, words)
+        logger.info(f"레지스터 이미지 읽기: 주소 {start}~{end} ({len(words)}워드)")
+        return image
+    
     def read_sensor(self, address, scale=1, signed=False):
         """
         센서값 읽기 (스케일 적용)
@@ -274,8 +1003,7 @@ class ModbusController:
             성공: True
             실패: False
         """
-        if not self.is_connected():
-            logger.error("연결되지 않음")
+        if not self._circuit_allows():
             return False
         
         try:
@@ -284,6 +1012,7 @@ class ModbusController:
                 value=value,
                 slave=self.unit_id
             )
+            self._record_result(resp)
             
             if resp.isError():
                 logger.error(f"쓰기 실패: 주소 {address}, 값={value}")
@@ -294,12 +1023,97 @@ class ModbusController:
             
         except Exception as e:
             logger.error(f"쓰기 오류: {e}")
+            self.breaker.record_failure()
+            return False
+    
+    def write_registers(self, address, values):
+        """
+        연속 레지스터 쓰기 (FC16, 1개면 FC06)
+        
+        Args:
+            address: 시작 레지스터 주소
+            values: 쓸 값 리스트 (각 0~65535)
+            
+        Returns:
+            성공: True
+            실패: False
+        """
+        if len(values) == 1:
+            return self.write_register(address, values[0])
+        
+        if not self._circuit_allows():
+            return False
+        
+        try:
+            resp = self.client.write_registers(
+                address=address,
+                values=values,
+                slave=self.unit_id
+            )
+            self._record_result(resp)
+            
+            if resp.isError():
+                logger.error(f"연속 쓰기 실패: 주소 {address}~{address + len(values) - 1}")
+                return False
+            
+            logger.info(f"연속 쓰기 성공: 주소 {address}~{address + len(values) - 1}, 값={values}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"연속 쓰기 오류: {e}")
+            self.breaker.record_failure()
+            return False
+    
+    def mask_write_register(self, address, and_mask, or_mask):
+        """
+        마스크 레지스터 쓰기 (FC22, 1회 트랜잭션)
+        
+        게이트웨이가 지원하지 않는 함수(illegal function)로 응답하면
+        mask_write를 끄고 이후에는 읽기-수정-쓰기를 사용함
+        
+        Args:
+            address: 레지스터 주소
+            and_mask: AND 마스크
+            or_mask: OR 마스크
+            
+        Returns:
+            성공: True
+            실패: False
+        """
+        if not self._circuit_allows():
+            return False
+        
+        try:
+            resp = self.client.mask_write_register(
+                address=address,
+                and_mask=and_mask,
+                or_mask=or_mask,
+                slave=self.unit_id
+            )
+            self._record_result(resp)
+            
+            if resp.isError():
+                if getattr(resp, 'exception_code', None) == ILLEGAL_FUNCTION:
+                    logger.warning("⚠️  게이트웨이가 FC22(Mask Write)를 지원하지 않음 - 읽기-수정-쓰기로 전환")
+                    self.mask_write = False
+                else:
+                    logger.error(f"마스크 쓰기 실패: 주소 {address}")
+                return False
+            
+            logger.info(f"마스크 쓰기 성공: 주소 {address}, AND=0x{and_mask:04X}, OR=0x{or_mask:04X}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"마스크 쓰기 오류: {e}")
+            self.breaker.record_failure()
             return False
     
     def write_bit(self, address, bit_num, bit_value):
         """
         특정 비트 쓰기 (ON/OFF 제어)
         
+        mask_write가 켜져 있으면 FC22 1회로 쓰고, 아니면 읽기-수정-쓰기
+        
         Args:
             address: 워드 주소
             bit_num: 비트 번호 (0~15)
@@ -309,6 +1123,17 @@ class ModbusController:
             성공: True
             실패: False
         """
+        if bit_value not in (0, 1):
+            logger.error(f"비트 값은 0 또는 1이어야 합니다: {bit_value}")
+            return False
+        
+        # FC22 마스크 쓰기 (미지원 감지 시 아래 읽기-수정-쓰기로 대체)
+        if self.mask_write:
+            and_mask, or_mask = bit_range_masks(bit_num, bit_num, int(bit_value))
+            result = self.mask_write_register(address, and_mask, or_mask)
+            if result or self.mask_write:
+                return result
+        
         # 1단계: 현재 워드 값 읽기
         registers = self.read_holding_register(address, count=1)
         if registers is None:
@@ -317,10 +1142,7 @@ class ModbusController:
         current_value = registers[0]
         
         # 2단계: 비트 값 변경
-        if bit_value == 1:
-            new_value = current_value | (1 << bit_num)  # 비트를 1로 설정
-        else:
-            new_value = current_value & ~(1 << bit_num)  # 비트를 0으로 설정
+        new_value = set_bit_value(current_value, bit_num, bit_value)
         
         # 3단계: 워드 쓰기
         logger.info(f"비트 쓰기: 주소 {address}, 비트 {bit_num}, {bit_value} (현재={current_value}, 새값={new_value})")
@@ -340,6 +1162,15 @@ class ModbusController:
             성공: True
             실패: False
         """
+        # FC22 마스크 쓰기 (미지원 감지 시 아래 읽기-수정-쓰기로 대체)
+        if self.mask_write:
+            masks = bit_range_masks(bit_start, bit_end, value)
+            if masks is None:
+                return False
+            result = self.mask_write_register(address, *masks)
+            if result or self.mask_write:
+                return result
+        
         # 1단계: 현재 워드 값 읽기
         registers = self.read_holding_register(address, count=1)
         if registers is None:
@@ -347,20 +1178,11 @@ class ModbusController:
         
         current_value = registers[0]
         
-        # 2단계: 비트 범위 값 변경
-        bit_count = bit_end - bit_start + 1
-        mask = (1 << bit_count) - 1
-        
-        # 값이 범위를 벗어나는지 체크
-        max_value = mask
-        if value > max_value or value < 0:
-            logger.error(f"값 범위 초과: {value} (최대: {max_value})")
+        # 2단계: 비트 범위 값 변경 (범위 초과 시 실패)
+        new_value = set_bit_range_value(current_value, bit_start, bit_end, value)
+        if new_value is None:
             return False
         
-        # 해당 비트 범위를 클리어하고 새 값을 설정
-        clear_mask = ~(mask << bit_start) & 0xFFFF
-        new_value = (current_value & clear_mask) | (value << bit_start)
-        
         # 3단계: 워드 쓰기
         logger.info(f"비트 범위 쓰기: 주소 {address}, 비트 {bit_start}~{bit_end}, {value} (현재={current_value}, 새값={new_value})")
         return self.write_register(address, new_value)
@@ -400,61 +1222,35 @@ class ModbusController:
         제어명세서 이름으로 데이터 읽기
         
         Args:
-            name: CONTROL_SPECS에 정의된 제어 이름
+            name: CONTROL_SPECS에 정의된 제어 이름 (영문 키 또는 한글 이름)
             
         Returns:
             성공: 읽은 값
             실패: None
         """
-        spec = CONTROL_SPECS.get(name)
+        spec = get_spec(name)
         if not spec:
             logger.error(f"알 수 없는 제어 이름: {name}")
             return None
+        name = resolve_name(name)  # 한글 이름 → 영문 키
         
         spec_type = spec['type']
         address = spec['address']
-        scale = spec.get('scale', 1)
         
         try:
-            if spec_type == 'SENSOR_READ' or spec_type == 'REGISTER_READ':
-                # 레지스터 전체 읽기
-                count = spec.get('count', 1)
-                registers = self.read_holding_register(address, count)
-                if registers is None:
-                    return None
-                
-                if count == 1:
-                    # 온도 관련 항목은 signed 변환 적용
-                    is_temperature = '온도' in spec.get('korean_name', '') or 'temperature' in name.lower()
-                    if is_temperature:
-                        value = modbus_int16_to_temp(registers[0], scale)
-                    else:
-                        value = registers[0] / scale
-                else:
-                    # 2워드 이상인 경우 (예: 32비트 값)
-                    value = (registers[0] << 16) | registers[1]
-                
-                logger.info(f"[{name}] 읽기 성공: {value} {spec.get('unit', '')}")
-                return value
-                
-            elif spec_type == 'BIT_READ':
-                # 단일 비트 읽기
-                bit_num = spec['bit']
-                value = self.read_bit(address, bit_num)
-                logger.info(f"[{name}] 비트 읽기: {value}")
-                return value
-                
-            elif spec_type == 'BIT_RANGE_READ':
-                # 비트 범위 읽기
-                bit_start = spec['bit_start']
-                bit_end = spec['bit_end']
-                value = self.read_bit_range(address, bit_start, bit_end)
-                logger.info(f"[{name}] 비트 범위 읽기: {value}")
-                return value
-                
-            else:
+            # 항목이 차지하는 워드 읽기 후 디코딩 (READ/WRITE 타입 모두 지원)
+            count = spec.get('count', 1)
+            registers = self.read_holding_register(address, count)
+            if registers is None:
+                return None
+            
+            value = decode_spec_value(name, spec, registers)
+            if value is None:
                 logger.error(f"지원하지 않는 타입: {spec_type}")
                 return None
+            
+            logger.info(f"[{name}] 읽기 성공: {value} {spec.get('unit', '')}")
+            return value
                 
         except Exception as e:
             logger.error(f"[{name}] 읽기 오류: {e}")
@@ -465,38 +1261,29 @@ class ModbusController:
         제어명세서 이름으로 데이터 쓰기
         
         Args:
-            name: CONTROL_SPECS에 정의된 제어 이름
+            name: CONTROL_SPECS에 정의된 제어 이름 (영문 키 또는 한글 이름)
             value: 쓸 값
             
         Returns:
             성공: True
             실패: False
         """
-        spec = CONTROL_SPECS.get(name)
+        spec = get_spec(name)
         if not spec:
             logger.error(f"알 수 없는 제어 이름: {name}")
             return False
+        name = resolve_name(name)  # 한글 이름 → 영문 키
         
         spec_type = spec['type']
         address = spec['address']
-        scale = spec.get('scale', 1)
         
         try:
             if spec_type == 'REGISTER_WRITE':
-                # 레지스터 전체 쓰기
-                # 온도 관련 항목은 signed 변환 적용
-                is_temperature = '온도' in spec.get('korean_name', '') or 'temperature' in name.lower()
-                register_value = int(value * scale)
-                
-                # signed 변환이 필요한 경우 (음수 처리)
-                if is_temperature and register_value < 0:
-                    register_value = register_value + 0x10000  # 음수를 unsigned로 변환
-                
-                # unsigned 16비트 범위로 제한
-                register_value = register_value & 0xFFFF
+                # 레지스터 전체 쓰기 (온도 관련 항목은 signed 변환 적용)
+                register_value = encode_register_value(name, spec, value)
                 
                 result = self.write_register(address, register_value)
-                logger.info(f"[{name}] 쓰기: {value} → {register_value} (signed={is_temperature})")
+                logger.info(f"[{name}] 쓰기: {value} → {register_value} (signed={is_signed_spec(name, spec)})")
                 return result
                 
             elif spec_type == 'BIT_WRITE':
@@ -506,6 +1293,12 @@ class ModbusController:
                 logger.info(f"[{name}] 비트 쓰기: {value}")
                 return result
                 
+            elif spec_type == 'BIT_RANGE_WRITE':
+                # 비트 범위 쓰기
+                result = self.write_bit_range(address, spec['bit_start'], spec['bit_end'], int(value))
+                logger.info(f"[{name}] 비트 범위 쓰기: {value}")
+                return result
+                
             else:
                 logger.error(f"[{name}] 쓰기를 지원하지 않는 타입: {spec_type}")
                 return False
@@ -514,20 +1307,94 @@ class ModbusController:
             logger.error(f"[{name}] 쓰기 오류: {e}")
             return False
     
-    def read_multiple(self, names):
+    def read_multiple(self, names, max_gap=PLAN_MAX_GAP, max_count=PLAN_MAX_COUNT, words=()):
         """
-        여러 항목을 한번에 읽기
+        여러 항목을 한번에 읽기 (주소 병합 읽기 계획 사용)
         
         Args:
             names: 제어 이름 리스트
+            max_gap: 한 구간으로 합칠 수 있는 최대 빈 워드 개수
+            max_count: FC03 1회당 최대 워드 개수
+            words: 명세 항목 없이 원시 값을 함께 읽을 워드 주소 리스트 (같은 읽기 계획에 합침)
             
         Returns:
-            딕셔너리 {name: value}
+            딕셔너리 {name: value} (요청한 이름 그대로, words 주소는 {address: 원시 워드 값}으로 함께 반환)
+        """
+        results = {name: None for name in names}
+        results.update({address: None for address in words})
+        
+        keys = resolve_names(names)
+        
+        # 읽기 계획에 따라 구간별로 한 번씩 읽고 각 항목은 구간 데이터에서 디코딩
+        for start, count, range_names in build_read_plan(keys, max_gap, max_count, words):
+            registers = self.read_holding_register(start, count)
+            if registers is None or len(registers) < count:
+                continue
+            
+            for key in range_names:
+                spec = CONTROL_SPECS[key]
+                offset = spec['address'] - start
+                value = decode_spec_value(key, spec, registers[offset:offset + spec.get('count', 1)])
+                for name in keys[key]:
+                    results[name] = value
+            for address in words:
+                if start <= address < start + count:
+                    results[address] = registers[address - start]
+        
+        return results
+    
+    def write_multiple(self, items, verify=True):
         """
-        results = {}
-        for name in names:
-            value = self.read_by_name(name)
-            results[name] = value
+        여러 항목을 한번에 쓰기 (최소 트랜잭션)
+        
+        같은 워드의 비트 변경은 읽기-수정-쓰기 1회로 합치고, 연속된 워드는 FC16으로 씀.
+        쓰기 후 전체 항목을 블록 읽기 1회로 확인
+        
+        Args:
+            items: [(name, value), ...] (영문 키 또는 한글 이름)
+            verify: True면 쓰기 후 확인 읽기
+            
+        Returns:
+            딕셔너리 {name: {'success': bool, 'verified_value': 값, 'error': 오류 메시지}}
+            (name은 영문 키, 알 수 없는 이름은 요청한 이름 그대로)
+        """
+        batch = WriteBatch(items)
+        results = {name: {'success': False, 'verified_value': None, 'error': error}
+                   for name, error in batch.errors.items()}
+        
+        # 1단계: 비트 변경 대상 워드 읽기 (읽기 계획으로 묶어서)
+        current_words = {}
+        for start, count, range_names in build_read_plan(batch.read_names()):
+            registers = self.read_holding_register(start, count)
+            if registers is None or len(registers) < count:
+                continue
+            for name in range_names:
+                address = CONTROL_SPECS[name]['address']
+                current_words[address] = registers[address - start]
+        
+        # 2단계: 변경 적용 후 연속 구간별 쓰기
+        new_words = batch.apply(current_words)
+        written = []
+        for address in batch.bit_edits:
+            if address not in new_words:
+                for name in batch.names_at(address):
+                    results[name] = {'success': False, 'verified_value': None, 'error': "Read failed"}
+        
+        for start, values in WriteBatch.write_runs(new_words):
+            ok = self.write_registers(start, values)
+            for address in range(start, start + len(values)):
+                for name in batch.names_at(address):
+                    results[name] = {'success': ok, 'verified_value': None, 'error': None if ok else "Write failed"}
+                    if ok:
+                        written.append(name)
+        
+        # 3단계: 확인 읽기 (전체 범위를 블록 1회로)
+        if verify and written:
+            verified = self.read_multiple(written, max_gap=MAX_READ_COUNT)
+            for name in written:
+                results[name]['verified_value'] = verified.get(name)
+        
+        logger.info(f"배치 쓰기: {len(written)}/{len(results)}개 성공")
         return results
     
     def get_spec_info(self, name):
@@ -535,12 +1402,12 @@ class ModbusController:
         제어 명세 정보 조회
         
         Args:
-            name: 제어 이름
+            name: 제어 이름 (영문 키 또는 한글 이름)
             
         Returns:
             명세 정보 딕셔너리
         """
-        return CONTROL_SPECS.get(name)
+        return get_spec(name)
     
     def list_all_controls(self):
         """
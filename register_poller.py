@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Register Poller
+================================================================================
+레지스터 맵 백그라운드 폴러 (메모리 스냅샷 캐시)
+
+REST API 서버의 GET 요청마다 게이트웨이를 읽지 않도록, 일정 주기로 레지스터 맵
+전체(워드 0~84)를 읽어 최신 RegisterImage를 메모리에 보관함.
+조회하는 대시보드 수가 늘어나도 게이트웨이 부하는 폴링 주기로 고정됨
+
+사용법:
+    poller = RegisterPoller(controller, interval=5)
+    poller.start()
+
+    image = poller.get_image(max_age=10)   # 10초 이내 스냅샷 (없으면 None)
+    image = await poller.refresh()         # 즉시 다시 읽기
+
+    poller.add_listener(callback)          # 새 스냅샷마다 callback(image) 호출
+
+    poller.restore(load_image(path))       # 재시작 시 디스크에 저장된 마지막 스냅샷 복원
+    save_image(path, image)                # 스냅샷 저장 (블로킹, 작업 풀에서 호출)
+
+    await poller.stop()
+================================================================================
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+from modbus_tcp_controller import RegisterImage
+from transaction_scheduler import PRIORITY_BACKGROUND, set_priority
+
+logger = logging.getLogger(__name__)
+
+# 기본 폴링 주기 (초)
+DEFAULT_POLL_INTERVAL = 5
+
+# 마지막 스냅샷 저장 파일 (게이트웨이 장애 / 재시작 시 마지막 값 제공용)
+DEFAULT_SNAPSHOT_PATH = os.path.join("sensor_data", "last_snapshot.json")
+
+
+def save_image(path, image):
+    """
+    스냅샷을 JSON 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 기존 파일 유지)
+
+    Args:
+        path: 저장 파일 경로
+        image: RegisterImage
+    """
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(image.to_dict(), f)
+    os.replace(temp_path, path)
+
+
+def load_image(path):
+    """
+    저장된 스냅샷 불러오기
+
+    Args:
+        path: 저장 파일 경로
+
+    Returns:
+        성공: RegisterImage
+        실패: None (파일 없음 / 손상)
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return RegisterImage.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"⚠️  저장된 스냅샷 불러오기 실패 ({path}): {e}")
+        return None
+
+
+class RegisterPoller:
+    """레지스터 맵 주기 읽기 + 최신 스냅샷 보관"""
+
+    def __init__(self, controller, interval=DEFAULT_POLL_INTERVAL):
+        """
+        초기화
+
+        Args:
+            controller: AsyncModbusController
+            interval: 폴링 주기 (초)
+        """
+        self.controller = controller
+        self.interval = interval
+        self.image = None  # 최신 RegisterImage
+        self._listeners = []  # 새 스냅샷 콜백 (이력 저장 등)
+        self._task = None
+
+    def add_listener(self, callback):
+        """
+        새 스냅샷 콜백 등록
+
+        Args:
+            callback: callback(image), 일반 함수 또는 코루틴 함수
+        """
+        self._listeners.append(callback)
+
+    def restore(self, image):
+        """
+        저장된 스냅샷 복원 (아직 읽은 스냅샷이 없을 때만, 콜백 호출 없음)
+
+        Args:
+            image: RegisterImage (None이면 무시)
+
+        Returns:
+            True: 복원함 / False: 무시
+        """
+        if image is None or self.image is not None:
+            return False
+        self.image = image
+        logger.info(f"💾 저장된 스냅샷 복원 ({datetime.fromtimestamp(image.timestamp).isoformat()})")
+        return True
+
+    def start(self):
+        """백그라운드 폴링 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🔄 레지스터 폴링 시작 (주기: {self.interval}초)")
+
+    async def stop(self):
+        """백그라운드 폴링 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("⏹ 레지스터 폴링 중지")
+
+    async def _run(self):
+        """폴링 루프"""
+        # 폴링 트랜잭션은 가장 낮은 우선순위 (API 요청이 먼저 게이트웨이를 사용)
+        set_priority(PRIORITY_BACKGROUND)
+
+        while True:
+            try:
+                # 재연결은 컨트롤러의 회로 차단기가 백그라운드에서 담당
+                # (회로가 열려 있으면 읽기는 즉시 실패하고 이전 스냅샷 유지)
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"레지스터 폴링 오류: {e}")
+
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self):
+        """
+        레지스터 맵을 즉시 다시 읽어 스냅샷 갱신
+
+        Returns:
+            성공: 새 RegisterImage
+            실패: None (기존 스냅샷은 유지)
+        """
+        image = await self.controller.read_register_image()
+        if image is not None:
+            self.image = image
+            await self._notify(image)
+        return image
+
+    async def _notify(self, image):
+        """콜백 호출 (콜백 오류는 폴링에 영향을 주지 않음)"""
+        for callback in self._listeners:
+            try:
+                result = callback(image)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"스냅샷 콜백 오류: {e}")
+
+    def age(self):
+        """
+        현재 스냅샷 경과 시간
+
+        Returns:
+            경과 시간 (초), 스냅샷이 없으면 None
+        """
+        if self.image is None:
+            return None
+        return time.time() - self.image.timestamp
+
+    def get_image(self, max_age=None):
+        """
+        캐시된 스냅샷 조회 (통신 없음)
+
+        Args:
+            max_age: 허용 최대 경과 시간 (초, None이면 경과 시간 무관)
+
+        Returns:
+            조건을 만족하는 RegisterImage, 없거나 오래됐으면 None
+        """
+        if self.image is None:
+            return None
+        if max_age is not None and self.age() > max_age:
+            return None
+        return self.image
@@ -9,9 +9,15 @@ REST API Server converting Modbus TCP Controller to RESTful API
 Features:
 - GET /api/settings/{name}: Read settings (Word Address 0~59)
 - PUT /api/settings/{name}: Write settings (Word Address 0~59)
+- PUT /api/settings: Write multiple settings at once (batch)
 - GET /api/sensors/{name}: Read sensor values (Word Address 70~79)
 - GET /api/status/{name}: Read status (Word Address 60~69, 80~84)
 - GET /api/controls/list: List all control items
+- GET /api/history/{period}: Sensor history over a time range (e.g. 24h, 7d)
+- GET /api/runtime/{period}: Per-day actuator output runtime (on-seconds, switch-ons, longest run)
+- GET /api/snapshot: All control items decoded from one register snapshot (category/name filters, ETag)
+- GET /api/snapshot?since={version}: Items changed since a snapshot version (304 if none, optional long-poll)
+- WS /ws/stream: Push stream (full snapshot on subscribe, then changed items only)
 
 Auto Swagger Documentation: http://localhost:8000/docs
 
@@ -40,20 +46,33 @@ Examples:
 ================================================================================
 """
 
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, HTTPException, Body, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 import logging
 from typing import Optional, Any, Dict, List, Union
 import uvicorn
 import requests
 import xmltodict
+import time
+import asyncio
+import functools
 from datetime import datetime
 
 # 로컬 모듈 임포트
-from control_specs import CONTROL_SPECS, get_spec, list_all, get_by_type, get_by_address
-from modbus_tcp_controller import ModbusController
+from control_specs import (
+    CONTROL_SPECS, NAMES_BY_CATEGORY, NAMES_BY_TYPE, WRITABLE_TYPES,
+    get_spec, get_category, resolve_name, list_all, get_by_type, get_by_address
+)
+from async_modbus_controller import AsyncModbusController
+from register_poller import RegisterPoller, DEFAULT_SNAPSHOT_PATH, load_image, save_image
+from history_store import HistoryStore, DEFAULT_DB_PATH, parse_range
+from duty_cycle import DutyCycleAccumulator
+from snapshot_stream import SnapshotStream
+from bounded_executor import BoundedExecutor, ExecutorFullError
+from transaction_scheduler import PRIORITY_CONTROL, PRIORITY_SETTING, set_priority
+from write_debouncer import WriteDebouncer, WriteCancelled
 
 # 로깅 설정
 logging.basicConfig(
@@ -104,8 +123,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Modbus 컨트롤러 (전역 인스턴스)
-controller: Optional[ModbusController] = None
+# Modbus 컨트롤러 (전역 인스턴스, asyncio 기반 - 이벤트 루프를 막지 않음)
+controller: Optional[AsyncModbusController] = None
+
+# 레지스터 맵 폴러 (GET 요청은 폴러 스냅샷으로 응답)
+poller: Optional[RegisterPoller] = None
+POLL_INTERVAL = 5  # 폴링 주기 (초)
+MASK_WRITE = True  # 비트 쓰기에 FC22 사용 (게이트웨이 미지원 시 자동으로 읽기-수정-쓰기)
+UNCHANGED_MAX_AGE = 6.0  # 캐시 워드가 이 시간(초) 이내이고 같은 값이면 쓰기 생략 (None이면 항상 씀)
+
+# 디바운스 쓰기 (PUT /api/settings/{name}?debounce=초, 대기 시간 안의 마지막 값만 적용)
+debouncer: Optional[WriteDebouncer] = None
+DEBOUNCE_MAX_WINDOW = 5.0  # 최대 대기 시간 (초)
+
+# 수동 제어 항목 (이름 접미어) - 트랜잭션 스케줄러에서 설정값 쓰기/조회보다 먼저 처리
+MANUAL_CONTROL_SUFFIXES = ('_forced_operation', '_open_mode', '_close_mode', '_auto_mode')
+
+# 마지막 스냅샷 저장 (게이트웨이 장애 중 / 재시작 직후에는 마지막 값을 stale로 표시하여 응답)
+SNAPSHOT_PATH = DEFAULT_SNAPSHOT_PATH
+SNAPSHOT_SAVE_INTERVAL = 60  # 값이 그대로일 때 저장 주기 (초, 값이 바뀌면 즉시 저장)
+STALE_AFTER = 15  # 이 시간(초)보다 오래된 스냅샷은 stale로 표시
+saved_words = None  # 마지막으로 저장한 워드 값
+saved_at = 0.0  # 마지막으로 저장한 스냅샷 시각
+
+# 블로킹 I/O 전용 작업 풀 (기상청 HTTP, SQLite, 디스크 - 이벤트 루프를 막지 않음)
+io_executor: Optional[BoundedExecutor] = None
+IO_WORKERS = 4     # 작업 스레드 수
+IO_MAX_QUEUE = 16  # 최대 대기 작업 수 (초과 시 즉시 503)
+
+# 센서 이력 저장소 (폴러 스냅샷을 HISTORY_INTERVAL 단위로 기록)
+history: Optional[HistoryStore] = None
+HISTORY_DB = DEFAULT_DB_PATH
+HISTORY_INTERVAL = 60  # 이력 기록 주기 (초, 절대시간 기준)
+HISTORY_ITEMS = NAMES_BY_TYPE['SENSOR_READ']
+history_slot = None  # 마지막으로 기록한 주기 번호
+
+# 출력 비트 가동 시간 (폴링 워드 XOR 비교, HISTORY_INTERVAL마다 이력 DB 일별 합계에 더함)
+duty: Optional[DutyCycleAccumulator] = None
+RUNTIME_ITEMS = [
+    name for name in NAMES_BY_TYPE['BIT_READ']
+    if CONTROL_SPECS[name]['address'] == 65 and name.endswith(('_output_indicator', '_output_active'))
+]
+
+# WebSocket 푸시 스트림 (폴러 스냅샷 변경분)
+stream: Optional[SnapshotStream] = None
+STREAM_QUEUE_SIZE = 8  # 구독자별 큐 크기 (초과 시 밀린 프레임 버림)
+SNAPSHOT_MAX_WAIT = 30  # /api/snapshot 롱 폴링 최대 대기 시간 (초, 터널 타임아웃보다 짧게)
 
 
 # ============================================================================
@@ -129,6 +192,10 @@ class ReadResponse(BaseModel):
     type: Optional[str] = Field(None, description="Type")
     address: Optional[int] = Field(None, description="Word address")
     description: Optional[str] = Field(None, description="Description")
+    timestamp: Optional[str] = Field(None, description="Snapshot read time (ISO 8601)")
+    age_ms: Optional[int] = Field(None, description="Snapshot age (milliseconds)")
+    stale: bool = Field(False, description="True if the value is the last known snapshot (gateway down or snapshot too old)")
+    outage_seconds: Optional[float] = Field(None, description="Seconds since the gateway went down (null while connected)")
     error: Optional[str] = Field(None, description="Error message")
     
     class Config:
@@ -140,7 +207,9 @@ class ReadResponse(BaseModel):
                 "unit": "°C",
                 "type": "SENSOR_READ",
                 "address": 70,
-                "description": "Indoor current temperature (내부현재온도)"
+                "description": "Indoor current temperature (내부현재온도)",
+                "timestamp": "2025-12-09T10:15:30.120000",
+                "age_ms": 1830
             }
         }
 
@@ -152,6 +221,9 @@ class WriteResponse(BaseModel):
     verified_value: Optional[Union[int, float]] = Field(None, description="Verified value")
     type: Optional[str] = Field(None, description="Type")
     address: Optional[int] = Field(None, description="Word address")
+    unchanged: bool = Field(False, description="True if the value was already in place and the write was skipped")
+    applied_value: Optional[Union[int, float]] = Field(None, description="Value actually written (debounced writes)")
+    superseded: bool = Field(False, description="True if a later debounced request replaced this value")
     error: Optional[str] = Field(None, description="Error message")
     
     class Config:
@@ -166,6 +238,17 @@ class WriteResponse(BaseModel):
             }
         }
 
+class BatchWriteItem(BaseModel):
+    """Batch Write Item"""
+    name: str = Field(..., description="Control item name (English)", example="heating_auto_mode")
+    value: Union[int, float] = Field(..., description="Value to write (integer or float)", example=1)
+
+class BatchWriteResponse(BaseModel):
+    """Batch Write Response"""
+    success: bool = Field(..., description="True if every item was written")
+    count: int = Field(..., description="Number of items")
+    results: List[WriteResponse]
+
 class ControlInfo(BaseModel):
     """Control Item Information"""
     name: str = Field(..., description="Control item name (English)")
@@ -191,25 +274,54 @@ class ControlListResponse(BaseModel):
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 Modbus 연결"""
-    global controller
+    global controller, poller, history, stream, io_executor, debouncer, duty
     logger.info("=" * 70)
     logger.info("🚀 REST API 서버 시작")
     logger.info("=" * 70)
     
     # Modbus 컨트롤러 생성 및 연결
-    controller = ModbusController(
+    controller = AsyncModbusController(
         host="aiseednaju.iptime.org",
         port=9139,
-        unit_id=1
+        unit_id=1,
+        mask_write=MASK_WRITE,
+        unchanged_max_age=UNCHANGED_MAX_AGE
     )
     
-    if controller.connect():
+    if await controller.connect():
         logger.info("✅ Modbus 연결 성공")
         logger.info(f"   호스트: {controller.host}")
         logger.info(f"   포트: {controller.port}")
         logger.info(f"   Unit ID: {controller.unit_id}")
     else:
-        logger.error("❌ Modbus 연결 실패 - 일부 기능이 동작하지 않을 수 있습니다")
+        logger.error("❌ Modbus 연결 실패 - 백그라운드에서 재연결을 시도합니다")
+        controller.start_reconnect()
+    
+    # 블로킹 I/O 작업 풀
+    io_executor = BoundedExecutor(max_workers=IO_WORKERS, max_queue=IO_MAX_QUEUE)
+    
+    # 슬라이더 등 연속 설정 변경용 디바운스 쓰기
+    debouncer = WriteDebouncer()
+    
+    # 센서 이력 저장소 (DB 열기, WAL 설정, 스키마 생성은 작업 풀에서)
+    history = await io_executor.run(HistoryStore, HISTORY_DB)
+    logger.info(f"🗄 이력 저장소: {HISTORY_DB}")
+    duty = DutyCycleAccumulator(RUNTIME_ITEMS, max_gap=POLL_INTERVAL * 3)
+    
+    # 레지스터 맵 폴링 시작 (연결 실패 시에도 폴러가 재연결 시도)
+    poller = RegisterPoller(controller, interval=POLL_INTERVAL)
+    poller.add_listener(record_history)
+    poller.add_listener(persist_snapshot)
+    
+    # WebSocket 스트림 (폴러 스냅샷 변경분 푸시)
+    stream = SnapshotStream(queue_size=STREAM_QUEUE_SIZE)
+    poller.add_listener(stream.update)
+    
+    # 저장된 마지막 스냅샷 복원 (게이트웨이 연결 전에도 마지막 값으로 응답)
+    if poller.restore(await run_background(load_image, SNAPSHOT_PATH)):
+        stream.update(poller.image)
+    
+    poller.start()
     
     logger.info("=" * 70)
     logger.info("📝 API 문서: http://localhost:8000/docs")
@@ -220,6 +332,17 @@ async def startup_event():
 async def shutdown_event():
     """서버 종료 시 Modbus 연결 해제"""
     global controller
+    if poller:
+        await poller.stop()
+    if debouncer:
+        await debouncer.close()
+    if history:
+        try:
+            await io_executor.run(history.close)
+        except ExecutorFullError:
+            history.close()  # 종료 중이므로 루프에서 직접 (버퍼에 남은 이력 저장)
+    if io_executor:
+        io_executor.shutdown()
     if controller:
         controller.close()
         logger.info("🔌 Modbus 연결 종료")
@@ -230,34 +353,154 @@ async def shutdown_event():
 # 유틸리티 함수
 # ============================================================================
 
-def check_connection():
+def gateway_available() -> bool:
+    """True if the circuit is closed and the gateway is connected"""
+    return controller is not None and controller.breaker.state == "closed" and controller.is_connected()
+
+def outage_seconds() -> Optional[float]:
+    """Seconds since the gateway went down, or None while the circuit is closed"""
+    if controller is None or controller.breaker.state == "closed" or controller.breaker.opened_at is None:
+        return None
+    return round(time.time() - controller.breaker.opened_at, 1)
+
+def last_known_image():
+    """Last good snapshot to serve while the gateway is down (None when connected or no snapshot)"""
+    if gateway_available() or poller is None or poller.image is None:
+        return None
+    if controller is not None:
+        controller.start_reconnect()
+    return poller.image
+
+async def check_connection():
     """Check Modbus connection"""
     if controller is None:
         raise HTTPException(
             status_code=503,
             detail="Modbus controller not initialized"
         )
-    if not controller.is_connected():
-        # Try to reconnect
-        if not controller.connect():
-            raise HTTPException(
-                status_code=503,
-                detail="Modbus not connected - reconnection failed"
-            )
+    if not gateway_available():
+        # Fail fast; the circuit breaker reconnects in the background
+        controller.start_reconnect()
+        raise HTTPException(
+            status_code=503,
+            detail=f"Modbus not connected - circuit {controller.breaker.state}, "
+                   f"retry in {controller.breaker.retry_delay():.1f}s",
+            headers={"Retry-After": str(max(1, round(controller.breaker.retry_delay())))}
+        )
+
+async def get_register_image(max_age: Optional[float] = None):
+    """
+    Get register snapshot (poller cache first)
+    
+    Reads the gateway only when there is no snapshot yet or
+    the cached one is older than max_age seconds.
+    While the gateway is down the last known snapshot is returned (see snapshot_fields for the stale flag)
+    
+    Returns:
+        RegisterImage, or None if the read failed
+    """
+    image = poller.get_image(max_age) if poller else None
+    if image is None:
+        image = last_known_image()
+        if image is not None:
+            return image
+        await check_connection()
+        image = await poller.refresh() if poller else await controller.read_register_image()
+        if image is None and poller:
+            image = poller.image  # 읽기 실패 시 마지막 스냅샷
+    return image
+
+def snapshot_fields(timestamp: float) -> Dict[str, Any]:
+    """Snapshot metadata fields (timestamp, age_ms, stale, outage_seconds)"""
+    age = time.time() - timestamp
+    outage = outage_seconds()
+    return {
+        "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+        "age_ms": int(age * 1000),
+        "stale": outage is not None or age > STALE_AFTER,
+        "outage_seconds": outage
+    }
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run blocking I/O (HTTP, SQLite, disk) in the bounded worker pool
+    
+    Raises:
+        HTTPException 503 immediately when the pool queue is full
+    """
+    try:
+        return await io_executor.run(func, *args, **kwargs)
+    except ExecutorFullError as e:
+        raise HTTPException(status_code=503, detail=f"Server busy: {e}")
+
+async def run_background(func, *args, **kwargs):
+    """
+    Run blocking I/O for background work (poller listeners, startup) in the worker pool
+    
+    There is no request to answer, so a full pool is logged and skipped instead of raising 503
+    
+    Returns:
+        func result, or None when the pool queue is full
+    """
+    try:
+        return await io_executor.run(func, *args, **kwargs)
+    except ExecutorFullError as e:
+        logger.warning(f"⚠️ 작업 풀 포화로 {getattr(func, '__qualname__', func)} 건너뜀: {e}")
+        return None
+
+async def record_history(image):
+    """Poller listener: record sensor values and output runtime once per HISTORY_INTERVAL"""
+    global history_slot
+    if history is None:
+        return
+    
+    # Output bits are accounted on every poll (XOR of successive words)
+    words = {address: image.get_word(address) for address in duty.addresses if address in image}
+    duty.update(image.timestamp, words)
+    
+    slot = int(image.timestamp // HISTORY_INTERVAL)
+    if slot == history_slot:
+        return
+    history_slot = slot
+    
+    # history.add takes the store lock that query/flush hold in pool threads, so it runs there too
+    values = image.decode_all(HISTORY_ITEMS)
+    if await run_background(history.add, slot * HISTORY_INTERVAL, values):
+        await run_background(history.flush)
+    
+    # Close the runtime window and add it to the per-day totals
+    window_start, stats = duty.window_start, duty.summary()
+    duty.reset()
+    if window_start is not None:
+        await run_background(history.add_runtime, window_start, stats)
+
+async def persist_snapshot(image):
+    """Poller listener: save the last good snapshot to disk (on change, or once per SNAPSHOT_SAVE_INTERVAL)"""
+    global saved_words, saved_at
+    if image.words == saved_words and image.timestamp - saved_at < SNAPSHOT_SAVE_INTERVAL:
+        return
+    saved_words, saved_at = image.words, image.timestamp
+    await run_background(save_image, SNAPSHOT_PATH, image)
 
 def is_writable(spec_type: str) -> bool:
     """Check if the type is writable"""
-    writable_types = ['REGISTER_WRITE', 'BIT_WRITE', 'BIT_RANGE_WRITE']
-    return spec_type in writable_types
+    return spec_type in WRITABLE_TYPES
 
-def get_category(spec_type: str) -> str:
-    """Get category based on type"""
-    if spec_type == 'SENSOR_READ':
-        return 'sensors'
-    elif is_writable(spec_type):
-        return 'settings'
-    else:
-        return 'status'
+def write_priority(name: str) -> int:
+    """Scheduler priority for writing a control item (manual controls before setting values)"""
+    return PRIORITY_CONTROL if name.endswith(MANUAL_CONTROL_SUFFIXES) else PRIORITY_SETTING
+
+def find_spec(name: str):
+    """
+    Resolve control item name (English key or Korean name)
+    
+    Returns:
+        (English key, spec), raises 404 if not found
+    """
+    key = resolve_name(name)
+    if key is None:
+        raise HTTPException(status_code=404, detail=f"Control item '{name}' not found")
+    return key, CONTROL_SPECS[key]
 
 
 # ============================================================================
@@ -277,7 +520,11 @@ async def root():
             "settings": "/api/settings/{name}",
             "sensors": "/api/sensors/{name}",
             "status": "/api/status/{name}",
-            "list": "/api/controls/list"
+            "list": "/api/controls/list",
+            "history": "/api/history/{period}",
+            "runtime": "/api/runtime/{period}",
+            "snapshot": "/api/snapshot",
+            "stream": "/ws/stream"
         },
         "example_names": ["indoor_current_temperature", "dehumidifier_auto_mode", "heating_on_temperature_setting"]
     }
@@ -291,6 +538,14 @@ async def health_check():
     return {
         "status": "healthy",
         "modbus": modbus_status,
+        "circuit": controller.breaker.get_stats() if controller else None,
+        "scheduler": controller.scheduler.get_stats() if controller else None,
+        "snapshot": snapshot_fields(poller.image.timestamp) if poller and poller.image else None,
+        "read_stats": controller.get_read_stats() if controller else None,
+        "write_stats": controller.get_write_stats() if controller else None,
+        "debounce_stats": debouncer.get_stats() if debouncer else None,
+        "stream_stats": stream.get_stats() if stream else None,
+        "io_stats": io_executor.get_stats() if io_executor else None,
         "timestamp": "2024-12-09"
     }
 
@@ -312,14 +567,15 @@ async def list_controls(
     """
     controls = []
     
-    for name, spec in CONTROL_SPECS.items():
+    # Category filter (precomputed name tuples)
+    names = NAMES_BY_CATEGORY.get(category, ()) if category else CONTROL_SPECS
+    
+    for name in names:
+        spec = CONTROL_SPECS[name]
         spec_type = spec.get('type', 'UNKNOWN')
-        spec_category = get_category(spec_type)
         writable = is_writable(spec_type)
         
         # Filtering
-        if category and spec_category != category:
-            continue
         if writable_only and not writable:
             continue
         
@@ -352,14 +608,12 @@ async def read_setting(name: str):
     """
     Read setting value (Word Address 0~59)
     
-    - **name**: Setting item name (English only)
+    - **name**: Setting item name (English key or Korean name)
       - Examples: `dehumidifier_auto_mode`, `heating_on_temperature_setting`
-    """
-    check_connection()
     
-    spec = get_spec(name)
-    if spec is None:
-        raise HTTPException(status_code=404, detail=f"Control item '{name}' not found")
+    While the gateway is down, the last known value is returned with `stale: true`.
+    """
+    name, spec = find_spec(name)
     
     # Check if it's a writable type
     spec_type = spec.get('type', '')
@@ -369,9 +623,25 @@ async def read_setting(name: str):
             detail=f"'{name}' is not a setting. Use /api/{get_category(spec_type)}/{name} instead"
         )
     
+    # 게이트웨이 장애 중에는 마지막 스냅샷 값으로 응답
+    image = last_known_image()
+    if image is not None:
+        return ReadResponse(
+            success=True,
+            name=name,
+            value=image.decode(name),
+            unit=spec.get('unit'),
+            type=spec_type,
+            address=spec.get('address'),
+            description=spec.get('description'),
+            **snapshot_fields(image.timestamp)
+        )
+    
+    await check_connection()
+    
     # Perform read
     try:
-        value = controller.read_by_name(name)
+        value = await controller.read_by_name(name)
         
         if value is None:
             return ReadResponse(
@@ -398,13 +668,45 @@ async def read_setting(name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def apply_setting(name: str, spec: Dict[str, Any], value: Union[int, float]) -> WriteResponse:
+    """
+    Write one setting and verify it by reading back
+    
+    The write and readback are skipped when the value is already in place. That comparison
+    runs under the controller's word lock, after earlier writes to the same word have landed.
+    """
+    spec_type = spec.get('type', '')
+    
+    # Perform write (single-item batch: unchanged check, write and readback in the controller)
+    try:
+        result = (await controller.write_multiple([(name, value)]))[name]
+        
+        return WriteResponse(
+            success=result['success'],
+            name=name,
+            written_value=value,
+            verified_value=result.get('verified_value'),
+            type=spec_type,
+            address=spec.get('address'),
+            unchanged=result.get('unchanged', False),
+            error=result.get('error')
+        )
+    
+    except Exception as e:
+        logger.error(f"Settings write error ({name}): {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.put("/api/settings/{name}", response_model=WriteResponse, tags=["Settings"])
-async def write_setting(name: str, request: WriteRequest):
+async def write_setting(name: str, request: WriteRequest, debounce: Optional[float] = None):
     """
     Write setting value (Word Address 0~59)
     
-    - **name**: Setting item name (English only)
+    - **name**: Setting item name (English key or Korean name)
     - **value**: Value to write (integer or float)
+    - **debounce**: Optional debounce window in seconds (max 5). Requests for the same item within
+      the window are collapsed and only the latest value is written; earlier requests get the same
+      result with `superseded: true` and the final `applied_value`.
     
     Example:
     ```json
@@ -413,11 +715,9 @@ async def write_setting(name: str, request: WriteRequest):
     }
     ```
     """
-    check_connection()
+    await check_connection()
     
-    spec = get_spec(name)
-    if spec is None:
-        raise HTTPException(status_code=404, detail=f"Control item '{name}' not found")
+    name, spec = find_spec(name)
     
     # Check if it's a writable type
     spec_type = spec.get('type', '')
@@ -427,34 +727,95 @@ async def write_setting(name: str, request: WriteRequest):
             detail=f"'{name}' is not writable (type: {spec_type})"
         )
     
-    # Perform write
+    # Manual controls (forced operation, open/close/auto mode) jump ahead of queued reads
+    # (priority applies to the rest of this request, including the verify read)
+    set_priority(write_priority(name))
+    
+    if not debounce or debounce <= 0:
+        return await apply_setting(name, spec, request.value)
+    
+    # Debounced: only the latest value within the window is written (last write wins)
+    window = min(debounce, DEBOUNCE_MAX_WINDOW)
+    try:
+        result, applied_value, superseded = await debouncer.submit(
+            name, request.value, functools.partial(apply_setting, name, spec), window
+        )
+    except WriteCancelled as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return WriteResponse(
+        success=result.success,
+        name=name,
+        written_value=request.value,
+        verified_value=result.verified_value,
+        type=spec_type,
+        address=spec.get('address'),
+        unchanged=result.unchanged,
+        applied_value=applied_value,
+        superseded=superseded,
+        error=result.error
+    )
+
+
+@app.put("/api/settings", response_model=BatchWriteResponse, tags=["Settings"])
+async def write_settings(items: List[BatchWriteItem]):
+    """
+    Write multiple setting values at once
+    
+    Bit and bit-range changes to the same word are merged into one read-modify-write,
+    contiguous words are written with one FC16 request, and the whole batch is
+    verified with one block read.
+    
+    Example:
+    ```json
+    [
+        {"name": "heating_auto_mode", "value": 1},
+        {"name": "heating_on_temperature_setting", "value": 18.5}
+    ]
+    ```
+    """
+    await check_connection()
+    
+    # Validate all items before writing anything (Korean names resolved to English keys)
+    keys = [resolve_name(item.name) for item in items]
+    unknown = [item.name for item, key in zip(items, keys) if key is None]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Control items not found: {unknown}")
+    
+    not_writable = [item.name for item, key in zip(items, keys) if not is_writable(CONTROL_SPECS[key].get('type', ''))]
+    if not_writable:
+        raise HTTPException(status_code=400, detail=f"Not writable: {not_writable}")
+    
+    # Batch runs at the highest priority of its items
+    set_priority(min(write_priority(key) for key in keys))
+    
+    # Perform batch write
     try:
-        success = controller.write_by_name(name, request.value)
+        written = await controller.write_multiple([(key, item.value) for item, key in zip(items, keys)])
         
-        if not success:
-            return WriteResponse(
-                success=False,
-                name=name,
-                written_value=request.value,
-                type=spec_type,
+        results = []
+        for item, key in zip(items, keys):
+            spec = CONTROL_SPECS[key]
+            result = written.get(key, {})
+            results.append(WriteResponse(
+                success=result.get('success', False),
+                name=key,
+                written_value=item.value,
+                verified_value=result.get('verified_value'),
+                type=spec.get('type'),
                 address=spec.get('address'),
-                error="Write failed"
-            )
-        
-        # Verify by reading back
-        verified_value = controller.read_by_name(name)
+                unchanged=result.get('unchanged', False),
+                error=result.get('error')
+            ))
         
-        return WriteResponse(
-            success=True,
-            name=name,
-            written_value=request.value,
-            verified_value=verified_value,
-            type=spec_type,
-            address=spec.get('address')
+        return BatchWriteResponse(
+            success=all(r.success for r in results),
+            count=len(results),
+            results=results
         )
     
     except Exception as e:
-        logger.error(f"Settings write error ({name}): {e}")
+        logger.error(f"Settings batch write error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -463,18 +824,22 @@ async def write_setting(name: str, request: WriteRequest):
 # ============================================================================
 
 @app.get("/api/sensors/all", tags=["Sensors"])
-async def read_all_sensors():
-    """Read all sensor values at once"""
-    check_connection()
+async def read_all_sensors(max_age: Optional[float] = None):
+    """
+    Read all sensor values at once
     
-    from control_specs import get_by_type
-    sensor_names = get_by_type('SENSOR_READ')
+    - **max_age**: Maximum snapshot age in seconds (older snapshot forces a fresh read)
+    """
+    sensor_names = NAMES_BY_TYPE['SENSOR_READ']
     sensors = {}
     
+    # 폴러 스냅샷(레지스터 맵 전체)에서 각 센서 디코딩
+    image = await get_register_image(max_age)
+    
     for name in sensor_names:
         try:
-            spec = get_spec(name)
-            value = controller.read_by_name(name)
+            spec = CONTROL_SPECS[name]
+            value = image.decode(name) if image is not None else None
             
             sensors[name] = {
                 "value": value,
@@ -494,23 +859,21 @@ async def read_all_sensors():
     return {
         "success": True,
         "count": len(sensors),
-        "sensors": sensors
+        "sensors": sensors,
+        **(snapshot_fields(image.timestamp) if image is not None else {})
     }
 
 
 @app.get("/api/sensors/{name}", response_model=ReadResponse, tags=["Sensors"])
-async def read_sensor(name: str):
+async def read_sensor(name: str, max_age: Optional[float] = None):
     """
     Read sensor value (Word Address 70~79)
     
-    - **name**: Sensor name (English only)
+    - **name**: Sensor name (English key or Korean name)
       - Examples: `indoor_current_temperature`, `outdoor_current_humidity`
+    - **max_age**: Maximum snapshot age in seconds (older snapshot forces a fresh read)
     """
-    check_connection()
-    
-    spec = get_spec(name)
-    if spec is None:
-        raise HTTPException(status_code=404, detail=f"Control item '{name}' not found")
+    name, spec = find_spec(name)
     
     # Check if it's a sensor type
     spec_type = spec.get('type', '')
@@ -520,9 +883,11 @@ async def read_sensor(name: str):
             detail=f"'{name}' is not a sensor. Use /api/{get_category(spec_type)}/{name} instead"
         )
     
-    # Perform read
+    # Perform read (from poller snapshot)
+    image = await get_register_image(max_age)
+    
     try:
-        value = controller.read_by_name(name)
+        value = image.decode(name) if image is not None else None
         
         if value is None:
             return ReadResponse(
@@ -541,7 +906,8 @@ async def read_sensor(name: str):
             unit=spec.get('unit'),
             type=spec_type,
             address=spec.get('address'),
-            description=spec.get('description')
+            description=spec.get('description'),
+            **snapshot_fields(image.timestamp)
         )
     
     except Exception as e:
@@ -554,18 +920,15 @@ async def read_sensor(name: str):
 # ============================================================================
 
 @app.get("/api/status/{name}", response_model=ReadResponse, tags=["Status"])
-async def read_status(name: str):
+async def read_status(name: str, max_age: Optional[float] = None):
     """
     Read status value (Word Address 60~69, 80~84)
     
-    - **name**: Status item name (English only)
+    - **name**: Status item name (English key or Korean name)
       - Examples: `circulation_fan_output_indicator`, `internal_temperature_sensor_error`
+    - **max_age**: Maximum snapshot age in seconds (older snapshot forces a fresh read)
     """
-    check_connection()
-    
-    spec = get_spec(name)
-    if spec is None:
-        raise HTTPException(status_code=404, detail=f"Control item '{name}' not found")
+    name, spec = find_spec(name)
     
     # Check if it's a READ-only type (excluding SENSOR_READ)
     spec_type = spec.get('type', '')
@@ -580,9 +943,11 @@ async def read_status(name: str):
             detail=f"'{name}' is a sensor value. Use /api/sensors/{name} instead"
         )
     
-    # Perform read
+    # Perform read (from poller snapshot)
+    image = await get_register_image(max_age)
+    
     try:
-        value = controller.read_by_name(name)
+        value = image.decode(name) if image is not None else None
         
         if value is None:
             return ReadResponse(
@@ -601,7 +966,8 @@ async def read_status(name: str):
             unit=spec.get('unit'),
             type=spec_type,
             address=spec.get('address'),
-            description=spec.get('description')
+            description=spec.get('description'),
+            **snapshot_fields(image.timestamp)
         )
     
     except Exception as e:
@@ -609,6 +975,207 @@ async def read_status(name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================================================
+# Endpoints: Snapshot (Delta Polling)
+# ============================================================================
+
+@app.get("/api/snapshot", tags=["Snapshot"])
+async def read_snapshot(
+    request: Request,
+    since: int = 0,
+    wait: Optional[float] = None,
+    category: Optional[str] = None,
+    names: Optional[str] = None,
+    max_age: Optional[float] = None
+):
+    """
+    Read all control items decoded from one register snapshot, or only the items changed since a version
+    
+    - **since**: Last version the client received (0 = all items)
+    - **wait**: Long-poll seconds to hold the request until the next change (max 30)
+    - **category**: Category filter (settings, sensors, status)
+    - **names**: Comma-separated item names (English key or Korean name)
+    - **max_age**: Maximum snapshot age in seconds (older snapshot forces a fresh read)
+    
+    Returns 304 Not Modified when nothing changed since `since` (> 0), or when `If-None-Match` matches the ETag.
+    Versions keep increasing across restarts. If `since` is not from the current server run
+    (e.g. issued before a restart), all items are returned with `full: true`.
+    """
+    if stream is None:
+        raise HTTPException(status_code=503, detail="Snapshot stream not initialized")
+    
+    # Filters (category and/or names)
+    selected = None
+    if category:
+        if category not in NAMES_BY_CATEGORY:
+            raise HTTPException(status_code=400, detail=f"Unknown category '{category}' (settings, sensors, status)")
+        selected = NAMES_BY_CATEGORY[category]
+    if names:
+        keys = [find_spec(name.strip())[0] for name in names.split(',') if name.strip()]
+        selected = keys if selected is None else [key for key in keys if key in selected]
+    
+    # 스냅샷이 없거나 max_age보다 오래됐으면 다시 읽기 (폴러 콜백으로 스트림 갱신)
+    if stream.timestamp is None or max_age is not None:
+        await get_register_image(max_age)
+    if stream.timestamp is None:
+        raise HTTPException(status_code=503, detail="Register snapshot not available")
+    
+    if wait:
+        await stream.wait_for_change(since, min(wait, SNAPSHOT_MAX_WAIT), selected)
+    
+    values, full = stream.changes_since(since, selected)
+    etag = stream.etag(selected)
+    headers = {"ETag": etag, "X-Snapshot-Version": str(stream.version)}
+    
+    # 304 only when the client already holds data (since > 0) or its cached ETag matches
+    if (since > 0 and not values) or request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse(
+        content={
+            "success": True,
+            "version": stream.version,
+            "since": since,
+            "full": full or since <= 0,
+            **snapshot_fields(stream.timestamp),
+            "count": len(values),
+            "values": values
+        },
+        headers=headers
+    )
+
+
+# ============================================================================
+# Endpoints: Stream (WebSocket)
+# ============================================================================
+
+@app.websocket("/ws/stream")
+async def stream_websocket(websocket: WebSocket):
+    """
+    Push stream of control item changes
+    
+    Sends one full snapshot frame on subscribe, then delta frames with changed items only:
+    `{"type": "snapshot" | "delta", "timestamp": "...", "values": {name: value}}`
+    """
+    await websocket.accept()
+    if stream is None:
+        await websocket.close(code=1013)
+        return
+    
+    queue = stream.subscribe()
+    
+    async def sender():
+        while True:
+            frame = await queue.get()
+            await websocket.send_json(frame)
+    
+    send_task = asyncio.create_task(sender())
+    try:
+        # Client messages are ignored; receiving detects disconnects
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        send_task.cancel()
+        stream.unsubscribe(queue)
+
+
+# ============================================================================
+# Endpoints: History
+# ============================================================================
+
+@app.get("/api/history/{period}", tags=["History"])
+async def read_history(period: str, items: Optional[str] = None):
+    """
+    Read sensor history over a time range
+    
+    - **period**: Time range up to now (`30m`, `24h`, `7d`, `1w`, max 31 days)
+    - **items**: Comma-separated item names (English key or Korean name, default: all sensors)
+    """
+    try:
+        seconds = parse_range(period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    names = list(HISTORY_ITEMS)
+    if items:
+        names = [find_spec(item.strip())[0] for item in items.split(',') if item.strip()]
+    
+    if history is None:
+        raise HTTPException(status_code=503, detail="History store not initialized")
+    
+    end = time.time()
+    start = end - seconds
+    
+    try:
+        rows = await run_blocking(history.query, start, end, names)
+    except Exception as e:
+        logger.error(f"History read error ({period}): {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    for row in rows:
+        row['timestamp'] = datetime.fromtimestamp(row['timestamp']).isoformat()
+    
+    return {
+        "success": True,
+        "range": period,
+        "start": datetime.fromtimestamp(start).isoformat(),
+        "end": datetime.fromtimestamp(end).isoformat(),
+        "items": names,
+        "count": len(rows),
+        "data": rows
+    }
+
+
+@app.get("/api/runtime/{period}", tags=["History"])
+async def read_runtime(period: str, items: Optional[str] = None):
+    """
+    Read per-day actuator output runtime (word 65 output bits)
+    
+    Served from per-day totals in the history store (no raw sample scan).
+    
+    - **period**: Days up to today (`1d`, `7d`, `1w`, max 31 days)
+    - **items**: Comma-separated output names (English key or Korean name, default: all word 65 outputs)
+    
+    Each day has `on_seconds`, `switch_ons` and `longest_run` (seconds) per output.
+    """
+    try:
+        seconds = parse_range(period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    names = list(RUNTIME_ITEMS)
+    if items:
+        names = [find_spec(item.strip())[0] for item in items.split(',') if item.strip()]
+        unknown = [name for name in names if name not in RUNTIME_ITEMS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Not an output bit: {', '.join(unknown)}")
+    
+    if history is None:
+        raise HTTPException(status_code=503, detail="History store not initialized")
+    
+    end = time.time()
+    start = end - seconds
+    
+    try:
+        days = await run_blocking(history.query_runtime, start, end, names)
+    except Exception as e:
+        logger.error(f"Runtime read error ({period}): {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    for day in days:
+        day.pop('timestamp')
+    
+    return {
+        "success": True,
+        "range": period,
+        "items": names,
+        "count": len(days),
+        "data": days
+    }
+
+
 # ============================================================================
 # Weather API (기상청 단기예보 API)
 # ============================================================================
@@ -710,8 +1277,8 @@ async def get_naju_weather():
         
         logger.info(f"🌤 날씨 API 요청: base_date={params['base_date']}, base_time={params['base_time']}, nx={NAJU_NX}, ny={NAJU_NY}")
         
-        # API 요청
-        response = requests.get(WEATHER_API_URL, params=params, timeout=10)
+        # API 요청 (블로킹 HTTP 요청은 작업 풀에서 실행, 포화 시 503)
+        response = await run_blocking(requests.get, WEATHER_API_URL, params=params, timeout=10)
         
         logger.info(f"📥 날씨 API 응답 상태: {response.status_code}")
         
@@ -877,12 +1444,12 @@ async def raw_read_register(address: int, count: int = 1):
     - **address**: 레지스터 주소 (0~84)
     - **count**: 읽을 개수
     """
-    check_connection()
+    await check_connection()
     
     if address < 0 or address > 84:
         raise HTTPException(status_code=400, detail="address는 0~84 범위여야 합니다")
     
-    registers = controller.read_holding_register(address, count)
+    registers = await controller.read_holding_register(address, count)
     
     if registers is None:
         raise HTTPException(status_code=500, detail="레지스터 읽기 실패")
@@ -905,7 +1472,7 @@ async def raw_write_register(address: int, value: int):
     
     ⚠️ 주의: 직접 레지스터를 쓰면 시스템 오동작이 발생할 수 있습니다!
     """
-    check_connection()
+    await check_connection()
     
     if address < 0 or address > 59:
         raise HTTPException(
@@ -916,13 +1483,14 @@ async def raw_write_register(address: int, value: int):
     if value < 0 or value > 65535:
         raise HTTPException(status_code=400, detail="value는 0~65535 범위여야 합니다")
     
-    result = controller.write_register(address, value)
+    set_priority(PRIORITY_SETTING)
+    result = await controller.write_register(address, value)
     
     if not result:
         raise HTTPException(status_code=500, detail="레지스터 쓰기 실패")
     
     # 검증 읽기
-    verified = controller.read_holding_register(address, 1)
+    verified = await controller.read_holding_register(address, 1)
     
     return {
         "success": True,
@@ -24,6 +24,7 @@ sys.path.insert(0, script_dir)
 
 from modbus_tcp_controller import ModbusController
 from control_specs import CONTROL_SPECS
+from tick_scheduler import TickScheduler
 import time
 import socket
 from datetime import datetime
@@ -239,27 +240,37 @@ def main():
     consecutive_failures = 0
     max_consecutive_failures = 3
     
+    # 절대시간 경계(:00, :10, ...)마다 수집 (수집 시간이 다음 주기에 누적되지 않음)
+    scheduler = TickScheduler()
+    
+    def collect(tick):
+        """수집 주기 작업"""
+        nonlocal consecutive_failures
+        result = collect_sensors(controller)
+        
+        if result is None:
+            # 연결 끊김
+            consecutive_failures += 1
+            if consecutive_failures >= max_consecutive_failures:
+                if not reconnect_controller(controller):
+                    print("\n❌ 재연결 실패. 프로그램을 종료합니다.")
+                    scheduler.stop()
+                    return
+                consecutive_failures = 0
+        else:
+            consecutive_failures = 0
+    
+    scheduler.add_job("collect", COLLECT_INTERVAL, collect)
+    
     try:
         # 주기적으로 센서 값 수집
-        while True:
-            result = collect_sensors(controller)
-            
-            if result is None:
-                # 연결 끊김
-                consecutive_failures += 1
-                if consecutive_failures >= max_consecutive_failures:
-                    if not reconnect_controller(controller):
-                        print("\n❌ 재연결 실패. 프로그램을 종료합니다.")
-                        break
-                    consecutive_failures = 0
-            else:
-                consecutive_failures = 0
-            
-            time.sleep(COLLECT_INTERVAL)
-            
+        scheduler.run()
+        
     except KeyboardInterrupt:
+        stats = scheduler.get_stats()["collect"]
         print("\n\n" + "="*80)
         print("👋 센서 수집 중단 (사용자 요청)")
+        print(f"   수집 {stats['runs']}회, 건너뛴 주기 {stats['missed']}회")
         print("="*80)
     except Exception as e:
         print(f"\n\n❌ 오류 발생: {e}")
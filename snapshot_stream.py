@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Snapshot Stream
+================================================================================
+레지스터 스냅샷 변경분 푸시 (WebSocket 구독자용)
+
+폴러가 새 RegisterImage를 읽을 때마다 전체 항목을 디코딩하여 이전 값과 비교하고,
+바뀐 항목만 델타 프레임으로 모든 구독자에게 보냄.
+구독 직후에는 전체 스냅샷 프레임을 한 번 보냄
+
+스냅샷마다 단조 증가하는 버전을 붙이고 항목별 마지막 변경 버전을 기록하므로,
+(버전은 시작 시각(밀리초)부터 시작하므로 서버를 재시작해도 이전 버전보다 커짐)
+WebSocket을 쓸 수 없는 클라이언트도 버전 기준으로 변경분만 조회할 수 있음
+(changes_since, wait_for_change)
+
+- 구독자마다 크기가 제한된 큐를 사용 (느린 클라이언트가 다른 구독자를 막지 않음)
+- 큐가 가득 차면 쌓인 오래된 프레임을 버리고 최신 전체 스냅샷 1개로 교체
+
+프레임 형식:
+    {"type": "snapshot", "version": 12, "timestamp": "...", "values": {name: value, ...}}   # 전체
+    {"type": "delta",    "version": 13, "timestamp": "...", "values": {name: value, ...}}   # 변경분
+
+사용법:
+    stream = SnapshotStream()
+    poller.add_listener(stream.update)
+
+    queue = stream.subscribe()          # 전체 스냅샷 프레임이 미리 들어있음
+    frame = await queue.get()
+    stream.unsubscribe(queue)
+
+    await stream.wait_for_change(since=12, timeout=30)   # 버전 12 이후 변경까지 대기
+    values, full = stream.changes_since(12)              # 버전 12 이후 바뀐 항목
+    etag = stream.etag(names)                            # 선택 항목 기준 ETag
+================================================================================
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# 구독자별 큐 크기 (프레임 수)
+DEFAULT_QUEUE_SIZE = 8
+
+
+class SnapshotStream:
+    """스냅샷 델타 계산 + 구독자별 제한 큐"""
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        초기화
+
+        Args:
+            queue_size: 구독자별 큐 크기 (프레임 수)
+        """
+        self.queue_size = queue_size
+        self.values = {}       # 최신 전체 값 {name: value}
+        self.timestamp = None  # 최신 스냅샷 시각 (epoch 초)
+        self.epoch = int(time.time())  # 버전 구분용 시작 시각 (재시작 후 ETag 충돌 방지)
+        # 스냅샷 버전 (시작 시각 밀리초부터 스냅샷마다 1씩 증가, 재시작해도 단조 증가)
+        self.first_version = int(time.time() * 1000)
+        self.version = self.first_version
+        self.changed_at = {}   # 항목별 마지막 변경 버전 {name: version}
+        self._subscribers = set()
+        self._changed = asyncio.Event()  # 변경 발생 알림 (변경마다 새 이벤트로 교체)
+
+        # 통계
+        self.frames_sent = 0
+        self.frames_dropped = 0
+
+    def _frame(self, frame_type, values):
+        """프레임 생성"""
+        return {
+            "type": frame_type,
+            "version": self.version,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat() if self.timestamp else None,
+            "values": values
+        }
+
+    def update(self, image):
+        """
+        새 스냅샷 반영 (폴러 콜백)
+
+        Args:
+            image: RegisterImage
+
+        Returns:
+            변경된 항목 {name: value} (첫 스냅샷이면 전체)
+        """
+        values = image.decode_all()
+        changed = {name: value for name, value in values.items() if self.values.get(name, object()) != value}
+
+        self.values = values
+        self.timestamp = image.timestamp
+        self.version += 1
+
+        if changed:
+            for name in changed:
+                self.changed_at[name] = self.version
+            self.publish(self._frame("delta", changed))
+
+            # 변경 대기 중인 요청 깨우기
+            self._changed.set()
+            self._changed = asyncio.Event()
+        return changed
+
+    def changes_since(self, since, names=None):
+        """
+        버전 기준 변경분 조회
+
+        Args:
+            since: 클라이언트가 마지막으로 받은 버전
+            names: 조회할 항목 이름 리스트 (기본값: 전체)
+
+        Returns:
+            (values, full)
+            - values: since 이후 바뀐 항목 {name: value}
+            - full: True면 전체 값 (since가 이번 실행의 버전 범위 밖, 예: 서버 재시작 전 버전)
+        """
+        if names is None:
+            names = self.values
+        if since > self.version or since < self.first_version:
+            return {name: self.values[name] for name in names if name in self.values}, True
+        changed = {name: self.values[name] for name in names if self.changed_at.get(name, 0) > since}
+        return changed, False
+
+    def etag(self, names=None):
+        """
+        선택 항목의 ETag (선택 항목 중 마지막 변경 버전 기준)
+
+        Args:
+            names: 항목 이름 리스트 (기본값: 전체)
+
+        Returns:
+            ETag 문자열 (예: '"1735350000-42"')
+        """
+        if names is None:
+            names = self.values
+        version = max((self.changed_at.get(name, 0) for name in names), default=0)
+        return f'"{self.epoch}-{version}"'
+
+    async def wait_for_change(self, since, timeout, names=None):
+        """
+        since 이후 변경이 생길 때까지 대기 (롱 폴링)
+
+        Args:
+            since: 클라이언트가 마지막으로 받은 버전
+            timeout: 최대 대기 시간 (초)
+            names: 감시할 항목 이름 리스트 (기본값: 전체)
+
+        Returns:
+            True: 변경 있음 / False: 시간 초과
+        """
+        deadline = time.monotonic() + timeout
+        while not self.changes_since(since, names)[0]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def publish(self, frame):
+        """
+        모든 구독자 큐에 프레임 추가
+
+        Args:
+            frame: 보낼 프레임
+        """
+        for queue in self._subscribers:
+            if queue.full():
+                # 밀린 프레임은 버리고 최신 전체 스냅샷으로 교체 (델타 누락 방지)
+                self.frames_dropped += queue.qsize()
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._frame("snapshot", self.values))
+            else:
+                queue.put_nowait(frame)
+            self.frames_sent += 1
+
+    def subscribe(self):
+        """
+        구독 시작
+
+        Returns:
+            asyncio.Queue (전체 스냅샷 프레임이 먼저 들어있음, 스냅샷이 아직 없으면 빈 큐)
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.timestamp is not None:
+            queue.put_nowait(self._frame("snapshot", self.values))
+        self._subscribers.add(queue)
+        logger.info(f"📡 스트림 구독 시작 (구독자: {len(self._subscribers)})")
+        return queue
+
+    def unsubscribe(self, queue):
+        """
+        구독 종료
+
+        Args:
+            queue: subscribe()가 반환한 큐
+        """
+        self._subscribers.discard(queue)
+        logger.info(f"📡 스트림 구독 종료 (구독자: {len(self._subscribers)})")
+
+    def get_stats(self):
+        """
+        스트림 통계
+
+        Returns:
+            딕셔너리 {subscribers, frames_sent, frames_dropped}
+        """
+        return {
+            "subscribers": len(self._subscribers),
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped
+        }
@@ -16,6 +16,8 @@ rest_api_server.py를 테스트하는 간단한 클라이언트
 
 import requests
 import json
+import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
 # API 기본 URL
@@ -132,6 +134,53 @@ def test_write_setting():
         print_response("변경 후 상태", response)
 
 
+def test_concurrent_bit_writes(rounds: int = 20, concurrency: int = 4):
+    """같은 워드의 다른 비트를 단일 쓰기와 배치 쓰기로 동시에 변경 (어느 쪽 변경도 사라지면 안 됨)"""
+    print("\n\n🔀 동시 비트 쓰기 테스트 (워드 9: 유동팬오토모드 단일 쓰기 + 유동팬강제운전 배치 쓰기)")
+    
+    # 주의: 실제 장비에 쓰기를 수행합니다!
+    confirm = input("\n⚠️  실제 장비에 쓰기를 수행합니다. 계속하시겠습니까? (yes/no): ")
+    if confirm.lower() != 'yes':
+        print("쓰기 테스트를 건너뜁니다.")
+        return
+    
+    single_name, batch_name = "유동팬오토모드", "유동팬강제운전"
+    
+    # 원래 값 (테스트 후 복원)
+    original = {name: requests.get(f"{BASE_URL}/api/settings/{name}").json().get('value', 0)
+                for name in (single_name, batch_name)}
+    
+    lost = 0
+    with ThreadPoolExecutor(max_workers=concurrency * 2) as pool:
+        for i in range(1, rounds + 1):
+            # 회차마다 같은 값을 여러 요청으로 동시에 보냄 (서로 다른 비트라 최종 값은 두 값 모두여야 함)
+            single_value, batch_value = random.randint(0, 1), random.randint(0, 1)
+            futures = []
+            for _ in range(concurrency):
+                futures.append(pool.submit(requests.put, f"{BASE_URL}/api/settings/{single_name}",
+                                           json={"value": single_value}))
+                futures.append(pool.submit(requests.put, f"{BASE_URL}/api/settings",
+                                           json=[{"name": batch_name, "value": batch_value}]))
+            for future in futures:
+                future.result()
+            
+            values = {name: requests.get(f"{BASE_URL}/api/settings/{name}").json().get('value')
+                      for name in (single_name, batch_name)}
+            expected = {single_name: single_value, batch_name: batch_value}
+            if values != expected:
+                lost += 1
+                print(f"   ❌ {i}회: 요청 {expected} → 결과 {values}")
+    
+    # 원래 값 복원
+    requests.put(f"{BASE_URL}/api/settings", json=[{"name": name, "value": value} for name, value in original.items()])
+    
+    if lost:
+        print(f"\n❌ {rounds}회 중 {lost}회 변경 손실")
+    else:
+        print(f"\n✅ {rounds}회 모두 두 변경이 유지됨")
+    return lost == 0
+
+
 def test_read_status():
     """상태값 읽기"""
     print("\n\n📈 상태값 읽기 테스트")
@@ -186,6 +235,7 @@ def main():
         print("5. 설정값 쓰기 (⚠️  주의)")
         print("6. 상태값 읽기")
         print("7. Raw 레지스터 접근")
+        print("8. 동시 비트 쓰기 (⚠️  주의)")
         print("0. 종료")
         print("=" * 70)
         
@@ -205,6 +255,8 @@ def main():
             test_read_status()
         elif choice == '7':
             test_raw_access()
+        elif choice == '8':
+            test_concurrent_bit_writes()
         elif choice == '0':
             print("\n👋 테스트 클라이언트를 종료합니다.")
             break
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Transaction Scheduler
+================================================================================
+Modbus 트랜잭션 우선순위 스케줄러 (게이트웨이 소켓 1개 공유)
+
+RS485 게이트웨이는 한 번에 한 트랜잭션만 처리하므로 모든 요청이 같은 소켓을
+순서대로 사용함. 단순 잠금(asyncio.Lock)은 도착 순서대로 처리하므로
+상태 조회가 몰리면 천창 닫기 같은 긴급 제어가 뒤로 밀림.
+이 스케줄러는 대기 중인 요청 중 우선순위가 가장 높은 요청에 소켓을 넘겨줌
+
+우선순위 (숫자가 작을수록 먼저):
+    PRIORITY_CONTROL      0  수동 제어 쓰기 (강제운전, 개폐/자동 모드)
+    PRIORITY_SETTING      1  설정값 쓰기
+    PRIORITY_INTERACTIVE  2  API 조회 (기본값)
+    PRIORITY_BACKGROUND   3  백그라운드 폴링
+
+- 우선순위별 속도 제한 (토큰 버킷, 초당 요청 수 + 버스트)
+- 우선순위별 소켓 대기 시간(평균/최대), 속도 제한 지연, 대기 중 요청 수를 get_stats()로 확인 가능
+- 우선순위는 호출 측에서 priority() 컨텍스트로 지정 (asyncio 작업 단위로 유지)
+
+사용법:
+    scheduler = TransactionScheduler()
+
+    async with scheduler.slot():               # 현재 컨텍스트의 우선순위로 대기
+        resp = await client.read_holding_registers(...)
+
+    with priority(PRIORITY_CONTROL):           # 이 블록 안의 트랜잭션은 수동 제어 우선순위
+        await controller.write_by_name("heating_forced_operation", 1)
+================================================================================
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+logger = logging.getLogger(__name__)
+
+# 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_CONTROL = 0
+PRIORITY_SETTING = 1
+PRIORITY_INTERACTIVE = 2
+PRIORITY_BACKGROUND = 3
+
+PRIORITY_NAMES = {
+    PRIORITY_CONTROL: 'control',
+    PRIORITY_SETTING: 'setting',
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_BACKGROUND: 'background',
+}
+
+# 우선순위별 속도 제한 {우선순위: (초당 요청 수, 버스트)}, None이면 제한 없음
+DEFAULT_RATE_LIMITS = {
+    PRIORITY_CONTROL: None,
+    PRIORITY_SETTING: (5, 10),
+    PRIORITY_INTERACTIVE: (10, 20),
+    PRIORITY_BACKGROUND: (2, 5),
+}
+
+# 이 시간(초) 이상 기다린 트랜잭션은 경고 로그
+SLOW_WAIT_WARNING = 1.0
+
+# 현재 작업의 우선순위 (지정하지 않으면 API 조회)
+_current_priority = contextvars.ContextVar('modbus_priority', default=PRIORITY_INTERACTIVE)
+
+
+def current_priority():
+    """현재 컨텍스트의 우선순위"""
+    return _current_priority.get()
+
+
+def set_priority(level):
+    """
+    현재 컨텍스트의 우선순위 지정 (작업 전체에 적용, 예: 폴링 루프 시작 시)
+
+    Args:
+        level: 우선순위 (PRIORITY_*)
+    """
+    _current_priority.set(level)
+
+
+@contextmanager
+def priority(level):
+    """
+    블록 안에서만 우선순위 지정
+
+    Args:
+        level: 우선순위 (PRIORITY_*)
+    """
+    token = _current_priority.set(level)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한 (예약 방식, 동시 요청은 순서대로 지연)"""
+
+    def __init__(self, rate, burst):
+        """
+        초기화
+
+        Args:
+            rate: 초당 토큰 수
+            burst: 최대 토큰 수
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def reserve(self):
+        """
+        토큰 1개 예약
+
+        Returns:
+            토큰을 쓸 수 있을 때까지 기다려야 하는 시간 (초, 0이면 즉시)
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class TransactionScheduler:
+    """우선순위 + 속도 제한 트랜잭션 스케줄러 (asyncio.Lock 대체)"""
+
+    def __init__(self, rate_limits=DEFAULT_RATE_LIMITS):
+        """
+        초기화
+
+        Args:
+            rate_limits: 우선순위별 속도 제한 {우선순위: (초당 요청 수, 버스트) 또는 None}
+        """
+        self._busy = False
+        self._waiters = []  # 힙 [(우선순위, 순번, Future)]
+        self._sequence = itertools.count()  # 같은 우선순위는 도착 순서대로
+
+        self._buckets = {}
+        for level, limit in rate_limits.items():
+            if limit is not None:
+                self._buckets[level] = TokenBucket(*limit)
+
+        # 우선순위별 통계
+        self._stats = {
+            level: {"requests": 0, "granted": 0, "rate_limited": 0, "total_delay": 0.0, "total_wait": 0.0, "max_wait": 0.0}
+            for level in PRIORITY_NAMES
+        }
+
+    def locked(self):
+        """트랜잭션 진행 중 여부"""
+        return self._busy
+
+    async def acquire(self, level=None):
+        """
+        소켓 사용권 획득 (속도 제한 대기 → 우선순위 대기)
+
+        Args:
+            level: 우선순위 (기본값: 현재 컨텍스트의 우선순위)
+
+        Returns:
+            소켓 대기 시간 (초, 속도 제한 지연 제외)
+        """
+        if level is None:
+            level = current_priority()
+        stats = self._stats[level]
+        stats["requests"] += 1
+
+        # 1단계: 우선순위별 속도 제한 (소켓을 잡지 않은 상태에서 대기)
+        bucket = self._buckets.get(level)
+        if bucket is not None:
+            delay = bucket.reserve()
+            if delay > 0:
+                stats["rate_limited"] += 1
+                stats["total_delay"] += delay
+                await asyncio.sleep(delay)
+
+        # 2단계: 소켓 사용 대기 (우선순위가 높은 요청부터)
+        started = time.monotonic()
+        if self._busy or self._waiters:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (level, next(self._sequence), future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                # 사용권을 넘겨받은 직후 취소되면 다음 요청에 넘겨줌
+                if future.done() and not future.cancelled():
+                    self.release()
+                raise
+        else:
+            self._busy = True
+
+        wait = time.monotonic() - started
+        stats["granted"] += 1
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+        if wait >= SLOW_WAIT_WARNING:
+            logger.warning(f"⏳ Modbus 트랜잭션 대기 {wait:.2f}초 ({PRIORITY_NAMES[level]}, 대기 중 {len(self._waiters)}건)")
+        return wait
+
+    def release(self):
+        """소켓 사용권 반환 (대기 중인 요청 중 우선순위가 가장 높은 요청에 넘겨줌)"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._busy = False
+
+    @asynccontextmanager
+    async def slot(self, level=None):
+        """
+        트랜잭션 구간 (async with)
+
+        Args:
+            level: 우선순위 (기본값: 현재 컨텍스트의 우선순위)
+        """
+        await self.acquire(level)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self):
+        """
+        우선순위별 통계
+
+        Returns:
+            딕셔너리 {busy, queued, classes: {이름: {requests, queued, rate_limited, rate_delay_ms, avg_wait_ms, max_wait_ms}}}
+            (rate_delay_ms: 속도 제한 누적 지연, avg/max_wait_ms: 소켓 대기 시간)
+        """
+        queued = {level: 0 for level in PRIORITY_NAMES}
+        for level, _, future in self._waiters:
+            if not future.done():
+                queued[level] += 1
+
+        classes = {}
+        for level, name in PRIORITY_NAMES.items():
+            stats = self._stats[level]
+            classes[name] = {
+                "requests": stats["requests"],
+                "queued": queued[level],
+                "rate_limited": stats["rate_limited"],
+                "rate_delay_ms": round(stats["total_delay"] * 1000, 1),
+                "avg_wait_ms": round(stats["total_wait"] / stats["granted"] * 1000, 1) if stats["granted"] else 0.0,
+                "max_wait_ms": round(stats["max_wait"] * 1000, 1)
+            }
+
+        return {
+            "busy": self._busy,
+            "queued": sum(queued.values()),
+            "classes": classes
+        }
@@ -111,6 +111,34 @@ class APIClient {
     }
   }
 
+  // 🔁 변경분 조회 (GET /api/snapshot?since={version})
+  // 반환: { notModified: true } (304) / { version, full, values } / null (오류)
+  async getSnapshot(since = 0, wait = 0) {
+    try {
+      const query = wait ? `since=${since}&wait=${wait}` : `since=${since}`;
+      const response = await fetch(`${this.baseURL}${this.config.ENDPOINTS.SNAPSHOT}?${query}`, {
+        method: 'GET',
+      });
+      
+      if (response.status === 304) {
+        return { notModified: true };
+      }
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      
+      return await response.json();
+    } catch (error) {
+      console.error('❌ Failed to fetch snapshot changes:', error);
+      return null;
+    }
+  }
+
+  // 📡 실시간 스트림 주소 (http → ws, https → wss)
+  getStreamURL() {
+    return `${this.baseURL.replace(/^http/, 'ws')}${this.config.ENDPOINTS.STREAM}`;
+  }
+
   // 🗺️ 센서 데이터 포맷팅 (REST API 응답 → UI 형식)
   _formatSensorData(sensorsObj) {
     const formatted = {};
@@ -162,12 +190,14 @@ class APIClient {
   }
 
   // 🎛️ 설정값 쓰기 (PUT /api/settings/{name})
-  async setSetting(settingKey, value) {
+  // debounce(초)를 주면 서버가 대기 시간 안의 마지막 값만 씀 (슬라이더 등 연속 변경용)
+  async setSetting(settingKey, value, debounce = null) {
     try {
       // UI 키를 API 영어 이름으로 변환
       const apiKey = this.config.SETTING_KEYS?.[settingKey] || settingKey;
+      const query = debounce ? `?debounce=${debounce}` : '';
       
-      const response = await fetch(`${this.baseURL}${this.config.ENDPOINTS.SETTINGS}/${apiKey}`, {
+      const response = await fetch(`${this.baseURL}${this.config.ENDPOINTS.SETTINGS}/${apiKey}${query}`, {
         method: 'PUT',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({ value: value }),
@@ -27,6 +27,15 @@ const API_CONFIG = {
     // Raw 레지스터 (고급)
     RAW_READ: '/api/raw/read',          // /api/raw/read/{address}
     RAW_WRITE: '/api/raw/write',        // /api/raw/write/{address}
+    
+    // 센서 이력 (시계열 저장소)
+    HISTORY: '/api/history',            // /api/history/{period} (예: 24h, 7d)
+    
+    // 변경분 조회 (버전 기준, 변경 없으면 304)
+    SNAPSHOT: '/api/snapshot',          // /api/snapshot?since={version}&wait={초}
+    
+    // 실시간 푸시 (WebSocket, 변경분만 전송)
+    STREAM: '/ws/stream',               // 구독 시 전체 스냅샷 1회 → 이후 변경 항목만
   },
   
   // 🗺️ 센서 키 매핑 (UI 표시명 → REST API 영어 이름)
@@ -47,6 +56,19 @@ const API_CONFIG = {
     outdoor_wind_speed: 'outdoor_wind_speed',         // 외부풍속 (79)
   },
   
+  // 📈 이력 차트 키 매핑 (차트 키 → /api/history 응답 항목 이름)
+  HISTORY_KEYS: {
+    indoor_temp_1: 'indoor_current_temperature',      // 내부현재온도 (70)
+    indoor_humidity: 'indoor_current_humidity',       // 내부현재습도 (71)
+    indoor_solar: 'indoor_current_solar_radiation',   // 내부현재일사량 (72)
+    indoor_soil_tension: 'indoor_current_soil_tension', // 내부현재수분장력 (74)
+    outdoor_temp: 'outdoor_current_temperature',      // 외부현재온도 (75)
+    outdoor_humidity: 'outdoor_current_humidity',     // 외부현재습도 (76)
+    outdoor_solar: 'outdoor_solar_radiation',         // 외부일사량 (77)
+    outdoor_wind_dir: 'outdoor_current_evaporation',  // 워드 78 (풍향)
+    outdoor_wind_speed: 'outdoor_current_evaporation_rate', // 워드 79 (풍속)
+  },
+  
   // 🎛️ 주요 설정 항목 매핑 (UI → REST API 영어 이름)
   SETTING_KEYS: {
     // 모드 제어 (BIT_WRITE)
@@ -293,7 +293,7 @@ const chartManager = {
       
       hourGroups[hourKey].count++;
       sensorKeys.forEach(key => {
-        const val = parseFloat(row[key]);
+        const val = parseFloat(row[API_CONFIG.HISTORY_KEYS[key] || key]);
         if (!isNaN(val)) {
           hourGroups[hourKey].sums[key] += val;
         }
@@ -6,6 +6,15 @@ class DataManager {
     this.refreshInterval = null;
     this.isRunning = false;
     this.config = API_CONFIG || {};
+    
+    // 실시간 스트림 (WebSocket 연결 중에는 주기 조회 생략)
+    this.stream = null;
+    this.streamOpen = false;
+    this.streamValues = {};
+    this.streamRetryDelay = 5000;
+    
+    // 마지막으로 받은 스냅샷 버전 (변경분 조회 기준)
+    this.snapshotVersion = 0;
   }
 
   // 센서 데이터 업데이트 콜백 등록
@@ -31,9 +40,38 @@ class DataManager {
     });
   }
 
-  // 센서 데이터 새로고침
+  // 전체/변경 값 반영 후 UI 형식으로 전파
+  _applyValues(values, full) {
+    // 전체 스냅샷은 교체, 델타는 병합
+    if (full) {
+      this.streamValues = { ...values };
+    } else {
+      Object.assign(this.streamValues, values);
+    }
+    
+    // /api/sensors/all 과 같은 형식으로 변환 후 전파
+    const sensorsObj = {};
+    for (const [name, value] of Object.entries(this.streamValues)) {
+      sensorsObj[name] = { value: value, success: value !== null };
+    }
+    const data = apiClient._formatSensorData(sensorsObj);
+    this.sensorData = data;
+    this._notifyUpdate(data);
+    return data;
+  }
+
+  // 센서 데이터 새로고침 (변경분만 조회, 실패 시 전체 센서 조회)
   async refresh() {
     try {
+      const snapshot = await apiClient.getSnapshot(this.snapshotVersion);
+      if (snapshot?.notModified) {
+        return this.sensorData;
+      }
+      if (snapshot) {
+        this.snapshotVersion = snapshot.version;
+        return this._applyValues(snapshot.values, snapshot.full);
+      }
+      
       const data = await apiClient.getAllSensors();
       if (data) {
         this.sensorData = data;
@@ -46,6 +84,33 @@ class DataManager {
     }
   }
 
+  // 실시간 스트림 연결 (실패/종료 시 주기 조회로 동작하며 재연결)
+  _openStream() {
+    if (typeof WebSocket === 'undefined' || !this.config.ENDPOINTS?.STREAM) return;
+    
+    const ws = new WebSocket(apiClient.getStreamURL());
+    this.stream = ws;
+    
+    ws.onopen = () => {
+      this.streamOpen = true;
+      console.log('📡 Sensor stream connected');
+    };
+    
+    ws.onmessage = (event) => {
+      const frame = JSON.parse(event.data);
+      this.snapshotVersion = frame.version;
+      this._applyValues(frame.values, frame.type === 'snapshot');
+    };
+    
+    ws.onclose = () => {
+      this.streamOpen = false;
+      this.stream = null;
+      if (this.isRunning) {
+        setTimeout(() => this.isRunning && this._openStream(), this.streamRetryDelay);
+      }
+    };
+  }
+
   // 자동 새로고침 시작
   start() {
     if (this.isRunning) {
@@ -58,10 +123,15 @@ class DataManager {
     // 즉시 한 번 실행
     this.refresh();
     
-    // 주기적으로 실행
+    // 실시간 스트림 연결
+    this._openStream();
+    
+    // 주기적으로 실행 (스트림 연결 중에는 생략)
     const interval = this.config.REFRESH_INTERVAL || 10000;
     this.refreshInterval = setInterval(() => {
-      this.refresh();
+      if (!this.streamOpen) {
+        this.refresh();
+      }
     }, interval);
     
     console.log(`DataManager started with ${interval}ms interval`);
@@ -78,6 +148,11 @@ class DataManager {
       this.refreshInterval = null;
     }
     
+    if (this.stream) {
+      this.stream.close();
+      this.stream = null;
+    }
+    
     console.log('DataManager stopped');
   }
 
@@ -138,7 +138,7 @@ const sensorChartsManager = {
       
       hourGroups[hourKey].count++;
       sensorKeys.forEach(key => {
-        const val = parseFloat(row[key]);
+        const val = parseFloat(row[API_CONFIG.HISTORY_KEYS[key] || key]);
         if (!isNaN(val)) {
           hourGroups[hourKey].sums[key] += val;
         }
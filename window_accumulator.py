@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Window Accumulator
+================================================================================
+채널별 구간 누적 통계 (샘플 목록을 쌓지 않는 스트리밍 집계)
+
+10초 샘플을 리스트에 모았다가 저장 시점에 센서마다 전체 리스트를 다시 훑으면
+구간이 길어질수록 메모리와 계산이 늘어남. 이 누적기는 샘플이 들어올 때마다
+채널별 개수, 합, 최소, 최대, 마지막 값, 제곱합을 갱신하므로
+메모리는 구간 길이와 상관없이 채널 수에 비례함 (채널별 array 6개)
+
+- None 값(읽기 실패)은 개수에 포함하지 않음
+- 평균/표준편차는 조회 시점에 합과 제곱합으로 계산
+
+사용법:
+    accumulator = WindowAccumulator(SENSOR_ITEMS)
+
+    accumulator.add({"indoor_current_temperature": 21.5, ...})   # 10초마다
+
+    averages = accumulator.means()      # {채널: 평균 또는 None} (저장용)
+    stats = accumulator.summary()       # {채널: {count, mean, min, max, last, std}}
+    accumulator.reset()                 # 다음 구간 시작
+================================================================================
+"""
+
+import math
+from array import array
+
+
+class WindowAccumulator:
+    """채널별 구간 누적 통계 (개수, 합, 최소, 최대, 마지막 값, 제곱합)"""
+
+    def __init__(self, channels):
+        """
+        초기화
+
+        Args:
+            channels: 채널 이름 리스트 (순서대로 배열 인덱스 할당)
+        """
+        self.channels = list(channels)
+        self._index = {name: i for i, name in enumerate(self.channels)}
+
+        size = len(self.channels)
+        self.count = array('l', [0] * size)
+        self.total = array('d', [0.0] * size)
+        self.total_sq = array('d', [0.0] * size)
+        self.minimum = array('d', [math.inf] * size)
+        self.maximum = array('d', [-math.inf] * size)
+        self.last = array('d', [math.nan] * size)
+
+        self.samples = 0  # 구간 안에서 add() 호출 수 (채널 값이 모두 None이어도 포함)
+
+    def __len__(self):
+        """구간 안의 샘플 수"""
+        return self.samples
+
+    def add(self, sample):
+        """
+        샘플 1개 누적
+
+        Args:
+            sample: {채널 이름: 값} (None 값, 등록되지 않은 채널은 무시)
+        """
+        index = self._index
+        for name, value in sample.items():
+            i = index.get(name)
+            if i is None or value is None:
+                continue
+
+            value = float(value)
+            self.count[i] += 1
+            self.total[i] += value
+            self.total_sq[i] += value * value
+            if value < self.minimum[i]:
+                self.minimum[i] = value
+            if value > self.maximum[i]:
+                self.maximum[i] = value
+            self.last[i] = value
+
+        self.samples += 1
+
+    def reset(self):
+        """누적값 초기화 (다음 구간 시작)"""
+        size = len(self.channels)
+        for i in range(size):
+            self.count[i] = 0
+            self.total[i] = 0.0
+            self.total_sq[i] = 0.0
+            self.minimum[i] = math.inf
+            self.maximum[i] = -math.inf
+            self.last[i] = math.nan
+        self.samples = 0
+
+    def mean(self, name):
+        """
+        채널 평균
+
+        Args:
+            name: 채널 이름
+
+        Returns:
+            평균값 (구간 안에 값이 없으면 None)
+        """
+        i = self._index[name]
+        if self.count[i] == 0:
+            return None
+        return self.total[i] / self.count[i]
+
+    def means(self):
+        """
+        전체 채널 평균
+
+        Returns:
+            딕셔너리 {채널 이름: 평균 또는 None} (채널 등록 순서)
+        """
+        return {name: self.mean(name) for name in self.channels}
+
+    def stats(self, name):
+        """
+        채널 통계
+
+        Args:
+            name: 채널 이름
+
+        Returns:
+            딕셔너리 {count, mean, min, max, last, std} (값이 없으면 count 외 None)
+        """
+        i = self._index[name]
+        n = self.count[i]
+        if n == 0:
+            return {"count": 0, "mean": None, "min": None, "max": None, "last": None, "std": None}
+
+        mean = self.total[i] / n
+        # 모분산 (부동소수점 오차로 음수가 되는 경우 0)
+        variance = max(0.0, self.total_sq[i] / n - mean * mean)
+        return {
+            "count": n,
+            "mean": mean,
+            "min": self.minimum[i],
+            "max": self.maximum[i],
+            "last": self.last[i],
+            "std": math.sqrt(variance)
+        }
+
+    def summary(self):
+        """
+        전체 채널 통계
+
+        Returns:
+            딕셔너리 {채널 이름: stats(채널)}
+        """
+        return {name: self.stats(name) for name in self.channels}
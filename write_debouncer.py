@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Write Debouncer
+================================================================================
+항목별 디바운스 쓰기 (마지막 값만 적용, last-write-wins)
+
+슬라이더로 온도 설정값을 조절하면 짧은 시간에 PUT 요청이 연달아 들어옴.
+요청마다 Modbus 쓰기 + 확인 읽기를 하면 느린 게이트웨이가 밀리므로,
+항목별로 대기 시간(window) 동안 들어온 요청을 모아서 마지막 값만 1회 씀.
+앞선 요청들도 같은 쓰기 결과를 받고, 최종 적용 값과 superseded 표시를 함께 받음
+
+- 대기 시간은 마지막 요청 기준으로 다시 시작 (계속 드래그하면 최대 window x MAX_WINDOWS 후 적용)
+- 같은 항목의 쓰기는 순서대로 실행 (이전 쓰기가 끝난 뒤 다음 값 적용)
+
+사용법:
+    debouncer = WriteDebouncer()
+
+    result, applied_value, superseded = await debouncer.submit(
+        "heating_on_temperature_setting", 18.5, apply, window=0.5
+    )
+    # apply(value): 실제 쓰기 코루틴 함수 (마지막 값으로 1회 호출)
+================================================================================
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 계속 요청이 들어와도 첫 요청 후 window x MAX_WINDOWS 안에는 반드시 적용
+MAX_WINDOWS = 4
+
+
+class WriteCancelled(Exception):
+    """디바운스 쓰기가 적용되기 전에 취소됨 (서버 종료 등)"""
+
+
+class WriteDebouncer:
+    """항목별 디바운스 쓰기 큐"""
+
+    def __init__(self, max_windows=MAX_WINDOWS):
+        """
+        초기화
+
+        Args:
+            max_windows: 첫 요청 후 최대 대기 시간 (window의 배수)
+        """
+        self.max_windows = max_windows
+        self._pending = {}  # 대기 중인 쓰기 {key: 딕셔너리}
+        self._running = {}  # 실행 중인 쓰기 {key: Task}
+
+        # 통계
+        self.requests = 0
+        self.writes = 0
+        self.superseded = 0
+
+    async def submit(self, key, value, apply, window):
+        """
+        디바운스 쓰기 요청
+
+        Args:
+            key: 항목 이름
+            value: 쓸 값
+            apply: 코루틴 함수 apply(value) (대기 시간 후 마지막 값으로 1회 호출)
+            window: 대기 시간 (초)
+
+        Returns:
+            (result, applied_value, superseded)
+            - result: apply() 반환값
+            - applied_value: 실제로 적용된 값 (마지막 요청 값)
+            - superseded: True면 이 요청 값은 뒤 요청으로 대체됨
+
+        Raises:
+            WriteCancelled: 쓰기 전에 취소됨 (서버 종료 등)
+            apply()에서 발생한 예외
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self.requests += 1
+
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = {"future": loop.create_future(), "first": now, "sequence": 0}
+            self._pending[key] = entry
+        else:
+            entry["timer"].cancel()
+            self.superseded += 1
+
+        entry["sequence"] += 1
+        entry["value"] = value
+        entry["apply"] = apply
+        sequence = entry["sequence"]
+
+        # 마지막 요청 후 window, 단 첫 요청 후 window x max_windows를 넘지 않음
+        deadline = min(now + window, entry["first"] + window * self.max_windows)
+        entry["timer"] = loop.call_at(deadline, self._fire, key)
+
+        # 요청이 끊겨도 쓰기는 계속 진행 (다른 요청이 같은 결과를 기다림)
+        result = await asyncio.shield(entry["future"])
+        return result, entry["value"], sequence != entry["sequence"]
+
+    def _fire(self, key):
+        """대기 시간 종료: 마지막 값 쓰기 시작"""
+        entry = self._pending.pop(key)
+        previous = self._running.get(key)
+        task = asyncio.ensure_future(self._apply(key, entry, previous))
+        self._running[key] = task
+
+    async def _apply(self, key, entry, previous):
+        """마지막 값 쓰기 (같은 항목의 이전 쓰기가 끝난 뒤 실행)"""
+        future = entry["future"]
+        try:
+            if previous is not None and not previous.done():
+                await asyncio.wait([previous])
+            self.writes += 1
+            if entry["sequence"] > 1:
+                logger.info(f"⏱ 디바운스 쓰기: {key} = {entry['value']} (요청 {entry['sequence']}건 중 마지막 값)")
+            future.set_result(await entry["apply"](entry["value"]))
+        except asyncio.CancelledError:
+            # 쓰기 작업이 취소되면 모아 둔 요청들도 기다리지 않도록 함께 종료
+            self._fail(future, WriteCancelled(f"{key} 쓰기 취소됨"))
+            raise
+        except Exception as e:
+            self._fail(future, e)
+        finally:
+            if self._running.get(key) is asyncio.current_task():
+                del self._running[key]
+
+    @staticmethod
+    def _fail(future, error):
+        """대기 중인 요청들에 예외 전달"""
+        if future.done():
+            return
+        future.set_exception(error)
+        # 기다리는 요청이 모두 끊긴 경우 경고 로그 방지
+        future.exception()
+
+    async def close(self):
+        """
+        대기 중/실행 중인 쓰기 취소 (서버 종료 시)
+
+        기다리던 요청들은 WriteCancelled를 받음
+        """
+        for key, entry in self._pending.items():
+            entry["timer"].cancel()
+            self._fail(entry["future"], WriteCancelled(f"{key} 쓰기 취소됨"))
+        self._pending.clear()
+
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self):
+        """
+        디바운스 통계
+
+        Returns:
+            딕셔너리 {requests, writes, superseded, pending}
+        """
+        return {
+            "requests": self.requests,
+            "writes": self.writes,
+            "superseded": self.superseded,
+            "pending": len(self._pending)
+        }